@@ -1,20 +1,146 @@
 import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 
+from app.database.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Connection pool settings, applied to both the sync and the async engine.
+# Each process holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+def get_async_database_url(database_url: str) -> Optional[str]:
+    """
+    Map a PostgreSQL URL onto the asyncpg driver.
+
+    Returns None for databases without an async driver (e.g. SQLite in tests),
+    in which case the routers fall back to a sync session.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return None
+    # asyncpg spells libpq's sslmode as ssl
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url.render_as_string(hide_password=False)
+
+def get_pool_options(poolclass) -> dict:
+    """
+    Engine keyword arguments for the configured connection pool.
+    SQLite keeps SQLAlchemy's default pool, which doesn't take these settings.
+    """
+    if DATABASE_URL.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+# Sync engine, used for table creation, background jobs and the SQLite fallback
+engine = create_engine(DATABASE_URL, **get_pool_options(TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Async engine used by the API routers
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, **get_pool_options(TimedAsyncAdaptedQueuePool))
+    if ASYNC_DATABASE_URL
+    else None
+)
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+class SyncSessionAdapter:
+    """
+    Exposes a sync Session through the subset of the AsyncSession API used by the
+    routers. Only used when the database has no async driver, such as SQLite in tests.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.sync_session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return self.sync_session.scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return self.sync_session.scalars(statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def flush(self):
+        self.sync_session.flush()
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def refresh(self, instance, *args, **kwargs):
+        self.sync_session.refresh(instance, *args, **kwargs)
+
+    async def close(self):
+        self.sync_session.close()
+
+@asynccontextmanager
+async def session_scope():
+    """
+    Open a database session for use outside of request dependencies.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+    else:
+        session = SyncSessionAdapter(SessionLocal())
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_db():
+    async with session_scope() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
+
+def get_pool_stats() -> dict:
+    """
+    Checkout latency and occupancy of each engine's connection pool.
+    """
+    stats = {"sync": TimedQueuePool.metrics.snapshot(engine.pool)}
+    if async_engine is not None:
+        stats["async"] = TimedAsyncAdaptedQueuePool.metrics.snapshot(async_engine.pool)
+    return stats
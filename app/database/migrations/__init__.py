@@ -0,0 +1,87 @@
+"""
+Schema migrations for changes Base.metadata.create_all can't make to existing tables,
+such as new columns, new indexes and backfills.
+
+Migrations run in order and are recorded in the schema_migrations table. Each one
+must be idempotent: on a fresh database create_all has already built the current
+schema, and the migration only records itself.
+
+Run them with `python -m app.database.migrations`; the API also runs them at startup.
+"""
+import importlib
+import logging
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import func
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Module names under app.database.migrations, in the order they apply
+MIGRATIONS = [
+    "m0001_expected_questions_status",
+    "m0002_transcript_segments",
+    "m0003_interview_questions",
+    "m0004_numeric_scores",
+    "m0005_meeting_listing_indexes",
+    "m0006_report_job_stage_timings",
+    "m0007_expected_questions_retry",
+]
+
+# Serializes concurrent runs from several API processes on PostgreSQL
+MIGRATION_LOCK_KEY = 720_451_003
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+def has_column(conn: Connection, table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in inspect(conn).get_columns(table_name))
+
+def add_column(conn: Connection, table_name: str, column: Column) -> bool:
+    """
+    Add a column to an existing table unless it is already there.
+    Returns whether the column was added.
+    """
+    if has_column(conn, table_name, column.name):
+        return False
+    column_type = column.type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}"))
+    return True
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Apply every migration that hasn't been recorded yet, each in its own transaction.
+    """
+    with engine.connect() as conn:
+        is_postgres = conn.dialect.name == "postgresql"
+        if is_postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+        try:
+            schema_migrations.create(conn, checkfirst=True)
+            conn.commit()
+            applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+            conn.commit()
+            
+            for name in MIGRATIONS:
+                if name in applied:
+                    continue
+                module = importlib.import_module(f"{__name__}.{name}")
+                try:
+                    module.upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(version=name))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                logger.info(f"Applied migration {name}")
+        finally:
+            if is_postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                conn.commit()
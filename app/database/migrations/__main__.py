@@ -0,0 +1,7 @@
+from app.database.database import Base, engine
+from app.database.migrations import run_migrations
+from app.models import interview_question, meeting, process_metrics, report_job, transcript_segment  # noqa: F401  (registers the tables on Base.metadata)
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
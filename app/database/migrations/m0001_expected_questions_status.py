@@ -0,0 +1,18 @@
+"""
+Add meetings.expected_questions_status, now that questions are generated after the
+meeting is created. Existing meetings are Ready when they have questions, else Failed.
+"""
+from sqlalchemy import Column, Enum, text
+from sqlalchemy.engine import Connection
+
+from app.database.migrations import add_column
+from app.models.meeting import QuestionsStatus
+
+def upgrade(conn: Connection) -> None:
+    column = Column("expected_questions_status", Enum(QuestionsStatus, native_enum=False, length=16))
+    if not add_column(conn, "meetings", column):
+        return
+    conn.execute(text(
+        "UPDATE meetings SET expected_questions_status = CASE "
+        "WHEN expected_questions IS NULL THEN 'FAILED' ELSE 'READY' END"
+    ))
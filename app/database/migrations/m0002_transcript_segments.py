@@ -0,0 +1,15 @@
+"""
+Add the incremental transcript counters and rolling summary to meetings.
+The transcript_segments table itself is new and created by create_all.
+"""
+from sqlalchemy import Column, Integer, Text, text
+from sqlalchemy.engine import Connection
+
+from app.database.migrations import add_column
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "meetings", Column("transcript_seq", Integer))
+    add_column(conn, "meetings", Column("transcript_summary", Text))
+    add_column(conn, "meetings", Column("summary_seq", Integer))
+    conn.execute(text("UPDATE meetings SET transcript_seq = 0 WHERE transcript_seq IS NULL"))
+    conn.execute(text("UPDATE meetings SET summary_seq = 0 WHERE summary_seq IS NULL"))
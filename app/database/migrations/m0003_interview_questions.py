@@ -0,0 +1,74 @@
+"""
+Move the meetings.expected_questions blobs into the interview_questions table
+(created by create_all) and add the per-meeting question counter.
+
+The blobs are JSON arrays, optionally followed by more arrays after an
+"--- Additional Questions ---" separator when earlier writes couldn't be merged.
+The blob column is left in place.
+"""
+import json
+from typing import List
+
+from sqlalchemy import Column, Integer, bindparam, column, select, table, text, update
+from sqlalchemy.engine import Connection
+
+from app.database.migrations import add_column
+
+BATCH_SIZE = 500
+LEGACY_SEPARATOR = "--- Additional Questions ---"
+
+meetings = table("meetings", column("id"), column("expected_questions"), column("question_seq"))
+interview_questions = table(
+    "interview_questions", column("meeting_id"), column("ordinal"), column("text"), column("source")
+)
+
+def parse_legacy_questions(blob: str) -> List[str]:
+    """
+    Split a legacy expected_questions blob into questions, keeping unparseable parts as text.
+    """
+    questions = []
+    for part in blob.split(LEGACY_SEPARATOR):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = json.loads(part)
+        except json.JSONDecodeError:
+            value = part
+        items = value if isinstance(value, list) else [value]
+        questions.extend(str(item).strip() for item in items if str(item).strip())
+    return questions
+
+def upgrade(conn: Connection) -> None:
+    if not add_column(conn, "meetings", Column("question_seq", Integer)):
+        return
+    
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(meetings.c.id, meetings.c.expected_questions)
+            .where(meetings.c.expected_questions.isnot(None), meetings.c.id > last_id)
+            .order_by(meetings.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        
+        question_rows, counters = [], []
+        for meeting_id, blob in rows:
+            questions = parse_legacy_questions(blob)
+            question_rows.extend(
+                dict(meeting_id=meeting_id, ordinal=ordinal, text=question, source="IMPORTED")
+                for ordinal, question in enumerate(questions, start=1)
+            )
+            counters.append(dict(b_id=meeting_id, b_seq=len(questions)))
+        
+        if question_rows:
+            conn.execute(interview_questions.insert(), question_rows)
+        conn.execute(
+            update(meetings).where(meetings.c.id == bindparam("b_id")).values(question_seq=bindparam("b_seq")),
+            counters
+        )
+    
+    conn.execute(text("UPDATE meetings SET question_seq = 0 WHERE question_seq IS NULL"))
@@ -0,0 +1,50 @@
+"""
+Add integer *_value columns next to the free-text score and count columns of meetings,
+and fill them by parsing the existing text, in batches.
+"""
+from sqlalchemy import Column, Integer, bindparam, column, or_, select, table, update
+from sqlalchemy.engine import Connection
+
+from app.database.migrations import add_column
+from app.utils.scores import NUMERIC_FIELDS, parse_numeric_fields
+
+BATCH_SIZE = 1000
+
+meetings = table(
+    "meetings",
+    column("id"),
+    *[column(field) for field in NUMERIC_FIELDS],
+    *[column(f"{field}_value") for field in NUMERIC_FIELDS],
+)
+
+def upgrade(conn: Connection) -> None:
+    added = [add_column(conn, "meetings", Column(f"{field}_value", Integer)) for field in NUMERIC_FIELDS]
+    if not any(added):
+        return
+    
+    # Bind names must differ from column names in an UPDATE ... SET
+    statement = (
+        update(meetings)
+        .where(meetings.c.id == bindparam("b_id"))
+        .values({f"{field}_value": bindparam(f"b_{field}") for field in NUMERIC_FIELDS})
+    )
+    
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(meetings.c.id, *[meetings.c[field] for field in NUMERIC_FIELDS])
+            .where(meetings.c.id > last_id, or_(*[meetings.c[field].isnot(None) for field in NUMERIC_FIELDS]))
+            .order_by(meetings.c.id)
+            .limit(BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+        
+        conn.execute(statement, [
+            dict(
+                b_id=row["id"],
+                **{f"b_{key[:-len('_value')]}": value for key, value in parse_numeric_fields(row).items()}
+            )
+            for row in rows
+        ])
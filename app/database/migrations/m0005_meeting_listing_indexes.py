@@ -0,0 +1,14 @@
+"""
+Create the composite indexes of meetings declared on the model.
+
+CREATE INDEX blocks writes to meetings while it runs. On large PostgreSQL tables,
+create the indexes beforehand with CREATE INDEX CONCURRENTLY and the same names;
+this migration then skips them.
+"""
+from sqlalchemy.engine import Connection
+
+from app.models.meeting import Meeting
+
+def upgrade(conn: Connection) -> None:
+    for index in Meeting.__table__.indexes:
+        index.create(conn, checkfirst=True)
@@ -0,0 +1,10 @@
+"""
+Add report_jobs.stage_timings, the seconds spent in each stage of a report run.
+"""
+from sqlalchemy import JSON, Column
+from sqlalchemy.engine import Connection
+
+from app.database.migrations import add_column
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "report_jobs", Column("stage_timings", JSON))
@@ -0,0 +1,12 @@
+"""
+Add meetings.expected_questions_requested_at and expected_questions_attempts, so the
+report worker can retry question generation that was lost while a meeting was Pending.
+"""
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.engine import Connection
+
+from app.database.migrations import add_column
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "meetings", Column("expected_questions_requested_at", DateTime(timezone=True)))
+    add_column(conn, "meetings", Column("expected_questions_attempts", Integer))
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+class PoolMetrics:
+    """
+    Thread-safe counters for connection checkouts from a pool.
+    Keeps a bounded window of recent checkout latencies for percentiles.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self._recent.append(seconds)
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Optional[float]]:
+        """
+        Return the current counters, plus live occupancy when the pool is a QueuePool.
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+            stats = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_avg_ms": (self.total_wait / self.checkouts * 1000) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": self.max_wait * 1000,
+                "checkout_wait_p50_ms": _percentile(recent, 0.50) * 1000,
+                "checkout_wait_p95_ms": _percentile(recent, 0.95) * 1000,
+                "checkout_wait_p99_ms": _percentile(recent, 0.99) * 1000,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+class _TimedCheckoutMixin:
+    """
+    Times how long callers wait to get a connection out of the pool.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics = PoolMetrics()
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
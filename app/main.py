@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.database.database import engine, Base
-from app.routes import meetings, suggestions, analysis, reports
+from app.database.migrations import run_migrations
+from app.routes import meetings, suggestions, analysis, analytics, reports, metrics, transcripts
 
-# Create the database tables
+# Create the database tables and bring existing ones up to date
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(
     title="Interview Management API",
@@ -24,8 +26,11 @@ app.add_middleware(
 # Include routers
 app.include_router(meetings.router)
 app.include_router(suggestions.router)
+app.include_router(transcripts.router)
 app.include_router(analysis.router)
+app.include_router(analytics.router)
 app.include_router(reports.router)
+app.include_router(metrics.router)
 
 @app.get("/", tags=["Root"])
 def read_root():
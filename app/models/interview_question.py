@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, BigInteger, Text, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+import enum
+
+class QuestionSource(enum.Enum):
+    EXPECTED = "Expected"  # Generated from the job description when the meeting is created
+    SUGGESTED = "Suggested"  # Suggested from the transcript during the interview
+    IMPORTED = "Imported"  # Migrated from the legacy meetings.expected_questions column
+
+class InterviewQuestion(Base):
+    __tablename__ = "interview_questions"
+    __table_args__ = (
+        Index("ix_interview_questions_meeting_ordinal", "meeting_id", "ordinal", unique=True),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    meeting_id = Column(BigInteger, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    # Position within the meeting, starting at 1, allocated from meetings.question_seq
+    ordinal = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    source = Column(Enum(QuestionSource, native_enum=False, length=16), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Integer, Date, Time, Boolean, Enum, BigInteger, Text
+from sqlalchemy import Column, String, Integer, Date, Time, DateTime, Boolean, Enum, BigInteger, Text, Index
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 from app.database.database import Base
@@ -11,17 +12,35 @@ class MeetingStatus(enum.Enum):
     COMPLETED = "Completed"
     CANCELLED = "Cancelled"
 
+class QuestionsStatus(enum.Enum):
+    PENDING = "Pending"
+    READY = "Ready"
+    FAILED = "Failed"
+
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        # Listings are keyset-paginated on (date, time, id), optionally after equality
+        # filters; each index serves one filter combination as a single range scan.
+        Index("ix_meetings_date_time_id", "date", "time", "id"),
+        Index("ix_meetings_status_date_time_id", "status", "date", "time", "id"),
+        Index("ix_meetings_interviewer_date_time_id", "interviewer_name", "date", "time", "id"),
+        # Upcoming meetings of an interviewer
+        Index("ix_meetings_interviewer_status_date_time_id", "interviewer_name", "status", "date", "time", "id"),
+        Index("ix_meetings_role_date_time_id", "role", "date", "time", "id"),
+    )
 
-    id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    # Large Text columns are deferred so listings and existence checks don't pull
+    # them. Load them explicitly with undefer_group("content") / undefer_group("report").
+    # SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True, autoincrement=True)
     date = Column(Date, nullable=False)
     time = Column(Time, nullable=False)
     name = Column(String, nullable=False)
     interviewer_name = Column(String, nullable=False)
     meet_link = Column(String, nullable=False)
     role = Column(String, nullable=False)
-    job_desc = Column(Text, nullable=True)
+    job_desc = deferred(Column(Text, nullable=True), group="content")
     experience = Column(String, nullable=True)  # Using String for flexibility
     skills = Column(String, nullable=True)
     status = Column(Enum(MeetingStatus), default=MeetingStatus.SCHEDULED, nullable=False)
@@ -29,16 +48,40 @@ class Meeting(Base):
     
     # Optional fields for review
     audio = Column(String, nullable=True)
-    transcript = Column(Text, nullable=True)
-    expected_questions = Column(Text, nullable=True)
+    transcript = deferred(Column(Text, nullable=True), group="content")
+    # Incremental transcript: segments live in transcript_segments. transcript_seq is the
+    # last allocated segment number, and transcript_summary covers segments up to summary_seq.
+    transcript_seq = Column(Integer, default=0, nullable=True)
+    transcript_summary = deferred(Column(Text, nullable=True), group="content")
+    summary_seq = Column(Integer, default=0, nullable=True)
+    # Legacy JSON blob of questions, superseded by interview_questions and no longer written
+    expected_questions = deferred(Column(Text, nullable=True), group="content")
+    # Last allocated interview_questions.ordinal of the meeting
+    question_seq = Column(Integer, default=0, nullable=True)
+    # Questions are generated after the meeting is created
+    expected_questions_status = Column(Enum(QuestionsStatus, native_enum=False, length=16), nullable=True)
+    # When generation last started and how many times. A meeting still Pending long after
+    # that lost its generation (e.g. the API restarted) and is retried by the report worker.
+    expected_questions_requested_at = Column(DateTime(timezone=True), nullable=True)
+    expected_questions_attempts = Column(Integer, default=0, nullable=True)
     confidence = Column(String, nullable=True)
     clarity = Column(String, nullable=True)
     ques_count = Column(String, nullable=True)
     correct_ans_count = Column(String, nullable=True)
     wrong_ans_count = Column(String, nullable=True)
-    what_went_well = Column(Text, nullable=True)
-    area_to_improve = Column(Text, nullable=True)
-    ai_feedback = Column(Text, nullable=True)
+    what_went_well = deferred(Column(Text, nullable=True), group="report")
+    area_to_improve = deferred(Column(Text, nullable=True), group="report")
+    ai_feedback = deferred(Column(Text, nullable=True), group="report")
     tech_knowledge = Column(String, nullable=True)
     overall_fit = Column(String, nullable=True)
-    speech_patterns = Column(String, nullable=True) 
\ No newline at end of file
+    speech_patterns = Column(String, nullable=True)
+    
+    # Numbers parsed from the text fields above when the report is stored, for aggregation.
+    # NULL when the text holds no usable number.
+    confidence_value = Column(Integer, nullable=True)
+    clarity_value = Column(Integer, nullable=True)
+    ques_count_value = Column(Integer, nullable=True)
+    correct_ans_count_value = Column(Integer, nullable=True)
+    wrong_ans_count_value = Column(Integer, nullable=True)
+    tech_knowledge_value = Column(Integer, nullable=True)
+    overall_fit_value = Column(Integer, nullable=True) 
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from app.database.database import Base
+
+class ProcessMetrics(Base):
+    """
+    Latest counters published by a long-running process, such as a report worker, so
+    the API can report metrics of processes it doesn't share memory with.
+    """
+    __tablename__ = "process_metrics"
+
+    # "<hostname>:<pid>"
+    process_id = Column(String, primary_key=True)
+    # Metric group, e.g. "llm_cache"
+    name = Column(String, primary_key=True)
+    role = Column(String, nullable=False)
+    counters = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Text, DateTime, Enum, ForeignKey, Index, JSON
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+import enum
+
+class ReportJobStatus(enum.Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        # Serves the worker's claim query
+        Index("ix_report_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    meeting_id = Column(BigInteger, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    audio = Column(String, nullable=True)
+    status = Column(Enum(ReportJobStatus), default=ReportJobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+    # Earliest time the job may be claimed, pushed back on retries
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    # While running, the job is reclaimable by another worker once this passes
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    # Seconds spent in each report stage by the successful run, e.g. {"voice": 41.2, "report": 18.7, ...}
+    stage_timings = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
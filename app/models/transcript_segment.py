@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Text, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        Index("ix_transcript_segments_meeting_seq", "meeting_id", "seq", unique=True),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    meeting_id = Column(BigInteger, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    # Position within the meeting, starting at 1, allocated from meetings.transcript_seq
+    seq = Column(Integer, nullable=False)
+    speaker = Column(String, nullable=True)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, Path
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from typing import Union
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -10,14 +12,32 @@ from app.schemas.analysis import AnalysisResponse, AnalysisData, ErrorResponse
 router = APIRouter(tags=["analysis"])
 
 @router.get("/meeting/{meeting_id}/analysis", response_model=Union[AnalysisResponse, ErrorResponse])
-def get_meeting_analysis(meeting_id: int = Path(..., title="The ID of the meeting to get analysis for"), 
-                        db: Session = Depends(get_db)):
+async def get_meeting_analysis(meeting_id: int = Path(..., title="The ID of the meeting to get analysis for"), 
+                        db: AsyncSession = Depends(get_db)):
     """
     Get analysis details by meeting ID.
     """
     try:
         # Query the meeting from database
-        meeting = db.query(MeetingModel).filter(MeetingModel.id == meeting_id).first()
+        # Only the analysis columns are needed, the transcript and job description stay deferred
+        result = await db.execute(
+            select(MeetingModel)
+            .options(load_only(
+                MeetingModel.confidence,
+                MeetingModel.clarity,
+                MeetingModel.ques_count,
+                MeetingModel.correct_ans_count,
+                MeetingModel.wrong_ans_count,
+                MeetingModel.tech_knowledge,
+                MeetingModel.overall_fit,
+                MeetingModel.ai_feedback,
+                MeetingModel.what_went_well,
+                MeetingModel.area_to_improve,
+                MeetingModel.speech_patterns
+            ))
+            .where(MeetingModel.id == meeting_id)
+        )
+        meeting = result.scalars().first()
         
         # Check if meeting exists
         if not meeting:
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Union
+from datetime import date
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database.database import engine, get_db
+from app.models.meeting import Meeting as MeetingModel
+from app.schemas.analytics import AnalyticsGroup, AnalyticsGroupBy, AnalyticsResponse, MetricStats, ErrorResponse
+from app.utils.scores import NUMERIC_FIELDS, SCORE_FIELDS
+
+router = APIRouter(tags=["analytics"])
+
+GROUP_COLUMNS = {
+    AnalyticsGroupBy.ROLE: MeetingModel.role,
+    AnalyticsGroupBy.INTERVIEWER: MeetingModel.interviewer_name,
+    AnalyticsGroupBy.DATE: MeetingModel.date,
+}
+
+@router.get("/analytics", response_model=Union[AnalyticsResponse, ErrorResponse])
+async def get_analytics(
+    group_by: AnalyticsGroupBy = Query(AnalyticsGroupBy.ROLE, description="Group meetings by role, interviewer or date"),
+    date_from: Optional[date] = Query(None, description="Only meetings on or after this date"),
+    date_to: Optional[date] = Query(None, description="Only meetings on or before this date"),
+    role: Optional[str] = Query(None, description="Only meetings for this role"),
+    interviewer: Optional[str] = Query(None, description="Only meetings with this interviewer"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Aggregate report scores per role, interviewer or date, computed in the database.
+    
+    Averages cover meetings whose report has a number for the metric. Score
+    percentiles (p50, p90) are only available on PostgreSQL.
+    """
+    try:
+        group_column = GROUP_COLUMNS[group_by]
+        columns = [
+            group_column.label("key"),
+            func.count().label("meetings"),
+            func.count(MeetingModel.overall_fit_value).label("scored"),
+        ]
+        for field in NUMERIC_FIELDS:
+            columns.append(func.avg(getattr(MeetingModel, f"{field}_value")).label(f"{field}_avg"))
+        
+        with_percentiles = engine.dialect.name == "postgresql"
+        if with_percentiles:
+            for field in SCORE_FIELDS:
+                value = getattr(MeetingModel, f"{field}_value")
+                columns.append(func.percentile_cont(0.5).within_group(value).label(f"{field}_p50"))
+                columns.append(func.percentile_cont(0.9).within_group(value).label(f"{field}_p90"))
+        
+        filters = []
+        if date_from:
+            filters.append(MeetingModel.date >= date_from)
+        if date_to:
+            filters.append(MeetingModel.date <= date_to)
+        if role:
+            filters.append(MeetingModel.role == role)
+        if interviewer:
+            filters.append(MeetingModel.interviewer_name == interviewer)
+        
+        result = await db.execute(
+            select(*columns)
+            .where(*filters)
+            .group_by(group_column)
+            .order_by(group_column)
+        )
+        
+        groups = []
+        for row in result.mappings():
+            metrics = {}
+            for field in NUMERIC_FIELDS:
+                avg = row[f"{field}_avg"]
+                stats = MetricStats(avg=round(float(avg), 2) if avg is not None else None)
+                if with_percentiles and field in SCORE_FIELDS:
+                    stats.p50 = row[f"{field}_p50"]
+                    stats.p90 = row[f"{field}_p90"]
+                metrics[field] = stats
+            groups.append(AnalyticsGroup(key=str(row["key"]), meetings=row["meetings"], scored=row["scored"], metrics=metrics))
+        
+        return AnalyticsResponse(status=200, group_by=group_by, groups=groups)
+    except SQLAlchemyError as e:
+        return ErrorResponse(status=400, errors=f"Database error: {str(e)}")
+    except Exception as e:
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
@@ -1,38 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Path, Query
-from sqlalchemy.orm import Session
-from typing import Dict, Optional, List, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Response, Path, Query, Request
+from sqlalchemy import insert, select, tuple_
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer_group
+from typing import Any, Dict, Optional, List, Union
 from sqlalchemy.exc import SQLAlchemyError
+import enum
 import json
+import os
+
+from dotenv import load_dotenv
 
 from app.database.database import get_db
-from app.models.meeting import Meeting as MeetingModel, MeetingStatus as DBMeetingStatus
+from app.models.meeting import (
+    Meeting as MeetingModel,
+    MeetingStatus as DBMeetingStatus,
+    QuestionsStatus as DBQuestionsStatus
+)
 from app.schemas.meeting import (
     MeetingCreate, 
-    BaseResponse, 
+    MeetingCreateResponse,
+    MeetingBulkResponse,
+    MeetingBulkResult,
     ErrorResponse, 
     MeetingsResponse, 
     MeetingDetailResponse,
     MeetingListItem,
     MeetingDetail,
-    MeetingStatus
+    MeetingFieldsResponse,
+    MeetingStatus,
+    SortOrder
 )
-from app.services.question_generator import generate_expected_questions
+from app.services.question_generator import populate_expected_questions, populate_expected_questions_for_profiles
+from app.services.question_store import load_questions
+from app.services.transcript_service import load_segments_text
+from app.utils.pagination import InvalidCursorError, cursor_scope, decode_cursor, encode_cursor
+
+# Load environment variables
+load_dotenv()
+
+# Time zone of the stored meeting dates and times, which have none of their own
+MEETING_TIMEZONE = ZoneInfo(os.getenv("MEETING_TIMEZONE", "UTC"))
 
 router = APIRouter(tags=["meetings"])
 
-@router.post("/meetings", response_model=Union[BaseResponse, ErrorResponse])
-def create_meeting(meeting: MeetingCreate, db: Session = Depends(get_db)):
+@router.post("/meetings", response_model=Union[MeetingCreateResponse, ErrorResponse])
+async def create_meeting(meeting: MeetingCreate, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     """
     Schedule a new meeting.
+    Expected questions are generated after the response is sent; poll
+    GET /meeting/{id} for expected_questions_status. If the process stops before
+    they are stored, the report worker generates them again.
     """
     try:
-        # Generate expected questions based on job description and candidate info
-        expected_questions_json = generate_expected_questions(
-            job_desc=meeting.job_desc,
-            experience=str(meeting.experience),
-            skills=meeting.skills
-        )
-        
         db_meeting = MeetingModel(
             date=meeting.date,
             time=meeting.time,
@@ -45,58 +66,244 @@ def create_meeting(meeting: MeetingCreate, db: Session = Depends(get_db)):
             skills=meeting.skills,
             status=DBMeetingStatus.SCHEDULED,
             is_review_ready=False,
-            expected_questions=expected_questions_json
+            expected_questions_status=DBQuestionsStatus.PENDING,
+            expected_questions_requested_at=datetime.now(timezone.utc),
+            expected_questions_attempts=1
         )
         db.add(db_meeting)
-        db.commit()
-        return BaseResponse(status=201)
+        await db.commit()
+        
+        # Generate expected questions based on job description and candidate info
+        background_tasks.add_task(
+            populate_expected_questions,
+            meeting_ids=[db_meeting.id],
+            job_desc=meeting.job_desc,
+            experience=str(meeting.experience),
+            skills=meeting.skills
+        )
+        
+        return MeetingCreateResponse(
+            status=201,
+            id=db_meeting.id,
+            expected_questions_status=DBQuestionsStatus.PENDING.value
+        )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         return ErrorResponse(status=400, errors=f"Failed to create meeting: {str(e)}")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
 
-@router.get("/meetings", response_model=Union[MeetingsResponse, ErrorResponse])
-def get_all_meetings(db: Session = Depends(get_db)):
+MAX_BULK_MEETINGS = 500
+
+@router.post("/meetings/bulk", response_model=Union[MeetingBulkResponse, ErrorResponse])
+async def create_meetings_bulk(
+    meetings: List[MeetingCreate],
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Get all meetings.
+    Schedule many meetings in one transaction.
+    Expected questions are generated in the background, once per unique
+    job description, experience and skills.
     """
+    if not meetings:
+        return ErrorResponse(status=400, errors="At least one meeting is required")
+    if len(meetings) > MAX_BULK_MEETINGS:
+        return ErrorResponse(status=400, errors=f"At most {MAX_BULK_MEETINGS} meetings can be created at once")
+    
     try:
-        db_meetings = db.query(MeetingModel).all()
-        meeting_list: List[MeetingListItem] = []
-        
-        for meeting in db_meetings:
-            # Convert DB enum to Pydantic enum
-            status_value = meeting.status.value if meeting.status else None
-            
-            meeting_list.append(
-                MeetingListItem(
-                    id=meeting.id,
-                    date=meeting.date,
-                    time=meeting.time,
-                    name=meeting.name,
-                    interviewer_name=meeting.interviewer_name,
-                    meet_link=meeting.meet_link,
-                    status=status_value,
-                    role=meeting.role
-                )
+        requested_at = datetime.now(timezone.utc)
+        rows = [
+            dict(
+                date=meeting.date,
+                time=meeting.time,
+                name=meeting.name,
+                interviewer_name=meeting.interviewer_name,
+                meet_link=meeting.meet_link,
+                role=meeting.role,
+                job_desc=meeting.job_desc,
+                experience=str(meeting.experience),
+                skills=meeting.skills,
+                status=DBMeetingStatus.SCHEDULED,
+                is_review_ready=False,
+                expected_questions_status=DBQuestionsStatus.PENDING,
+                expected_questions_requested_at=requested_at,
+                expected_questions_attempts=1
             )
-        
-        return MeetingsResponse(
-            status=200,
-            meetings=meeting_list
+            for meeting in meetings
+        ]
+        # One batched INSERT, returning the new ids in input order
+        result = await db.execute(
+            insert(MeetingModel).returning(MeetingModel.id, sort_by_parameter_order=True),
+            rows
         )
+        meeting_ids = result.scalars().all()
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        return ErrorResponse(status=400, errors=f"Failed to create meetings: {str(e)}")
+    except Exception as e:
+        await db.rollback()
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
+    
+    # Group meetings sharing a candidate profile so each profile is generated once
+    profiles: Dict[tuple, List[int]] = {}
+    for meeting, meeting_id in zip(meetings, meeting_ids):
+        profile = (meeting.job_desc, str(meeting.experience), meeting.skills)
+        profiles.setdefault(profile, []).append(meeting_id)
+    background_tasks.add_task(populate_expected_questions_for_profiles, profiles)
+    
+    return MeetingBulkResponse(
+        status=201,
+        results=[
+            MeetingBulkResult(
+                index=index,
+                status=201,
+                id=meeting_id,
+                expected_questions_status=DBQuestionsStatus.PENDING.value
+            )
+            for index, meeting_id in enumerate(meeting_ids)
+        ]
+    )
+
+# Only the columns needed to build a MeetingListItem, so listings never hydrate
+# the large Text columns of the meetings table.
+MEETING_LIST_COLUMNS = (
+    MeetingModel.id,
+    MeetingModel.date,
+    MeetingModel.time,
+    MeetingModel.name,
+    MeetingModel.interviewer_name,
+    MeetingModel.meet_link,
+    MeetingModel.status,
+    MeetingModel.role,
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def listing_filters(
+    interviewer: Optional[str] = Query(None, description="Only meetings with this interviewer"),
+    role: Optional[str] = Query(None, description="Only meetings for this role"),
+    date_from: Optional[date] = Query(None, description="Only meetings on or after this date"),
+    date_to: Optional[date] = Query(None, description="Only meetings on or before this date")
+) -> List[Any]:
+    """
+    Optional filters shared by the listing endpoints, each backed by a meetings index.
+    """
+    filters = []
+    if interviewer:
+        filters.append(MeetingModel.interviewer_name == interviewer)
+    if role:
+        filters.append(MeetingModel.role == role)
+    if date_from:
+        filters.append(MeetingModel.date >= date_from)
+    if date_to:
+        filters.append(MeetingModel.date <= date_to)
+    return filters
+
+def listing_scope(request: Request, sort: SortOrder = SortOrder.ASC) -> str:
+    """
+    Cursor scope of a listing request: its path, sort order and filter parameters.
+    """
+    params = {name: value for name, value in request.query_params.items() if name not in ("cursor", "limit")}
+    params["sort"] = sort.value
+    return cursor_scope(request.url.path, params)
+
+async def list_meetings_page(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str],
+    *filters,
+    scope: str,
+    sort: SortOrder = SortOrder.ASC
+) -> MeetingsResponse:
+    """
+    Fetch one page of meetings ordered by (date, time, id) using keyset pagination.
+    Cursors are tied to the scope (sort order and filters) of the listing they page through.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded or belongs to another scope
+    """
+    query = select(*MEETING_LIST_COLUMNS).where(*filters)
+    key = tuple_(MeetingModel.date, MeetingModel.time, MeetingModel.id)
+    
+    if cursor:
+        cursor_key = tuple_(*decode_cursor(cursor, scope))
+        query = query.where(key < cursor_key if sort == SortOrder.DESC else key > cursor_key)
+    
+    if sort == SortOrder.DESC:
+        order_by = (MeetingModel.date.desc(), MeetingModel.time.desc(), MeetingModel.id.desc())
+    else:
+        order_by = (MeetingModel.date, MeetingModel.time, MeetingModel.id)
+    
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(
+        query.order_by(*order_by)
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    meeting_list: List[MeetingListItem] = [
+        MeetingListItem(
+            id=row.id,
+            date=row.date,
+            time=row.time,
+            name=row.name,
+            interviewer_name=row.interviewer_name,
+            meet_link=row.meet_link,
+            status=row.status.value if row.status else None,
+            role=row.role
+        )
+        for row in rows
+    ]
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.date, last.time, last.id, scope)
+    
+    return MeetingsResponse(
+        status=200,
+        meetings=meeting_list,
+        next_cursor=next_cursor,
+        has_more=has_more
+    )
+
+@router.get("/meetings", response_model=Union[MeetingsResponse, ErrorResponse])
+async def get_all_meetings(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of meetings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    sort: SortOrder = Query(SortOrder.ASC, description="Order by date and time, ascending or descending"),
+    filters: List[Any] = Depends(listing_filters),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get all meetings, one page at a time.
+    """
+    try:
+        return await list_meetings_page(db, limit, cursor, *filters, scope=listing_scope(request, sort), sort=sort)
+    except InvalidCursorError as e:
+        return ErrorResponse(status=400, errors=str(e))
     except Exception as e:
         return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
 
 @router.get("/meetings/by-status", response_model=Union[MeetingsResponse, ErrorResponse])
-def get_meetings_by_status(
+async def get_meetings_by_status(
+    request: Request,
     status: str = Query(..., description="Filter meetings by status (Scheduled, In Progress, Completed, Cancelled)"),
-    db: Session = Depends(get_db)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of meetings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    sort: SortOrder = Query(SortOrder.ASC, description="Order by date and time, ascending or descending"),
+    filters: List[Any] = Depends(listing_filters),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Get meetings filtered by status.
+    Get meetings filtered by status, one page at a time.
     """
     try:
         # Validate the status parameter
@@ -109,42 +316,122 @@ def get_meetings_by_status(
                 errors=f"Invalid status. Must be one of: {', '.join([s.value for s in DBMeetingStatus])}"
             )
         
-        # Query meetings with the specified status
-        db_meetings = db.query(MeetingModel).filter(MeetingModel.status == db_status).all()
-        
-        meeting_list: List[MeetingListItem] = []
-        
-        for meeting in db_meetings:
-            # Convert DB enum to Pydantic enum
-            status_value = meeting.status.value if meeting.status else None
-            
-            meeting_list.append(
-                MeetingListItem(
-                    id=meeting.id,
-                    date=meeting.date,
-                    time=meeting.time,
-                    name=meeting.name,
-                    interviewer_name=meeting.interviewer_name,
-                    meet_link=meeting.meet_link,
-                    status=status_value,
-                    role=meeting.role
-                )
-            )
-        
-        return MeetingsResponse(
-            status=200,
-            meetings=meeting_list
+        return await list_meetings_page(
+            db, limit, cursor, MeetingModel.status == db_status, *filters,
+            scope=listing_scope(request, sort), sort=sort
         )
+    except InvalidCursorError as e:
+        return ErrorResponse(status=400, errors=str(e))
     except Exception as e:
         return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
 
-@router.get("/meeting/{meeting_id}", response_model=Union[MeetingDetailResponse, ErrorResponse])
-def get_meeting(meeting_id: int = Path(..., title="The ID of the meeting to get"), db: Session = Depends(get_db)):
+@router.get("/meetings/upcoming", response_model=Union[MeetingsResponse, ErrorResponse])
+async def get_upcoming_meetings(
+    request: Request,
+    interviewer: Optional[str] = Query(None, description="Only meetings with this interviewer"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of meetings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get scheduled meetings from now on, soonest first, one page at a time.
+    "Now" is the current time in MEETING_TIMEZONE, the zone meeting dates and times are stored in.
+    With an interviewer this is a single range scan of the interviewer/status index.
+    """
+    try:
+        now = datetime.now(MEETING_TIMEZONE)
+        filters = [
+            MeetingModel.status == DBMeetingStatus.SCHEDULED,
+            tuple_(MeetingModel.date, MeetingModel.time) >= tuple_(now.date(), now.time().replace(microsecond=0))
+        ]
+        if interviewer:
+            filters.insert(0, MeetingModel.interviewer_name == interviewer)
+        return await list_meetings_page(db, limit, cursor, *filters, scope=listing_scope(request))
+    except InvalidCursorError as e:
+        return ErrorResponse(status=400, errors=str(e))
+    except Exception as e:
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
+
+def parse_fields(fields: str) -> List[str]:
+    """
+    Split a ?fields= value into MeetingDetail field names.
+
+    Raises:
+        ValueError: If any of the requested fields is unknown
+    """
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in MeetingDetail.model_fields]
+    if unknown or not requested:
+        raise ValueError(
+            f"Invalid fields: {', '.join(unknown) or fields}. "
+            f"Must be any of: {', '.join(MeetingDetail.model_fields)}"
+        )
+    return list(dict.fromkeys(requested))
+
+async def meeting_transcript(db: AsyncSession, db_meeting: MeetingModel) -> Optional[str]:
+    """
+    The meeting's transcript, or the segments appended during the interview if it has none.
+    """
+    if not db_meeting.transcript and db_meeting.transcript_seq:
+        return await load_segments_text(db, db_meeting.id)
+    return db_meeting.transcript
+
+async def get_meeting_fields(db: AsyncSession, meeting_id: int, fields: List[str]) -> Union[MeetingFieldsResponse, ErrorResponse]:
+    """
+    Load and return only the requested columns of a meeting.
+    Expected questions come from the interview_questions table.
+    """
+    columns = [getattr(MeetingModel, field) for field in fields if field != "expected_questions"]
+    if "transcript" in fields:
+        columns.append(MeetingModel.transcript_seq)
+    result = await db.execute(
+        select(MeetingModel)
+        .options(load_only(MeetingModel.id, *columns))
+        .where(MeetingModel.id == meeting_id)
+    )
+    db_meeting = result.scalars().first()
+    if db_meeting is None:
+        return ErrorResponse(status=404, errors=f"Meeting with ID {meeting_id} not found")
+    
+    meeting_fields: Dict[str, Any] = {}
+    for field in fields:
+        if field == "expected_questions":
+            meeting_fields[field] = await load_questions(db, meeting_id)
+            continue
+        if field == "transcript":
+            meeting_fields[field] = await meeting_transcript(db, db_meeting)
+            continue
+        value = getattr(db_meeting, field)
+        if isinstance(value, enum.Enum):
+            # Convert DB enums to Pydantic enums
+            value = value.value
+        meeting_fields[field] = value
+    
+    return MeetingFieldsResponse(status=200, meeting=meeting_fields)
+
+@router.get("/meeting/{meeting_id}", response_model=Union[MeetingDetailResponse, MeetingFieldsResponse, ErrorResponse])
+async def get_meeting(
+    meeting_id: int = Path(..., title="The ID of the meeting to get"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return, e.g. id,name,status"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get a single meeting by ID.
     """
     try:
-        db_meeting = db.query(MeetingModel).filter(MeetingModel.id == meeting_id).first()
+        if fields:
+            try:
+                requested_fields = parse_fields(fields)
+            except ValueError as e:
+                return ErrorResponse(status=400, errors=str(e))
+            return await get_meeting_fields(db, meeting_id, requested_fields)
+        
+        result = await db.execute(
+            select(MeetingModel)
+            .options(undefer_group("content"), undefer_group("report"))
+            .where(MeetingModel.id == meeting_id)
+        )
+        db_meeting = result.scalars().first()
         if db_meeting is None:
             return ErrorResponse(status=404, errors=f"Meeting with ID {meeting_id} not found")
         
@@ -165,8 +452,11 @@ def get_meeting(meeting_id: int = Path(..., title="The ID of the meeting to get"
             status=status_value,
             is_review_ready=db_meeting.is_review_ready,
             audio=db_meeting.audio,
-            transcript=db_meeting.transcript,
-            expected_questions=db_meeting.expected_questions,
+            transcript=await meeting_transcript(db, db_meeting),
+            expected_questions=await load_questions(db, meeting_id),
+            expected_questions_status=(
+                db_meeting.expected_questions_status.value if db_meeting.expected_questions_status else None
+            ),
             confidence=db_meeting.confidence,
             clarity=db_meeting.clarity,
             ques_count=db_meeting.ques_count,
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Union
+
+from app.database.database import get_db, get_pool_stats
+from app.schemas.metrics import (
+    PoolMetricsResponse, LLMCacheMetricsResponse, ProcessLLMCacheStats, DownloadMetricsResponse,
+    ProcessDownloadStats, ErrorResponse
+)
+from app.services.llm_cache import LLM_CACHE_ENABLED
+from app.services.metrics_store import download_counters, llm_cache_counters, load_published_metrics, process_id
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/db-pool", response_model=Union[PoolMetricsResponse, ErrorResponse])
+def get_db_pool_metrics():
+    """
+    Get connection pool occupancy and checkout latency for each database engine.
+    """
+    try:
+        return PoolMetricsResponse(status=200, pools=get_pool_stats())
+    except Exception as e:
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
+
+@router.get("/llm-cache", response_model=Union[LLMCacheMetricsResponse, ErrorResponse])
+async def get_llm_cache_metrics(db: AsyncSession = Depends(get_db)):
+    """
+    Get hit, miss and eviction counters of the LLM response cache.
+
+    Counters are per process: `cache` is the API process that answered, `processes` the
+    latest snapshots published by report workers, which make most report LLM calls.
+    """
+    try:
+        published = await load_published_metrics(db, "llm_cache")
+        return LLMCacheMetricsResponse(
+            status=200,
+            enabled=LLM_CACHE_ENABLED,
+            process=process_id(),
+            cache=llm_cache_counters(),
+            processes=[
+                ProcessLLMCacheStats(process=row.process_id, role=row.role, updated_at=row.updated_at, cache=row.counters)
+                for row in published
+            ]
+        )
+    except Exception as e:
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
+
+@router.get("/downloads", response_model=Union[DownloadMetricsResponse, ErrorResponse])
+async def get_download_metrics(db: AsyncSession = Depends(get_db)):
+    """
+    Get counters and throughput of the audio downloads.
+
+    Counters are per process: `downloads` is the API process that answered, `processes`
+    the latest snapshots published by report workers, which make the downloads.
+    """
+    try:
+        published = await load_published_metrics(db, "downloads")
+        return DownloadMetricsResponse(
+            status=200,
+            process=process_id(),
+            downloads=download_counters(),
+            processes=[
+                ProcessDownloadStats(process=row.process_id, role=row.role, updated_at=row.updated_at, downloads=row.counters)
+                for row in published
+            ]
+        )
+    except Exception as e:
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
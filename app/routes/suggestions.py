@@ -1,80 +1,174 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Union, List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from typing import Any, Dict, Union, List, Tuple
 from sqlalchemy.exc import SQLAlchemyError
 import json
 
-from app.database.database import get_db
+from app.database.database import get_db, session_scope
+from app.models.interview_question import QuestionSource
 from app.models.meeting import Meeting as MeetingModel
 from app.schemas.suggestion import SuggestionRequest, SuggestionResponse, ErrorResponse
-from app.utils.ai_suggestions import get_suggested_questions
+from app.services.question_store import append_questions, load_questions
+from app.services.transcript_service import format_segments, load_unsummarized_segments, refresh_transcript_summary
+from app.utils.ai_suggestions import get_suggested_questions, stream_suggested_questions
+from app.utils.question_dedup import QuestionDeduplicator, filter_near_duplicates, prior_questions_digest
 
 router = APIRouter(tags=["suggestions"])
 
+async def load_suggestion_inputs(request: SuggestionRequest, db: AsyncSession) -> Union[Tuple[Dict[str, Any], List[str], bool], ErrorResponse]:
+    """
+    Load the meeting and build the inputs of the suggestion prompt.
+    Stores the request transcript on the meeting if it has none yet.
+    
+    When the request has no transcript and the meeting has appended transcript segments,
+    the prompt gets the rolling summary plus the segments it doesn't cover yet.
+    
+    Returns the prompt inputs, the meeting's prior questions for the duplicate filter,
+    and whether the summary should be refreshed afterwards.
+    """
+    # Check if the meeting exists
+    result = await db.execute(
+        select(MeetingModel)
+        .options(undefer_group("content"))
+        .where(MeetingModel.id == request.id)
+    )
+    meeting = result.scalars().first()
+    if not meeting:
+        return ErrorResponse(
+            status=404, 
+            errors=f"Meeting with ID {request.id} not found"
+        )
+    
+    # Get transcript from request or meeting
+    transcript = ""
+    transcript_summary = None
+    incremental = False
+    if request.transcript:
+        transcript = request.transcript
+        # If meeting has no transcript, update it
+        if not meeting.transcript:
+            meeting.transcript = request.transcript
+            await db.commit()
+    elif meeting.transcript_seq:
+        incremental = True
+        transcript_summary = meeting.transcript_summary
+        segments = await load_unsummarized_segments(db, meeting.id, meeting.summary_seq or 0)
+        transcript = format_segments(segments)
+    elif meeting.transcript:
+        transcript = meeting.transcript
+    
+    prior_questions = await load_questions(db, meeting.id)
+    
+    inputs = dict(
+        job_desc=meeting.job_desc if not request.job_desc else request.job_desc,
+        role=meeting.role if not request.role else request.role,
+        experience=str(meeting.experience) if not request.experience else str(request.experience),
+        skills=meeting.skills if not request.skills else request.skills,
+        # Only the latest questions, older repeats are caught by the duplicate filter
+        already_suggested_questions=prior_questions_digest(prior_questions),
+        transcript=transcript,
+        transcript_summary=transcript_summary
+    )
+    return inputs, prior_questions, incremental
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/suggestions", response_model=Union[SuggestionResponse, ErrorResponse])
-def generate_suggestions(request: SuggestionRequest, db: Session = Depends(get_db)):
+async def generate_suggestions(
+    request: SuggestionRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Generate real-time suggestions for interview questions.
     """
     try:
-        # Check if the meeting exists
-        meeting = db.query(MeetingModel).filter(MeetingModel.id == request.id).first()
-        if not meeting:
-            return ErrorResponse(
-                status=404, 
-                errors=f"Meeting with ID {request.id} not found"
-            )
-        
-        # Get transcript from request or meeting
-        transcript = ""
-        if request.transcript:
-            transcript = request.transcript
-            # If meeting has no transcript, update it
-            if not meeting.transcript:
-                meeting.transcript = request.transcript
-                db.commit()
-        elif meeting.transcript:
-            transcript = meeting.transcript
+        loaded = await load_suggestion_inputs(request, db)
+        if isinstance(loaded, ErrorResponse):
+            return loaded
+        inputs, prior_questions, incremental = loaded
         
         # Generate suggestions using AI (returns JSON string)
-        suggested_questions_json = get_suggested_questions(
-            job_desc=meeting.job_desc if not request.job_desc else request.job_desc,
-            role=meeting.role if not request.role else request.role,
-            experience=str(meeting.experience) if not request.experience else str(request.experience),
-            skills=meeting.skills if not request.skills else request.skills,
-            already_suggested_questions=meeting.expected_questions if meeting.expected_questions else "",
-            transcript=transcript
+        suggested_questions_json = await get_suggested_questions(**inputs)
+        suggested_questions = filter_near_duplicates(
+            [str(question) for question in json.loads(suggested_questions_json)], prior_questions
         )
         
-        # Update the meeting record with the expected questions
-        if meeting.expected_questions:
-            # Try to parse existing questions as JSON, if possible
-            try:
-                existing_questions = json.loads(meeting.expected_questions)
-                new_questions = json.loads(suggested_questions_json)
-                
-                # Combine the question arrays
-                combined_questions = existing_questions + new_questions
-                
-                # Store the combined questions
-                meeting.expected_questions = json.dumps(combined_questions)
-            except json.JSONDecodeError:
-                # If existing questions aren't in JSON format, store them separately
-                meeting.expected_questions = f"{meeting.expected_questions}\n\n--- Additional Questions ---\n{suggested_questions_json}"
-        else:
-            meeting.expected_questions = suggested_questions_json
-            
-        db.commit()
+        # Append the suggestions to the meeting's questions
+        await append_questions(db, [request.id], suggested_questions, QuestionSource.SUGGESTED)
+        await db.commit()
+        
+        if incremental:
+            # Fold the segments used here into the summary, so the next prompt stays small
+            background_tasks.add_task(refresh_transcript_summary, request.id)
         
         # Return the suggestions as parsed JSON for the API response
         return SuggestionResponse(
             status=200,
-            expected_questions=json.loads(suggested_questions_json)
+            expected_questions=suggested_questions
         )
     
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         return ErrorResponse(status=400, errors=f"Database error: {str(e)}")
     except Exception as e:
-        db.rollback()
-        return ErrorResponse(status=500, errors=f"Failed to generate suggestions: {str(e)}") 
\ No newline at end of file
+        await db.rollback()
+        return ErrorResponse(status=500, errors=f"Failed to generate suggestions: {str(e)}")
+
+@router.post(
+    "/suggestions/stream",
+    response_model=None,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Server-Sent Events stream"}}
+)
+async def stream_suggestions(request: SuggestionRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Stream suggestions for interview questions as Server-Sent Events.
+    
+    Emits a `question` event for each question as soon as it is parsed from the model
+    output, unless it repeats an earlier question, then a `done` event with all questions once they are saved to the meeting,
+    or an `error` event.
+    """
+    try:
+        loaded = await load_suggestion_inputs(request, db)
+        if isinstance(loaded, ErrorResponse):
+            return loaded
+        inputs, prior_questions, incremental = loaded
+    except SQLAlchemyError as e:
+        await db.rollback()
+        return ErrorResponse(status=400, errors=f"Database error: {str(e)}")
+    except Exception as e:
+        await db.rollback()
+        return ErrorResponse(status=500, errors=f"Failed to generate suggestions: {str(e)}")
+    
+    async def event_stream():
+        questions: List[str] = []
+        deduplicator = QuestionDeduplicator(prior_questions)
+        try:
+            async for question in stream_suggested_questions(**inputs):
+                if not deduplicator.add(question):
+                    continue
+                questions.append(question)
+                yield sse_event("question", {"question": question})
+            
+            # Save in a session of our own, the request session may be closed by now
+            async with session_scope() as session:
+                await append_questions(session, [request.id], questions, QuestionSource.SUGGESTED)
+                await session.commit()
+            
+            yield sse_event("done", {"status": 200, "expected_questions": questions})
+        except SQLAlchemyError as e:
+            yield sse_event("error", {"status": 400, "errors": f"Database error: {str(e)}"})
+        except Exception as e:
+            yield sse_event("error", {"status": 500, "errors": f"Failed to generate suggestions: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(refresh_transcript_summary, request.id) if incremental else None
+    )
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Union
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database.database import get_db
+from app.schemas.transcript import TranscriptChunksRequest, TranscriptChunksResponse, ErrorResponse
+from app.services.transcript_service import append_segments
+
+router = APIRouter(tags=["transcripts"])
+
+@router.post("/meeting/{meeting_id}/transcript/chunks", response_model=Union[TranscriptChunksResponse, ErrorResponse])
+async def append_transcript_chunks(
+    request: TranscriptChunksRequest,
+    meeting_id: int = Path(..., title="The ID of the meeting the transcript belongs to"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Append new transcript segments to a meeting during the interview.
+    
+    Clients send only what was said since their last call. Suggestions are then built
+    from a rolling summary of earlier segments plus the segments that are not summarized yet.
+    """
+    try:
+        seq_range = await append_segments(
+            db, meeting_id, [segment.model_dump() for segment in request.segments]
+        )
+        if seq_range is None:
+            return ErrorResponse(
+                status=404,
+                errors=f"Meeting with ID {meeting_id} not found"
+            )
+        
+        first_seq, last_seq = seq_range
+        return TranscriptChunksResponse(status=201, first_seq=first_seq, last_seq=last_seq)
+    
+    except SQLAlchemyError as e:
+        await db.rollback()
+        return ErrorResponse(status=400, errors=f"Database error: {str(e)}")
+    except Exception as e:
+        await db.rollback()
+        return ErrorResponse(status=500, errors=f"Internal server error: {str(e)}")
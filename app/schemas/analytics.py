@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from enum import Enum
+
+class AnalyticsGroupBy(str, Enum):
+    ROLE = "role"
+    INTERVIEWER = "interviewer"
+    DATE = "date"
+
+class MetricStats(BaseModel):
+    avg: Optional[float] = None
+    # Percentiles are computed on PostgreSQL only
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+
+class AnalyticsGroup(BaseModel):
+    key: str
+    meetings: int
+    scored: int
+    metrics: Dict[str, MetricStats]
+
+class AnalyticsResponse(BaseModel):
+    status: int
+    group_by: AnalyticsGroupBy
+    groups: List[AnalyticsGroup]
+
+class ErrorResponse(BaseModel):
+    status: int
+    errors: str
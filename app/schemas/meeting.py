@@ -1,8 +1,7 @@
-from pydantic import BaseModel, ConfigDict, validator, Field
-from typing import Optional, List, Union, Any
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Union, Any, Dict
 from datetime import date, time
 from enum import Enum
-import json
 
 class MeetingStatus(str, Enum):
     SCHEDULED = "Scheduled"
@@ -10,6 +9,15 @@ class MeetingStatus(str, Enum):
     COMPLETED = "Completed"
     CANCELLED = "Cancelled"
 
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class QuestionsStatus(str, Enum):
+    PENDING = "Pending"
+    READY = "Ready"
+    FAILED = "Failed"
+
 # Request Schemas
 class MeetingCreate(BaseModel):
     date: date
@@ -29,6 +37,19 @@ class BaseResponse(BaseModel):
 class ErrorResponse(BaseResponse):
     errors: str
 
+class MeetingCreateResponse(BaseResponse):
+    id: int
+    expected_questions_status: QuestionsStatus
+
+class MeetingBulkResult(BaseModel):
+    index: int
+    status: int
+    id: int
+    expected_questions_status: QuestionsStatus
+
+class MeetingBulkResponse(BaseResponse):
+    results: List[MeetingBulkResult]
+
 class MeetingListItem(BaseModel):
     id: int
     date: date
@@ -41,6 +62,8 @@ class MeetingListItem(BaseModel):
 
 class MeetingsResponse(BaseResponse):
     meetings: List[MeetingListItem]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 class MeetingDetail(BaseModel):
     id: int
@@ -57,7 +80,8 @@ class MeetingDetail(BaseModel):
     is_review_ready: bool
     audio: Optional[str] = None
     transcript: Optional[str] = None
-    expected_questions: Optional[Union[List[str], str]] = None
+    expected_questions: Optional[List[str]] = None
+    expected_questions_status: Optional[QuestionsStatus] = None
     confidence: Optional[str] = None
     clarity: Optional[str] = None
     ques_count: Optional[str] = None
@@ -69,21 +93,12 @@ class MeetingDetail(BaseModel):
     area_to_improve: Optional[str] = None
     ai_feedback: Optional[str] = None
     speech_patterns: Optional[str] = None
-    
-    @validator('expected_questions')
-    def validate_expected_questions(cls, v):
-        if not v:
-            return v
-        if isinstance(v, list):
-            return v
-        try:
-            # Try to parse as JSON
-            return json.loads(v)
-        except (json.JSONDecodeError, TypeError):
-            # If it's not valid JSON, return as is
-            return v
 
 class MeetingDetailResponse(BaseResponse):
     meeting: MeetingDetail
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class MeetingFieldsResponse(BaseResponse):
+    # Sparse fieldset of a MeetingDetail, returned when ?fields= is used
+    meeting: Dict[str, Any]
\ No newline at end of file
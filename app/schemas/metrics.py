@@ -0,0 +1,73 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class PoolStats(BaseModel):
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_avg_ms: float
+    checkout_wait_max_ms: float
+    checkout_wait_p50_ms: float
+    checkout_wait_p95_ms: float
+    checkout_wait_p99_ms: float
+    pool_size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+
+class PoolMetricsResponse(BaseModel):
+    status: int
+    pools: Dict[str, PoolStats]
+
+class LLMCacheStats(BaseModel):
+    hits: int
+    misses: int
+    redis_hits: int
+    redis_errors: int
+    evictions: int
+    expirations: int
+    entries: int
+    size_bytes: int
+
+class ProcessLLMCacheStats(BaseModel):
+    process: str
+    role: str
+    updated_at: datetime
+    cache: LLMCacheStats
+
+class LLMCacheMetricsResponse(BaseModel):
+    status: int
+    enabled: bool
+    # Process that answered the request, and its own counters
+    process: str
+    cache: Optional[LLMCacheStats] = None
+    # Latest counters published by other processes, such as report workers
+    processes: List[ProcessLLMCacheStats] = []
+
+class DownloadStats(BaseModel):
+    downloads: int
+    ranged_downloads: int
+    not_modified: int
+    failures: int
+    retries: int
+    bytes: int
+    seconds: float
+    throughput_bytes_per_second: float
+
+class ProcessDownloadStats(BaseModel):
+    process: str
+    role: str
+    updated_at: datetime
+    downloads: DownloadStats
+
+class DownloadMetricsResponse(BaseModel):
+    status: int
+    # Process that answered the request, and its own counters
+    process: str
+    downloads: DownloadStats
+    # Latest counters published by other processes, such as report workers
+    processes: List[ProcessDownloadStats] = []
+
+class ErrorResponse(BaseModel):
+    status: int
+    errors: str
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
+from datetime import datetime
 
 class ReportRequest(BaseModel):
     audio: str  # URL to audio file
@@ -7,7 +8,25 @@ class ReportRequest(BaseModel):
 class ReportResponse(BaseModel):
     status: int
     message: str
+    job_id: Optional[int] = None
+
+class ReportJobData(BaseModel):
+    id: int
+    meeting_id: int
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    # Seconds per report stage of the successful run
+    stage_timings: Optional[Dict[str, float]] = None
+    run_after: datetime
+    created_at: datetime
+    updated_at: datetime
+
+class ReportJobResponse(BaseModel):
+    status: int
+    job: ReportJobData
 
 class ErrorResponse(BaseModel):
     status: int
-    errors: str 
\ No newline at end of file
+    errors: str 
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class TranscriptChunk(BaseModel):
+    text: str = Field(..., min_length=1)
+    speaker: Optional[str] = None
+
+class TranscriptChunksRequest(BaseModel):
+    segments: List[TranscriptChunk] = Field(..., min_length=1)
+
+class TranscriptChunksResponse(BaseModel):
+    status: int
+    first_seq: int
+    last_seq: int
+
+class ErrorResponse(BaseModel):
+    status: int
+    errors: str
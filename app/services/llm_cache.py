@@ -0,0 +1,227 @@
+import os
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === Load environment variables ===
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Optional shared tier, e.g. redis://localhost:6379/0
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL")
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapse whitespace so prompts that only differ in formatting share a cache entry.
+    """
+    return " ".join(prompt.split())
+
+def cache_key(model_name: str, prompt: str, response_schema: Optional[dict] = None) -> str:
+    """
+    Content-addressed key for a model response. A response schema is part of the key,
+    since it changes the format of the response.
+    """
+    material = f"{model_name}\n{normalize_prompt(prompt)}"
+    if response_schema is not None:
+        material += "\n" + json.dumps(response_schema, sort_keys=True)
+    digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+    return f"llm:{digest}"
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache of strings with a TTL, bounded by entry count and total size.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self.size_bytes += size
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self.size_bytes -= len(value.encode("utf-8"))
+
+class LLMCache:
+    """
+    Two-tier response cache: the in-process LRU first, then Redis when configured.
+    Redis failures are logged and treated as misses, never as request failures.
+    """
+
+    def __init__(self, memory: LRUCache, redis_url: Optional[str] = None):
+        self.memory = memory
+        self.redis_url = redis_url
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+        self._redis = None
+        # redis.asyncio connections are bound to the event loop that opened them
+        self._async_redis = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _sync_redis(self):
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(self.redis_url, socket_timeout=1, socket_connect_timeout=1)
+        return self._redis
+
+    def _loop_redis(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_redis.get(loop)
+        if client is None:
+            import redis.asyncio
+
+            client = self._async_redis[loop] = redis.asyncio.Redis.from_url(
+                self.redis_url, socket_timeout=1, socket_connect_timeout=1
+            )
+        return client
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+        if self.redis_url:
+            try:
+                raw = self._sync_redis().get(key)
+            except Exception as e:
+                self._count("redis_errors")
+                logger.warning(f"LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self.memory.set(key, value)
+                self._count("hits")
+                self._count("redis_hits")
+                return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value)
+        if self.redis_url:
+            try:
+                self._sync_redis().set(key, value, ex=self.memory.ttl)
+            except Exception as e:
+                self._count("redis_errors")
+                logger.warning(f"LLM cache Redis write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+        if self.redis_url:
+            try:
+                raw = await self._loop_redis().get(key)
+            except Exception as e:
+                self._count("redis_errors")
+                logger.warning(f"LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self.memory.set(key, value)
+                self._count("hits")
+                self._count("redis_hits")
+                return value
+        self._count("misses")
+        return None
+
+    async def aset(self, key: str, value: str):
+        self.memory.set(key, value)
+        if self.redis_url:
+            try:
+                await self._loop_redis().set(key, value, ex=self.memory.ttl)
+            except Exception as e:
+                self._count("redis_errors")
+                logger.warning(f"LLM cache Redis write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "evictions": self.memory.evictions,
+            "expirations": self.memory.expirations,
+            "entries": len(self.memory),
+            "size_bytes": self.memory.size_bytes,
+        }
+
+def create_llm_cache() -> Optional[LLMCache]:
+    """
+    Build the cache from LLM_CACHE_* settings, or None when caching is disabled.
+    """
+    if not LLM_CACHE_ENABLED:
+        return None
+    memory = LRUCache(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SECONDS)
+    return LLMCache(memory, LLM_CACHE_REDIS_URL)
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Return the process-wide response cache, or None when caching is disabled.
+    Doesn't need an LLM backend, so metrics can read it without an API key.
+    """
+    global _cache
+    if LLM_CACHE_ENABLED and _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_llm_cache()
+    return _cache
@@ -0,0 +1,296 @@
+import os
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.services.llm_cache import LLMCache, cache_key, get_llm_cache
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === Load environment variables ===
+load_dotenv()
+
+# === Setup Environment ===
+GENAI_API_KEY = os.getenv("GOOGLE_API_KEY")
+# "gemini" calls the Gemini API, "fake" answers locally without network access
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# Maximum in-flight requests per process, counted separately for threads and the event loop
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Artificial latency of the fake backend, for load tests
+LLM_FAKE_LATENCY_MS = float(os.getenv("LLM_FAKE_LATENCY_MS", "0"))
+# Ask the model for JSON matching a response schema instead of free text, where a caller has one
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "false").lower() in ("1", "true", "yes")
+
+class LLMError(Exception):
+    """Raised when the language model cannot produce a response."""
+
+class GeminiBackend:
+    """
+    Gemini API backend. Configures the SDK once and reuses one model handle per model name.
+    """
+
+    def __init__(self, api_key: Optional[str]):
+        if not api_key:
+            raise LLMError("Set GOOGLE_API_KEY in .env file or as environment variable.")
+        import google.generativeai as genai
+
+        self._genai = genai
+        self._genai.configure(api_key=api_key)
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model_name: str):
+        model = self._models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._models.setdefault(model_name, self._genai.GenerativeModel(model_name))
+        return model
+
+    @staticmethod
+    def _generation_config(response_schema: Optional[dict]) -> Optional[dict]:
+        if response_schema is None:
+            return None
+        return {"response_mime_type": "application/json", "response_schema": response_schema}
+
+    def generate(self, prompt: str, model_name: str, timeout: float, response_schema: Optional[dict] = None) -> str:
+        response = self._model(model_name).generate_content(
+            prompt, generation_config=self._generation_config(response_schema), request_options={"timeout": timeout}
+        )
+        return response.text
+
+    async def generate_async(self, prompt: str, model_name: str, timeout: float,
+                             response_schema: Optional[dict] = None) -> str:
+        response = await self._model(model_name).generate_content_async(
+            prompt, generation_config=self._generation_config(response_schema), request_options={"timeout": timeout}
+        )
+        return response.text
+
+    async def stream_async(self, prompt: str, model_name: str, timeout: float,
+                           response_schema: Optional[dict] = None) -> AsyncIterator[str]:
+        response = await self._model(model_name).generate_content_async(
+            prompt, stream=True, generation_config=self._generation_config(response_schema),
+            request_options={"timeout": timeout}
+        )
+        async for chunk in response:
+            yield chunk.text
+
+class FakeBackend:
+    """
+    Deterministic local backend for tests and load tests.
+    Recognizes the prompts used in this app and answers in the format each expects,
+    derived from a hash of the prompt so identical prompts get identical answers.
+    """
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+
+    def generate(self, prompt: str, model_name: str, timeout: float, response_schema: Optional[dict] = None) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return fake_response(prompt, response_schema)
+
+    async def generate_async(self, prompt: str, model_name: str, timeout: float,
+                             response_schema: Optional[dict] = None) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return fake_response(prompt, response_schema)
+
+    async def stream_async(self, prompt: str, model_name: str, timeout: float,
+                           response_schema: Optional[dict] = None) -> AsyncIterator[str]:
+        text = fake_response(prompt, response_schema)
+        chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+        for chunk in chunks:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(chunks))
+            yield chunk
+
+def fake_response(prompt: str, response_schema: Optional[dict] = None) -> str:
+    """
+    Build the fake backend's answer to a prompt, as a JSON object when a report
+    is requested with a response schema.
+    """
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    score = lambda offset: int(digest[offset:offset + 2], 16) % 11
+
+    if "CONFIDENCE:" in prompt and "AI FEEDBACK:" in prompt:
+        questions = score(0) + 5
+        correct = min(score(2), questions)
+        feedback = (
+            f"Fake evaluation {digest[:8]}. The candidate answered most questions. "
+            "Technical depth was adequate. Communication was clear. The candidate is a reasonable fit."
+        )
+        if response_schema is not None:
+            return json.dumps({
+                "confidence": score(4),
+                "clarity": score(6),
+                "ques_count": questions,
+                "correct_ans_count": correct,
+                "wrong_ans_count": questions - correct,
+                "tech_knowledge": score(8),
+                "overall_fit": score(10),
+                "what_went_well": ["Clear communication", "Relevant experience", "Structured answers"],
+                "area_to_improve": ["Depth on system design", "Concrete examples", "Testing practices"],
+                "ai_feedback": feedback,
+            })
+        return (
+            f"CONFIDENCE: {score(4)}\n\n"
+            f"CLARITY: {score(6)}\n\n"
+            f"QUESTION COUNT: {questions}\n\n"
+            f"CORRECT ANSWERS: {correct}\n\n"
+            f"INCORRECT ANSWERS: {questions - correct}\n\n"
+            f"TECHNICAL KNOWLEDGE: {score(8)}\n\n"
+            f"OVERALL FIT: {score(10)}\n\n"
+            "WHAT WENT WELL:\nClear communication\nRelevant experience\nStructured answers\n\n"
+            "AREAS TO IMPROVE:\nDepth on system design\nConcrete examples\nTesting practices\n\n"
+            f"AI FEEDBACK: {feedback}"
+        )
+    if '"clarity"' in prompt and '"speech_patterns"' in prompt:
+        return json.dumps({
+            "clarity": {"score": score(0) % 10 + 1},
+            "confidence": {"score": score(2) % 10 + 1},
+            "speech_patterns": f"Fake speech pattern analysis {digest[:8]}",
+        })
+    if "Updated Interview Summary" in prompt:
+        return f"Fake interview summary {digest[:8]}."
+    return json.dumps([f"Fake question {n} ({digest[n * 8:n * 8 + 8]})?" for n in range(1, 4)])
+
+class LLMClient:
+    """
+    Shared client for text generation, with a per-process concurrency limit and timeout.
+    Responses are cached by model and normalized prompt unless a call opts out.
+    """
+
+    def __init__(self, backend, model_name: str, timeout: float, max_concurrency: int,
+                 cache: Optional[LLMCache] = None):
+        self.backend = backend
+        self.cache = cache
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        # asyncio semaphores are bound to one event loop, worker threads may run their own
+        self._async_slots = weakref.WeakKeyDictionary()
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_slots.get(loop)
+        if semaphore is None:
+            semaphore = self._async_slots[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def generate_content(self, prompt: str, use_cache: bool = True, response_schema: Optional[dict] = None) -> str:
+        """
+        Generate a completion for the prompt, blocking the calling thread.
+        Pass use_cache=False to always call the model, and a response_schema to get JSON
+        matching it.
+        """
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            key = cache_key(self.model_name, prompt, response_schema)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        with self._sync_slots:
+            text = self.backend.generate(prompt, self.model_name, self.timeout, response_schema)
+        
+        if use_cache:
+            self.cache.set(key, text)
+        return text
+
+    async def generate_content_async(self, prompt: str, use_cache: bool = True,
+                                     response_schema: Optional[dict] = None) -> str:
+        """
+        Generate a completion for the prompt without blocking the event loop.
+        Pass use_cache=False to always call the model, and a response_schema to get JSON
+        matching it.
+        """
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            key = cache_key(self.model_name, prompt, response_schema)
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+        
+        async with self._async_semaphore():
+            try:
+                text = await asyncio.wait_for(
+                    self.backend.generate_async(prompt, self.model_name, self.timeout, response_schema),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError as e:
+                raise LLMError(f"LLM request timed out after {self.timeout}s") from e
+        
+        if use_cache:
+            await self.cache.aset(key, text)
+        return text
+
+    async def stream_content_async(self, prompt: str, use_cache: bool = True,
+                                   response_schema: Optional[dict] = None) -> AsyncIterator[str]:
+        """
+        Yield the completion for the prompt in chunks as the model produces them.
+        A cached response is yielded as a single chunk; timeout applies between chunks.
+        """
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            key = cache_key(self.model_name, prompt, response_schema)
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        chunks = []
+        async with self._async_semaphore():
+            stream = self.backend.stream_async(prompt, self.model_name, self.timeout, response_schema).__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=self.timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError as e:
+                    raise LLMError(f"LLM stream stalled for {self.timeout}s") from e
+                chunks.append(chunk)
+                yield chunk
+        
+        if use_cache:
+            await self.cache.aset(key, "".join(chunks))
+
+def structured_output_schema(response_schema: dict) -> Optional[dict]:
+    """
+    The response schema to request with, or None when structured output is turned off.
+    """
+    return response_schema if LLM_STRUCTURED_OUTPUT else None
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    """
+    Return the process-wide LLM client, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if LLM_BACKEND == "fake":
+                    backend = FakeBackend(LLM_FAKE_LATENCY_MS)
+                elif LLM_BACKEND == "gemini":
+                    backend = GeminiBackend(GENAI_API_KEY)
+                else:
+                    raise LLMError(f"Unknown LLM_BACKEND: {LLM_BACKEND}")
+                logger.info(f"Using {LLM_BACKEND} LLM backend with model {LLM_MODEL}")
+                _client = LLMClient(
+                    backend, LLM_MODEL, LLM_TIMEOUT_SECONDS, LLM_MAX_CONCURRENCY, cache=get_llm_cache()
+                )
+    return _client
@@ -0,0 +1,107 @@
+import os
+import logging
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.process_metrics import ProcessMetrics
+from app.services.llm_cache import get_llm_cache
+from app.utils.downloader import get_audio_downloader
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === Load environment variables ===
+load_dotenv()
+
+# Seconds between two snapshots of a worker's counters in the process_metrics table
+METRICS_PUBLISH_INTERVAL = float(os.getenv("METRICS_PUBLISH_INTERVAL", "30"))
+# Snapshots older than this are from processes that stopped and are left out
+METRICS_STALE_AFTER = float(os.getenv("METRICS_STALE_AFTER", "300"))
+
+def process_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def llm_cache_counters() -> Optional[Dict[str, int]]:
+    cache = get_llm_cache()
+    return cache.stats() if cache is not None else None
+
+def download_counters() -> Dict[str, float]:
+    return get_audio_downloader().metrics.stats()
+
+# Counters of this process by metric group; a source returns None when it has nothing to report
+METRIC_SOURCES: Dict[str, Callable[[], Optional[dict]]] = {
+    "llm_cache": llm_cache_counters,
+    "downloads": download_counters,
+}
+
+def publish_metrics(db: Session, role: str) -> None:
+    """
+    Store a snapshot of this process's counters, replacing its previous one.
+    """
+    now = datetime.now(timezone.utc)
+    for name, source in METRIC_SOURCES.items():
+        counters = source()
+        if counters is not None:
+            db.merge(ProcessMetrics(process_id=process_id(), name=name, role=role, counters=counters, updated_at=now))
+    db.commit()
+
+def remove_metrics(db: Session) -> None:
+    """
+    Remove this process's snapshots, when it shuts down.
+    """
+    for row in db.scalars(select(ProcessMetrics).where(ProcessMetrics.process_id == process_id())):
+        db.delete(row)
+    db.commit()
+
+async def load_published_metrics(db: AsyncSession, name: str) -> List[ProcessMetrics]:
+    """
+    Recent snapshots of a metric group published by other processes, oldest process id first.
+    """
+    fresh_after = datetime.now(timezone.utc) - timedelta(seconds=METRICS_STALE_AFTER)
+    result = await db.scalars(
+        select(ProcessMetrics)
+        .where(ProcessMetrics.name == name, ProcessMetrics.process_id != process_id())
+        .order_by(ProcessMetrics.process_id)
+    )
+    # Compared in Python: SQLite returns naive timestamps
+    return [row for row in result if as_utc(row.updated_at) >= fresh_after]
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+class MetricsPublisher:
+    """
+    Publishes this process's counters at most every METRICS_PUBLISH_INTERVAL seconds.
+    Failures are logged and never interrupt the caller.
+    """
+
+    def __init__(self, session_factory, role: str, interval: float = METRICS_PUBLISH_INTERVAL):
+        self.session_factory = session_factory
+        self.role = role
+        self.interval = interval
+        self._last = float("-inf")
+
+    def maybe_publish(self) -> None:
+        if time.monotonic() - self._last < self.interval:
+            return
+        self._last = time.monotonic()
+        try:
+            with self.session_factory() as db:
+                publish_metrics(db, self.role)
+        except Exception:
+            logger.exception("Failed to publish process metrics")
+
+    def close(self) -> None:
+        try:
+            with self.session_factory() as db:
+                remove_metrics(db)
+        except Exception:
+            logger.exception("Failed to remove process metrics")
@@ -1,28 +1,34 @@
 import os
-import google.generativeai as genai
-from dotenv import load_dotenv
+import asyncio
 import logging
 import json
-import re
-from typing import Dict, Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, List, Tuple
+
+from sqlalchemy import func, or_, select, update
+
+from app.database.database import session_scope
+from app.models.interview_question import QuestionSource
+from app.models.meeting import Meeting as MeetingModel, QuestionsStatus
+from app.services.llm_client import get_llm_client, structured_output_schema
+from app.services.question_store import append_questions
+from app.utils.response_parser import QUESTION_LIST_SCHEMA, parse_json_array
 
 # === Setup logging ===
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# === Load environment variables ===
-load_dotenv()
-
-# === Setup Environment ===
-GENAI_API_KEY = os.getenv("GOOGLE_API_KEY")
-
-if not GENAI_API_KEY:
-    logger.warning("GOOGLE_API_KEY not found. Question generation will not work.")
-else:
-    # === Setup Clients ===
-    genai.configure(api_key=GENAI_API_KEY)
+# Profiles generated in parallel for one bulk import
+BULK_QUESTION_CONCURRENCY = int(os.getenv("BULK_QUESTION_CONCURRENCY", "4"))
+# Seconds a meeting may stay Pending after its questions were requested before the report
+# worker generates them again; must exceed the longest generation
+QUESTION_PENDING_TIMEOUT = float(os.getenv("QUESTION_PENDING_TIMEOUT", "600"))
+# Generations per meeting, including the first, before a stale meeting is marked Failed
+QUESTION_MAX_ATTEMPTS = int(os.getenv("QUESTION_MAX_ATTEMPTS", "3"))
+# Stale Pending meetings taken per sweep
+QUESTION_SWEEP_BATCH = int(os.getenv("QUESTION_SWEEP_BATCH", "50"))
 
-def generate_expected_questions(job_desc: str, experience: str, skills: str) -> Optional[str]:
+async def generate_expected_questions(job_desc: str, experience: str, skills: str) -> Optional[str]:
     """
     Generate expected interview questions based on job description and candidate info.
     
@@ -34,10 +40,6 @@ def generate_expected_questions(job_desc: str, experience: str, skills: str) ->
     Returns:
         A JSON string containing the generated questions or None if an error occurs
     """
-    if not GENAI_API_KEY:
-        logger.error("GOOGLE_API_KEY not set. Cannot generate questions.")
-        return None
-    
     logger.info("Generating expected questions...")
     
     # Format the candidate info
@@ -67,33 +69,122 @@ Do not include any text before or after the JSON array.
 """
 
     try:
-        # Generate the response using the compatible API
-        client = genai.GenerativeModel("gemini-1.5-flash")
-        response = client.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean the response to ensure it's valid JSON
-        # Remove any markdown code block formatting if present
-        response_text = re.sub(r'```json', '', response_text)
-        response_text = re.sub(r'```', '', response_text)
-        response_text = response_text.strip()
-        
-        # Parse the response as JSON to validate it
-        try:
-            questions = json.loads(response_text)
-            return json.dumps(questions)  # Return valid JSON string
-        except json.JSONDecodeError:
-            # If not valid JSON, attempt to parse numbered questions and convert to JSON
-            logger.warning("Response was not valid JSON, attempting to parse numbered format...")
-            numbered_pattern = r'\d+\.\s+(.*?)(?=\d+\.\s+|$)'
-            matches = re.findall(numbered_pattern, response_text, re.DOTALL)
-            
-            if matches:
-                questions = [q.strip() for q in matches]
-                return json.dumps(questions)
-            else:
-                # If all parsing attempts fail, return the raw text as a single item
-                return json.dumps([response_text])
+        # Generate the response with the shared client
+        response_text = await get_llm_client().generate_content_async(
+            prompt, response_schema=structured_output_schema(QUESTION_LIST_SCHEMA)
+        )
+        # Valid JSON, possibly in a code block, else numbered questions, else the raw text
+        return json.dumps(parse_json_array(response_text.strip()))
     except Exception as e:
         logger.error(f"Error generating questions: {e}")
-        return None 
\ No newline at end of file
+        return None 
+
+async def populate_expected_questions(meeting_ids: List[int], job_desc: str, experience: str, skills: str) -> None:
+    """
+    Generate expected questions once and store them on meetings sharing the same profile.
+    
+    Args:
+        meeting_ids: The meetings to update
+        job_desc: The job description
+        experience: The candidate's experience
+        skills: The candidate's skills
+    """
+    questions_json = await generate_expected_questions(job_desc=job_desc, experience=experience, skills=skills)
+    questions_status = QuestionsStatus.READY if questions_json else QuestionsStatus.FAILED
+    
+    try:
+        async with session_scope() as db:
+            if questions_json:
+                questions = json.loads(questions_json)
+                if not isinstance(questions, list):
+                    questions = [questions]
+                await append_questions(
+                    db, meeting_ids, [str(question) for question in questions], QuestionSource.EXPECTED
+                )
+            await db.execute(
+                update(MeetingModel)
+                .where(MeetingModel.id.in_(meeting_ids))
+                .values(expected_questions_status=questions_status)
+            )
+            await db.commit()
+        logger.info(f"Expected questions {questions_status.value.lower()} for meeting IDs {meeting_ids}")
+    except Exception as e:
+        logger.error(f"Error storing expected questions for meeting IDs {meeting_ids}: {e}")
+
+async def populate_expected_questions_for_profiles(
+    profiles: Dict[Tuple[str, str, str], List[int]],
+    max_concurrency: int = BULK_QUESTION_CONCURRENCY
+) -> None:
+    """
+    Generate expected questions once per unique candidate profile, a few profiles at a time.
+    
+    Args:
+        profiles: Meeting IDs keyed by their (job_desc, experience, skills) profile
+        max_concurrency: Maximum number of profiles generated in parallel
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def populate(profile: Tuple[str, str, str], meeting_ids: List[int]):
+        job_desc, experience, skills = profile
+        async with semaphore:
+            await populate_expected_questions(meeting_ids, job_desc=job_desc, experience=experience, skills=skills)
+    
+    await asyncio.gather(*(populate(profile, meeting_ids) for profile, meeting_ids in profiles.items()))
+
+async def retry_stale_expected_questions(limit: int = QUESTION_SWEEP_BATCH) -> int:
+    """
+    Generate the expected questions of meetings left Pending, whose generation was lost
+    because the process running it stopped. Meetings out of attempts are marked Failed.
+    
+    Rows locked by another sweep are skipped, and the claimed ones get a new request
+    time before generating, so concurrent workers don't pick up the same meeting.
+    
+    Returns:
+        The number of meetings whose questions were generated again
+    """
+    now = datetime.now(timezone.utc)
+    async with session_scope() as db:
+        result = await db.execute(
+            select(
+                MeetingModel.id, MeetingModel.job_desc, MeetingModel.experience, MeetingModel.skills,
+                MeetingModel.expected_questions_attempts
+            )
+            .where(
+                MeetingModel.expected_questions_status == QuestionsStatus.PENDING,
+                or_(
+                    MeetingModel.expected_questions_requested_at.is_(None),
+                    MeetingModel.expected_questions_requested_at < now - timedelta(seconds=QUESTION_PENDING_TIMEOUT)
+                )
+            )
+            .order_by(MeetingModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        exhausted = [row.id for row in rows if (row.expected_questions_attempts or 0) >= QUESTION_MAX_ATTEMPTS]
+        retried = [row for row in rows if (row.expected_questions_attempts or 0) < QUESTION_MAX_ATTEMPTS]
+        if exhausted:
+            await db.execute(
+                update(MeetingModel)
+                .where(MeetingModel.id.in_(exhausted))
+                .values(expected_questions_status=QuestionsStatus.FAILED)
+            )
+            logger.warning(f"Expected questions failed after {QUESTION_MAX_ATTEMPTS} attempts for meeting IDs {exhausted}")
+        if retried:
+            await db.execute(
+                update(MeetingModel)
+                .where(MeetingModel.id.in_([row.id for row in retried]))
+                .values(
+                    expected_questions_requested_at=now,
+                    expected_questions_attempts=func.coalesce(MeetingModel.expected_questions_attempts, 0) + 1
+                )
+            )
+        await db.commit()
+    
+    if retried:
+        logger.info(f"Retrying stale expected questions for meeting IDs {[row.id for row in retried]}")
+        profiles: Dict[Tuple[str, str, str], List[int]] = {}
+        for row in retried:
+            profiles.setdefault((row.job_desc, str(row.experience), row.skills), []).append(row.id)
+        await populate_expected_questions_for_profiles(profiles)
+    return len(retried)
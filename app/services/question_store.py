@@ -0,0 +1,57 @@
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.interview_question import InterviewQuestion, QuestionSource
+from app.models.meeting import Meeting as MeetingModel
+
+async def append_questions(
+    db: AsyncSession,
+    meeting_ids: List[int],
+    questions: List[str],
+    source: QuestionSource
+) -> Dict[int, int]:
+    """
+    Append the same questions to each of the meetings, without reading their existing questions.
+
+    Ordinals are reserved by incrementing meetings.question_seq, so concurrent appends
+    to a meeting get disjoint ranges. The caller commits.
+
+    Returns:
+        The first ordinal of the appended questions, by meeting ID, for the meetings that exist
+    """
+    if not meeting_ids or not questions:
+        return {}
+
+    result = await db.execute(
+        update(MeetingModel)
+        .where(MeetingModel.id.in_(meeting_ids))
+        .values(question_seq=func.coalesce(MeetingModel.question_seq, 0) + len(questions))
+        .returning(MeetingModel.id, MeetingModel.question_seq)
+        .execution_options(synchronize_session=False)
+    )
+    first_ordinals = {meeting_id: last_seq - len(questions) + 1 for meeting_id, last_seq in result.all()}
+    if not first_ordinals:
+        return {}
+
+    await db.execute(
+        insert(InterviewQuestion),
+        [
+            dict(meeting_id=meeting_id, ordinal=first_ordinal + offset, text=question, source=source)
+            for meeting_id, first_ordinal in first_ordinals.items()
+            for offset, question in enumerate(questions)
+        ]
+    )
+    return first_ordinals
+
+async def load_questions(db: AsyncSession, meeting_id: int) -> List[str]:
+    """
+    Load the questions of a meeting in the order they were added.
+    """
+    result = await db.execute(
+        select(InterviewQuestion.text)
+        .where(InterviewQuestion.meeting_id == meeting_id)
+        .order_by(InterviewQuestion.ordinal)
+    )
+    return list(result.scalars().all())
@@ -0,0 +1,185 @@
+import os
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import undefer_group
+
+from app.database.database import SessionLocal
+from app.models.meeting import Meeting as MeetingModel, MeetingStatus as DBMeetingStatus
+from app.services.transcript_service import load_transcript_text
+from app.utils.report_generator import generate_interview_report
+from app.utils.scores import NUMERIC_FIELDS, parse_numeric_fields
+from app.utils.voice_analyzer import analyze_voice
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === Load environment variables ===
+load_dotenv()
+
+# Report stages run at the same time within one job
+REPORT_STAGE_CONCURRENCY = int(os.getenv("REPORT_STAGE_CONCURRENCY", "2"))
+
+class Stage(NamedTuple):
+    name: str
+    # Called with the results of its dependencies, by stage name
+    run: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+
+def run_stages(stages: List[Stage], max_workers: int = REPORT_STAGE_CONCURRENCY) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run a small DAG of stages, each as soon as its dependencies are done, independent
+    stages concurrently in threads.
+    
+    Returns:
+        The result and the duration in seconds of each stage, by name
+    
+    Raises:
+        Exception: The first stage failure, after the running stages finish
+    """
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    pending = {stage.name: stage for stage in stages}
+    
+    def timed(stage: Stage, inputs: Dict[str, Any]):
+        started = time.monotonic()
+        try:
+            return stage.run(inputs)
+        finally:
+            timings[stage.name] = round(time.monotonic() - started, 3)
+    
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="report-stage") as executor:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dependency in results for dependency in stage.depends_on):
+                    inputs = {dependency: results[dependency] for dependency in stage.depends_on}
+                    running[executor.submit(timed, stage, inputs)] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Report stages with unmet dependencies: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                # Raises the stage's exception; the executor waits for the others on exit
+                results[name] = future.result()
+    return results, timings
+
+def process_report_generation(meeting_id: int, audio_url: str) -> Optional[Dict[str, float]]:
+    """
+    Analyze the recording and transcript of a meeting and store the report.
+    
+    The voice analysis and the transcript report don't depend on each other, so they
+    run concurrently, and their results are written to the meeting in one commit.
+    A failed voice analysis is logged and the report is stored without it.
+    
+    Args:
+        meeting_id: The meeting to generate the report for
+        audio_url: URL of the interview recording, may be empty
+        
+    Returns:
+        Seconds spent in each stage, plus "total", or None if the meeting doesn't exist
+        
+    Raises:
+        Exception: Any failure, so the report worker can retry the job
+    """
+    started = time.monotonic()
+    db_session = SessionLocal()
+    try:
+        # Get the meeting
+        meeting = (
+            db_session.query(MeetingModel)
+            .options(undefer_group("content"))
+            .filter(MeetingModel.id == meeting_id)
+            .first()
+        )
+        if not meeting:
+            logger.warning(f"Meeting with ID {meeting_id} not found")
+            return None
+        
+        # Fall back to the segments appended during the interview
+        transcript = meeting.transcript
+        if not transcript and meeting.transcript_seq:
+            transcript = load_transcript_text(db_session, meeting_id)
+        report_inputs = dict(
+            transcript=transcript,
+            role=meeting.role,
+            job_desc=meeting.job_desc,
+            experience=str(meeting.experience),
+            skills=meeting.skills
+        )
+        load_seconds = round(time.monotonic() - started, 3)
+        # Don't hold a connection while the stages run
+        db_session.commit()
+        
+        def voice_stage(inputs):
+            # The voice analysis is optional: its failure must not cost the transcript report
+            try:
+                return analyze_voice(audio_url)
+            except Exception:
+                logger.exception(f"Voice analysis raised for meeting ID {meeting_id}")
+                return None
+        
+        stages = []
+        if audio_url:
+            logger.info(f"Analyzing audio from URL: {audio_url}")
+            stages.append(Stage("voice", voice_stage))
+        if transcript:
+            stages.append(Stage("report", lambda inputs: generate_interview_report(**report_inputs)))
+        else:
+            # If no transcript available, we can't generate a report
+            logger.warning(f"Cannot generate report for meeting ID {meeting_id}: No transcript available")
+        results, timings = run_stages(stages)
+        timings = {"load": load_seconds, **timings}
+        
+        # Store audio URL
+        meeting.audio = audio_url
+        
+        voice_analysis = results.get("voice")
+        if voice_analysis:
+            meeting.clarity = voice_analysis["clarity"]
+            meeting.confidence = voice_analysis["confidence"]
+            meeting.speech_patterns = voice_analysis["speech_patterns"]
+            voice_values = parse_numeric_fields(voice_analysis)
+            meeting.clarity_value = voice_values["clarity_value"]
+            meeting.confidence_value = voice_values["confidence_value"]
+            logger.info(f"Voice analysis completed for meeting ID {meeting_id}")
+        elif audio_url:
+            logger.warning(f"Voice analysis failed for meeting ID {meeting_id}")
+        
+        report_data = results.get("report")
+        if report_data is not None:
+            # Update the meeting with report data
+            for key, value in report_data.items():
+                if hasattr(meeting, key) and key not in ["clarity", "confidence", "speech_patterns"]:
+                    setattr(meeting, key, value)
+            
+            # Store the numbers of the report text for analytics
+            numeric_values = parse_numeric_fields({field: getattr(meeting, field) for field in NUMERIC_FIELDS})
+            for key, value in numeric_values.items():
+                setattr(meeting, key, value)
+            
+            # Mark the review as ready
+            meeting.is_review_ready = True
+            
+            # Set meeting status to COMPLETED
+            meeting.status = DBMeetingStatus.COMPLETED
+        
+        # Save everything to the database at once
+        commit_started = time.monotonic()
+        db_session.commit()
+        timings["commit"] = round(time.monotonic() - commit_started, 3)
+        timings["total"] = round(time.monotonic() - started, 3)
+        
+        if report_data is not None:
+            logger.info(f"Report generation completed for meeting ID {meeting_id} in {timings['total']}s {timings}. Status set to COMPLETED.")
+        return timings
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
@@ -0,0 +1,150 @@
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.report_job import ReportJob, ReportJobStatus
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === Load environment variables ===
+load_dotenv()
+
+# Attempts per job, including the first run
+REPORT_JOB_MAX_ATTEMPTS = int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", "3"))
+# Seconds a claimed job stays invisible to other workers after it was claimed or its lock
+# last extended; a job whose worker died is retried after this
+REPORT_JOB_VISIBILITY_TIMEOUT = int(os.getenv("REPORT_JOB_VISIBILITY_TIMEOUT", "1800"))
+# Seconds between two extensions of the locks of running jobs; keep well below the timeout
+REPORT_JOB_HEARTBEAT_INTERVAL = float(os.getenv("REPORT_JOB_HEARTBEAT_INTERVAL", "60"))
+# Retry delay in seconds, doubled after every failed attempt
+REPORT_JOB_RETRY_BACKOFF = float(os.getenv("REPORT_JOB_RETRY_BACKOFF", "30"))
+REPORT_JOB_RETRY_BACKOFF_MAX = float(os.getenv("REPORT_JOB_RETRY_BACKOFF_MAX", "900"))
+
+class ClaimedJob(NamedTuple):
+    id: int
+    meeting_id: int
+    audio: Optional[str]
+    attempts: int
+    max_attempts: int
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff in seconds before the next attempt of a job.
+    """
+    return min(REPORT_JOB_RETRY_BACKOFF * (2 ** max(attempts - 1, 0)), REPORT_JOB_RETRY_BACKOFF_MAX)
+
+async def enqueue_report_job(db: AsyncSession, meeting_id: int, audio_url: Optional[str]) -> ReportJob:
+    """
+    Queue report generation for a meeting.
+    """
+    job = ReportJob(
+        meeting_id=meeting_id,
+        audio=audio_url,
+        status=ReportJobStatus.QUEUED,
+        attempts=0,
+        max_attempts=REPORT_JOB_MAX_ATTEMPTS,
+        run_after=utcnow()
+    )
+    db.add(job)
+    await db.commit()
+    return job
+
+def claim_report_jobs(db: Session, worker_id: str, limit: int) -> List[ClaimedJob]:
+    """
+    Claim up to `limit` runnable jobs for this worker.
+    
+    Runnable jobs are queued jobs whose retry delay has passed and running jobs
+    whose visibility timeout expired (their worker died). Rows locked by other
+    workers are skipped, so any number of workers can poll concurrently.
+    """
+    now = utcnow()
+    jobs = db.execute(
+        select(ReportJob)
+        .where(or_(
+            and_(ReportJob.status == ReportJobStatus.QUEUED, ReportJob.run_after <= now),
+            and_(ReportJob.status == ReportJobStatus.RUNNING, ReportJob.locked_until < now)
+        ))
+        .order_by(ReportJob.run_after, ReportJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    
+    claimed: List[ClaimedJob] = []
+    for job in jobs:
+        if job.attempts >= job.max_attempts:
+            # Only reachable for a timed-out final attempt
+            job.status = ReportJobStatus.FAILED
+            job.locked_until = None
+            job.last_error = f"Visibility timeout expired on attempt {job.attempts}"
+            logger.warning(f"Report job {job.id} failed: {job.last_error}")
+            continue
+        job.status = ReportJobStatus.RUNNING
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_until = now + timedelta(seconds=REPORT_JOB_VISIBILITY_TIMEOUT)
+        claimed.append(ClaimedJob(job.id, job.meeting_id, job.audio, job.attempts, job.max_attempts))
+    
+    db.commit()
+    return claimed
+
+def extend_report_job_locks(db: Session, job_ids: List[int], worker_id: str) -> int:
+    """
+    Push back the visibility timeout of jobs this worker is still running, so a run longer
+    than the timeout isn't claimed by another worker while it goes on.
+    
+    Returns:
+        The number of jobs still held by this worker
+    """
+    if not job_ids:
+        return 0
+    result = db.execute(
+        update(ReportJob)
+        .where(ReportJob.id.in_(job_ids), ReportJob.locked_by == worker_id, ReportJob.status == ReportJobStatus.RUNNING)
+        .values(locked_until=utcnow() + timedelta(seconds=REPORT_JOB_VISIBILITY_TIMEOUT))
+    )
+    db.commit()
+    return result.rowcount
+
+def complete_report_job(db: Session, job: ClaimedJob, worker_id: str,
+                        stage_timings: Optional[Dict[str, float]] = None) -> None:
+    """
+    Mark a claimed job as succeeded, unless another worker took it over.
+    """
+    db.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job.id, ReportJob.locked_by == worker_id, ReportJob.status == ReportJobStatus.RUNNING)
+        .values(status=ReportJobStatus.SUCCEEDED, locked_until=None, last_error=None, stage_timings=stage_timings)
+    )
+    db.commit()
+
+def fail_report_job(db: Session, job: ClaimedJob, worker_id: str, error: str) -> None:
+    """
+    Requeue a failed job with backoff, or mark it failed once out of attempts.
+    """
+    if job.attempts < job.max_attempts:
+        values = dict(
+            status=ReportJobStatus.QUEUED,
+            run_after=utcnow() + timedelta(seconds=retry_delay(job.attempts)),
+            locked_until=None,
+            last_error=error
+        )
+    else:
+        values = dict(status=ReportJobStatus.FAILED, locked_until=None, last_error=error)
+    
+    db.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job.id, ReportJob.locked_by == worker_id, ReportJob.status == ReportJobStatus.RUNNING)
+        .values(**values)
+    )
+    db.commit()
@@ -0,0 +1,146 @@
+import os
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.database import session_scope
+from app.models.meeting import Meeting as MeetingModel
+from app.models.transcript_segment import TranscriptSegment
+from app.services.llm_client import get_llm_client
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rough length limit for the rolling summary, in words
+TRANSCRIPT_SUMMARY_MAX_WORDS = int(os.getenv("TRANSCRIPT_SUMMARY_MAX_WORDS", "300"))
+
+def format_segments(segments: Sequence[TranscriptSegment]) -> str:
+    """
+    Join transcript segments into transcript text, one line per segment.
+    """
+    return "\n".join(
+        f"{segment.speaker}: {segment.text}" if segment.speaker else segment.text
+        for segment in segments
+    )
+
+async def append_segments(db: AsyncSession, meeting_id: int, segments: List[dict]) -> Optional[Tuple[int, int]]:
+    """
+    Append transcript segments to a meeting.
+    
+    Sequence numbers are reserved by incrementing meetings.transcript_seq, so concurrent
+    appends to the same meeting get disjoint, ordered ranges without reading the segments.
+    
+    Returns:
+        The first and last sequence number, or None if the meeting doesn't exist
+    """
+    result = await db.execute(
+        update(MeetingModel)
+        .where(MeetingModel.id == meeting_id)
+        .values(transcript_seq=func.coalesce(MeetingModel.transcript_seq, 0) + len(segments))
+        .returning(MeetingModel.transcript_seq)
+        .execution_options(synchronize_session=False)
+    )
+    last_seq = result.scalar_one_or_none()
+    if last_seq is None:
+        await db.rollback()
+        return None
+    
+    first_seq = last_seq - len(segments) + 1
+    await db.execute(
+        insert(TranscriptSegment),
+        [
+            dict(meeting_id=meeting_id, seq=first_seq + offset, speaker=segment.get("speaker"), text=segment["text"])
+            for offset, segment in enumerate(segments)
+        ]
+    )
+    await db.commit()
+    return first_seq, last_seq
+
+async def load_unsummarized_segments(db: AsyncSession, meeting_id: int, after_seq: int) -> List[TranscriptSegment]:
+    """
+    Load the segments that the meeting's rolling summary doesn't cover yet.
+    """
+    result = await db.execute(
+        select(TranscriptSegment)
+        .where(TranscriptSegment.meeting_id == meeting_id, TranscriptSegment.seq > after_seq)
+        .order_by(TranscriptSegment.seq)
+    )
+    return list(result.scalars().all())
+
+async def load_segments_text(db: AsyncSession, meeting_id: int) -> str:
+    """
+    Load the full transcript of a meeting from its segments, for the API.
+    """
+    result = await db.execute(
+        select(TranscriptSegment)
+        .where(TranscriptSegment.meeting_id == meeting_id)
+        .order_by(TranscriptSegment.seq)
+    )
+    return format_segments(result.scalars().all())
+
+def load_transcript_text(db: Session, meeting_id: int) -> str:
+    """
+    Load the full transcript of a meeting from its segments, for the report pipeline.
+    """
+    segments = (
+        db.query(TranscriptSegment)
+        .filter(TranscriptSegment.meeting_id == meeting_id)
+        .order_by(TranscriptSegment.seq)
+        .all()
+    )
+    return format_segments(segments)
+
+def build_summary_prompt(summary: Optional[str], new_transcript: str) -> str:
+    """Build the prompt that folds new transcript segments into the rolling summary."""
+    return f"""You are assisting an interviewer. Update the running summary of an interview with the latest part of the transcript.
+Keep the topics covered, the questions asked, the candidate's answers and any gaps or claims worth following up on.
+Keep it under {TRANSCRIPT_SUMMARY_MAX_WORDS} words.
+
+Current Interview Summary:
+{summary or "(none yet)"}
+
+Latest Interview Transcript:
+{new_transcript}
+
+Return only the Updated Interview Summary as plain text.
+"""
+
+async def refresh_transcript_summary(meeting_id: int) -> None:
+    """
+    Fold the unsummarized segments of a meeting into its rolling summary.
+    
+    The update only applies if no other refresh moved summary_seq in the meantime,
+    so concurrent refreshes can't replace a newer summary with an older one.
+    """
+    try:
+        async with session_scope() as db:
+            result = await db.execute(
+                select(MeetingModel.transcript_summary, MeetingModel.summary_seq)
+                .where(MeetingModel.id == meeting_id)
+            )
+            row = result.first()
+            if row is None:
+                return
+            summary, summary_seq = row.transcript_summary, row.summary_seq or 0
+            
+            segments = await load_unsummarized_segments(db, meeting_id, summary_seq)
+            if not segments:
+                return
+            
+            new_summary = await get_llm_client().generate_content_async(
+                build_summary_prompt(summary, format_segments(segments))
+            )
+            
+            await db.execute(
+                update(MeetingModel)
+                .where(MeetingModel.id == meeting_id, func.coalesce(MeetingModel.summary_seq, 0) == summary_seq)
+                .values(transcript_summary=new_summary.strip(), summary_seq=segments[-1].seq)
+            )
+            await db.commit()
+            logger.info(f"Transcript summary of meeting ID {meeting_id} now covers segments up to {segments[-1].seq}")
+    except Exception as e:
+        logger.error(f"Failed to refresh transcript summary for meeting ID {meeting_id}: {e}")
@@ -1,23 +1,16 @@
-import os
-import google.generativeai as genai
-from dotenv import load_dotenv
 import json
-import re
+from typing import AsyncIterator
 
-# Load environment variables
-load_dotenv()
+from app.services.llm_client import get_llm_client, structured_output_schema
+from app.utils.prompt_builder import available_tokens, tail_window
+from app.utils.response_parser import QUESTION_LIST_SCHEMA, JSONArrayStreamParser, parse_question_list
 
-# Setup Environment
-GENAI_API_KEY = os.getenv("GOOGLE_API_KEY")
-
-if not GENAI_API_KEY:
-    raise EnvironmentError("Set GOOGLE_API_KEY in .env file or as environment variable.")
-
-# Configure Gemini AI
-genai.configure(api_key=GENAI_API_KEY)
-
-def get_suggested_questions(job_desc: str, role: str, experience: str, skills: str, already_suggested_questions: str, transcript: str = None):
-    """Get suggested questions based on the interview transcript and job details."""
+def build_suggestion_prompt(job_desc: str, role: str, experience: str, skills: str, already_suggested_questions: str, transcript: str = None, transcript_summary: str = None) -> str:
+    """
+    Build the suggestion prompt from the interview transcript and job details.
+    With a transcript summary, the transcript is only the part the summary doesn't cover.
+    The transcript is cut to its most recent lines that fit in the prompt token budget.
+    """
     
     # Construct job description from inputs
     jd = f"""
@@ -29,7 +22,15 @@ def get_suggested_questions(job_desc: str, role: str, experience: str, skills: s
     {job_desc}
     """
     
-    prompt = f"""You are an expert interviewer. Based on the following interview transcript and job description, suggest three follow-up questions. 
+    def render(transcript: str) -> str:
+        if transcript_summary:
+            transcript = f"""Summary of the interview so far:
+{transcript_summary}
+
+Latest part of the interview:
+{transcript}"""
+        
+        return f"""You are an expert interviewer. Based on the following interview transcript and job description, suggest three follow-up questions. 
 The questions should be one of these types:
 1. A question to evaluate the candidate's technical knowledge based on their previous answers
 2. A skill mentioned in Job description
@@ -54,38 +55,39 @@ Format your response like this:
 
 Ensure your response is valid JSON that can be parsed directly. Do not include any text before or after the JSON array.
 """
+    
+    return render(tail_window(transcript, available_tokens(render(""))))
 
-    try:
-        # Create Gemini model client
-        client = genai.GenerativeModel("gemini-1.5-flash")
+def parse_suggested_questions(response_text: str) -> str:
+    """Parse a complete model response into a JSON array string of questions."""
+    return json.dumps(parse_question_list(response_text.strip()))
 
-        # Generate the response
-        response = client.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean the response to ensure it's valid JSON
-        # Remove any markdown code block formatting if present
-        response_text = re.sub(r'```json', '', response_text)
-        response_text = re.sub(r'```', '', response_text)
-        response_text = response_text.strip()
-        
-        # Parse the response as JSON to validate it
-        try:
-            questions = json.loads(response_text)
-            return json.dumps(questions)  # Return valid JSON string
-        except json.JSONDecodeError:
-            # If not valid JSON, attempt to parse numbered questions and convert to JSON
-            print("Response was not valid JSON, attempting to parse numbered format...")
-            numbered_pattern = r'\d+\.\s+(.*?)(?=\d+\.\s+|$)'
-            matches = re.findall(numbered_pattern, response_text, re.DOTALL)
-            
-            if matches:
-                questions = [q.strip() for q in matches]
-                return json.dumps(questions)
-            else:
-                # If all parsing attempts fail, return the raw text as a single item
-                return json.dumps([response_text])
-            
+async def stream_suggested_questions(job_desc: str, role: str, experience: str, skills: str, already_suggested_questions: str, transcript: str = None, transcript_summary: str = None) -> AsyncIterator[str]:
+    """Yield suggested questions one at a time as they are parsed from the streaming response."""
+    prompt = build_suggestion_prompt(job_desc, role, experience, skills, already_suggested_questions, transcript, transcript_summary)
+    parser = JSONArrayStreamParser()
+    
+    async for chunk in get_llm_client().stream_content_async(
+        prompt, response_schema=structured_output_schema(QUESTION_LIST_SCHEMA)
+    ):
+        for question in parser.feed(chunk):
+            yield question
+    
+    if not parser.items:
+        # Not a JSON array, fall back to the full-response parser
+        for question in parse_question_list(parser.text.strip()):
+            yield question
+
+async def get_suggested_questions(job_desc: str, role: str, experience: str, skills: str, already_suggested_questions: str, transcript: str = None, transcript_summary: str = None):
+    """Get suggested questions based on the interview transcript and job details."""
+    prompt = build_suggestion_prompt(job_desc, role, experience, skills, already_suggested_questions, transcript, transcript_summary)
+
+    try:
+        # Generate the response with the shared client
+        response_text = await get_llm_client().generate_content_async(
+            prompt, response_schema=structured_output_schema(QUESTION_LIST_SCHEMA)
+        )
+        return parse_suggested_questions(response_text)
     except Exception as e:
         print(f"Error getting suggestions: {e}")
-        raise Exception(f"Failed to generate suggestions: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Failed to generate suggestions: {str(e)}")
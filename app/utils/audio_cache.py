@@ -0,0 +1,160 @@
+import os
+import hashlib
+import json
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.utils.audio_features import AUDIO_ANALYSIS_SAMPLE_RATE
+from app.utils import transcription
+
+# Load environment variables
+load_dotenv()
+
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Shared by all processes on the host that use the same directory
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "interview-audio-cache"))
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Bump when feature extraction or transcription changes in a way that changes cached results
+AUDIO_CACHE_VERSION = 1
+
+def analysis_settings() -> str:
+    """
+    Settings the cached features and transcript depend on, part of every analysis key.
+    """
+    return json.dumps([
+        AUDIO_CACHE_VERSION,
+        AUDIO_ANALYSIS_SAMPLE_RATE,
+        transcription.TRANSCRIPTION_BACKEND,
+        transcription.TRANSCRIPTION_MIN_SILENCE_SECONDS,
+        transcription.TRANSCRIPTION_MAX_SEGMENT_SECONDS,
+        transcription.TRANSCRIPTION_MAX_PAUSE_SECONDS,
+    ])
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class AudioCache:
+    """
+    On-disk cache of the audio features and transcript of recordings, keyed by the
+    SHA-256 of the recording's content, plus an index of the validators (ETag,
+    Last-Modified) and content hash last seen for each audio URL.
+
+    Entries are small JSON files written atomically, so several processes can share the
+    directory. Reading an entry refreshes its mtime; when the directory grows past
+    max_bytes the entries with the oldest mtime are removed first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "analysis"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "urls"), exist_ok=True)
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.directory, kind, f"{key}.json")
+
+    def _read(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable audio cache entry {path}: {e}")
+            return None
+
+    def _write(self, path: str, entry: dict):
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Failed to write audio cache entry {path}: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            for kind in ("analysis", "urls"):
+                with os.scandir(os.path.join(self.directory, kind)) as scan:
+                    for entry in scan:
+                        if entry.name.endswith(".json"):
+                            try:
+                                stat = entry.stat()
+                            except FileNotFoundError:
+                                continue
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def get_analysis(self, content_hash: str) -> Optional[dict]:
+        """
+        Cached {"features": ..., "transcript": ...} of a recording, for the current settings.
+        """
+        return self._read(self._path("analysis", _digest(f"{analysis_settings()}\n{content_hash}")))
+
+    def set_analysis(self, content_hash: str, features: Dict[str, float], transcript: str):
+        self._write(
+            self._path("analysis", _digest(f"{analysis_settings()}\n{content_hash}")),
+            {"content_hash": content_hash, "features": features, "transcript": transcript}
+        )
+
+    def get_url(self, url: str) -> Optional[dict]:
+        """
+        The {"etag", "last_modified", "content_hash"} last seen for an audio URL.
+        """
+        entry = self._read(self._path("urls", _digest(url)))
+        return entry if entry and entry.get("url") == url else None
+
+    def set_url(self, url: str, content_hash: str, etag: Optional[str], last_modified: Optional[str]):
+        self._write(
+            self._path("urls", _digest(url)),
+            {"url": url, "etag": etag, "last_modified": last_modified, "content_hash": content_hash}
+        )
+
+def conditional_headers(url_entry: Optional[dict]) -> Dict[str, str]:
+    """
+    Request headers that let the server answer 304 if the recording hasn't changed.
+    """
+    headers = {}
+    if url_entry:
+        if url_entry.get("etag"):
+            headers["If-None-Match"] = url_entry["etag"]
+        if url_entry.get("last_modified"):
+            headers["If-Modified-Since"] = url_entry["last_modified"]
+    return headers
+
+_cache: Optional[AudioCache] = None
+_cache_lock = threading.Lock()
+
+def get_audio_cache() -> Optional[AudioCache]:
+    """
+    Return the process-wide audio cache, or None when caching is disabled.
+    """
+    global _cache
+    if AUDIO_CACHE_ENABLED and _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = AudioCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES)
+                except OSError as e:
+                    print(f"Audio cache disabled, can't use {AUDIO_CACHE_DIR}: {e}")
+                    return None
+    return _cache
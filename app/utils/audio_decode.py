@@ -0,0 +1,145 @@
+import os
+import struct
+import subprocess
+import tempfile
+import threading
+from typing import Iterator, NamedTuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+# Seconds ffmpeg may take to decode one recording
+AUDIO_DECODE_TIMEOUT = float(os.getenv("AUDIO_DECODE_TIMEOUT", "300"))
+
+class AudioDecodeError(Exception):
+    """Raised when a recording can't be decoded."""
+
+class DecodedAudio(NamedTuple):
+    """Mono 16-bit PCM samples of a recording."""
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+class AudioStream:
+    """
+    Any format ffmpeg reads, decoded to mono 16-bit samples on a pipe and read a block
+    at a time, so memory doesn't grow with the length of the recording. Channels are
+    averaged; sample_rate 0 keeps the recording's rate.
+
+    Use as a context manager: leaving it stops ffmpeg if it is still running.
+    """
+
+    def __init__(self, audio_file_path: str, sample_rate: int = 0):
+        self.audio_file_path = audio_file_path
+        command = [
+            FFMPEG_BINARY, "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-i", audio_file_path,
+            "-vn", "-map_metadata", "-1", "-ac", "1", "-acodec", "pcm_s16le",
+        ]
+        if sample_rate:
+            command += ["-ar", str(sample_rate)]
+        command += ["-f", "wav", "-"]
+
+        # ffmpeg's messages go to a file, a full stderr pipe would block it
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=self._stderr)
+        except FileNotFoundError as e:
+            self._stderr.close()
+            raise AudioDecodeError(f"{FFMPEG_BINARY} not found, install ffmpeg or set FFMPEG_BINARY") from e
+        self._timed_out = False
+        self._timer = threading.Timer(AUDIO_DECODE_TIMEOUT, self._timeout)
+        self._timer.daemon = True
+        self._timer.start()
+        try:
+            self.sample_rate = self._read_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "AudioStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _timeout(self):
+        self._timed_out = True
+        self._process.kill()
+
+    def _read(self, size: int) -> bytes:
+        data = self._process.stdout.read(size)
+        if len(data) < size:
+            # End of the stream: report why ffmpeg stopped, if it failed
+            self._check_exit()
+        return data
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._read(size)
+        if len(data) < size:
+            raise AudioDecodeError(f"Truncated WAV stream from ffmpeg for {self.audio_file_path}")
+        return data
+
+    def _check_exit(self):
+        returncode = self._process.wait()
+        if self._timed_out:
+            raise AudioDecodeError(f"Decoding {self.audio_file_path} timed out after {AUDIO_DECODE_TIMEOUT}s")
+        if returncode != 0:
+            self._stderr.seek(0)
+            message = self._stderr.read().decode("utf-8", "replace").strip()
+            raise AudioDecodeError(f"ffmpeg failed to decode {self.audio_file_path}: {message}")
+
+    def _read_header(self) -> int:
+        """
+        Read the WAV header up to the samples. ffmpeg can't seek back to fill in the
+        chunk sizes of a pipe, so the data chunk runs to the end of the stream.
+        """
+        riff = self._read_exact(12)
+        if riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise AudioDecodeError("ffmpeg output is not a WAV stream")
+
+        sample_rate = None
+        while True:
+            chunk_id, chunk_size = struct.unpack("<4sI", self._read_exact(8))
+            if chunk_id == b"data":
+                if sample_rate is None:
+                    raise AudioDecodeError("WAV stream has no format chunk")
+                return sample_rate
+            chunk = self._read_exact(chunk_size + chunk_size % 2)
+            if chunk_id == b"fmt ":
+                audio_format, channels, sample_rate = struct.unpack_from("<HHI", chunk)
+                bits = struct.unpack_from("<H", chunk, 14)[0]
+                if audio_format != 1 or channels != 1 or bits != 16:
+                    raise AudioDecodeError(f"Unexpected PCM format {audio_format}/{channels}ch/{bits}bit")
+
+    def blocks(self, block_samples: int) -> Iterator[np.ndarray]:
+        """
+        Read the samples as int16 blocks of block_samples, the last one shorter.
+        Raises AudioDecodeError if the recording has no samples or ffmpeg fails.
+        """
+        total = 0
+        while True:
+            data = self._read(block_samples * 2)
+            samples = np.frombuffer(data, dtype="<i2", count=len(data) // 2)
+            if len(samples):
+                total += len(samples)
+                yield samples
+            if len(data) < block_samples * 2:
+                break
+        if not total:
+            raise AudioDecodeError(f"No audio samples in {self.audio_file_path}")
+
+    def close(self):
+        self._timer.cancel()
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._process.stdout.close()
+        self._stderr.close()
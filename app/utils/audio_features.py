@@ -0,0 +1,273 @@
+import os
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+import librosa
+import numpy as np
+import scipy.signal
+import soxr
+from dotenv import load_dotenv
+
+from app.utils.audio_decode import AudioStream
+
+# Load environment variables
+load_dotenv()
+
+# Analysis frames per streamed block. Peak memory is about 40 KB per frame, mostly the
+# spectrogram, independent of the recording length.
+AUDIO_STREAM_BLOCK_FRAMES = int(os.getenv("AUDIO_STREAM_BLOCK_FRAMES", "256"))
+# Mono sample rate the features are computed at; 0 keeps the recording's own rate.
+# 16000 is several times faster for 44.1/48 kHz recordings, but changes the scale of
+# speech_rate, which is a zero-crossing rate per sample.
+AUDIO_ANALYSIS_SAMPLE_RATE = int(os.getenv("AUDIO_ANALYSIS_SAMPLE_RATE", "0"))
+
+# librosa defaults used by the original whole-file analysis
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+SILENCE_THRESHOLD = 0.01
+# librosa.zero_crossings treats values this close to zero as zero, i.e. positive
+ZERO_CROSSING_THRESHOLD = 1e-10
+# librosa.piptrack defaults
+PITCH_FMIN = 150.0
+PITCH_FMAX = 4000.0
+PITCH_THRESHOLD = 0.1
+
+class RunningStats:
+    """
+    Online mean and population variance over batches of values (Chan et al. merge of Welford).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        n = values.size
+        if n == 0:
+            return
+        values = values.astype(np.float64, copy=False)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
+def pcm_to_float(block: np.ndarray) -> np.ndarray:
+    """
+    Convert a block of mono samples to float32, scaling 16-bit samples to [-1, 1) the
+    way soundfile reads them.
+    """
+    if block.dtype == np.int16:
+        return block.astype(np.float32) * np.float32(1 / 32768)
+    return block.astype(np.float32, copy=False)
+
+def pcm_blocks(samples: np.ndarray, block_samples: int) -> Iterator[np.ndarray]:
+    """
+    Slice decoded mono samples into float32 blocks, converting one block at a time.
+    """
+    for start in range(0, len(samples), block_samples):
+        yield pcm_to_float(samples[start:start + block_samples])
+
+def resample_blocks(blocks: Iterable[np.ndarray], input_rate: int, output_rate: int) -> Iterator[np.ndarray]:
+    """
+    Resample a stream of mono blocks on the fly (soxr, high quality).
+    """
+    if not output_rate or output_rate == input_rate:
+        yield from blocks
+        return
+    resampler = soxr.ResampleStream(input_rate, output_rate, 1, dtype="float32", quality="HQ")
+    blocks = iter(blocks)
+    block = next(blocks, None)
+    while block is not None:
+        following = next(blocks, None)
+        resampled = resampler.resample_chunk(block, last=following is None)
+        if len(resampled):
+            yield resampled
+        block = following
+
+class FeatureAccumulator:
+    """
+    Fused feature engine: every feature of a run of analysis frames is derived from one
+    frame matrix and one STFT of it. With keep_rms, the RMS of every frame is kept too
+    (4 bytes per hop), for segmenting the recording on silence.
+    """
+
+    def __init__(self, sr: int, keep_rms: bool = False):
+        self.sr = sr
+        self.hop_seconds = HOP_LENGTH / sr
+        self._rms_blocks = [] if keep_rms else None
+        self.volume = RunningStats()
+        self.pitch = RunningStats()
+        self.zero_crossings = RunningStats()
+        self.frames = 0
+        self.silent_frames = 0
+        self.window = scipy.signal.get_window("hann", FRAME_LENGTH, fftbins=True).astype(np.float32)[:, np.newaxis]
+        # Spectrogram rows piptrack can report a pitch in: fmin <= frequency < min(fmax, sr / 2)
+        frequencies = np.fft.rfftfreq(FRAME_LENGTH, 1.0 / sr)
+        band = np.flatnonzero((PITCH_FMIN <= frequencies) & (frequencies < min(PITCH_FMAX, sr / 2)))
+        self.band = slice(band[0], band[-1] + 1) if band.size else None
+
+    def add(self, padded: np.ndarray, zcr_padded: np.ndarray):
+        """
+        Add the frames of a window of the padded signal. zcr_padded is the same window with
+        edge-value instead of zero padding, which is what zero_crossing_rate pads with.
+        """
+        frames = librosa.util.frame(padded, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+
+        # Volume and pauses
+        rms = np.sqrt(np.mean(np.square(frames), axis=0))
+        self.volume.update(rms)
+        self.silent_frames += int(np.count_nonzero(rms < SILENCE_THRESHOLD))
+        self.frames += rms.size
+        if self._rms_blocks is not None:
+            self._rms_blocks.append(rms.astype(np.float32, copy=False))
+
+        # Zero-crossing rate, as librosa.feature.zero_crossing_rate
+        zcr_frames = librosa.util.frame(zcr_padded, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+        negative = zcr_frames < -ZERO_CROSSING_THRESHOLD
+        self.zero_crossings.update(np.count_nonzero(negative[1:] != negative[:-1], axis=0) / FRAME_LENGTH)
+
+        # Pitch, as librosa.piptrack but only evaluated on the rows it can report
+        spectrogram = np.abs(np.fft.rfft(self.window * frames, axis=0))
+        self.pitch.update(self._pitches(spectrogram))
+
+    def _pitches(self, spectrogram: np.ndarray) -> np.ndarray:
+        """
+        Interpolated frequencies of the thresholded spectral peaks in the pitch band.
+        """
+        if self.band is None:
+            return np.empty(0, dtype=np.float32)
+        lo, hi = self.band.start, self.band.stop
+        # The band never includes the DC or Nyquist row, so every row has two neighbours
+        rows = spectrogram[lo - 1:hi + 1]
+        floor = PITCH_THRESHOLD * spectrogram.max(axis=0)
+        thresholded = rows * (rows > floor)
+        center = thresholded[1:-1]
+        peaks = (center > thresholded[:-2]) & (center >= thresholded[2:])
+
+        # Parabolic interpolation of the peak position, 0 if it moves more than one bin
+        a = rows[2:] + rows[:-2] - 2 * rows[1:-1]
+        b = (rows[2:] - rows[:-2]) / 2
+        shift = np.zeros_like(a)
+        np.divide(-b, a, out=shift, where=np.abs(b) < np.abs(a))
+
+        bins, columns = np.nonzero(peaks)
+        return ((bins + lo + shift[bins, columns]) * (float(self.sr) / FRAME_LENGTH)).astype(np.float32)
+
+    def frame_rms(self) -> np.ndarray:
+        """RMS of every analysis frame so far, frame i centered at i * hop_seconds."""
+        if not self._rms_blocks:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate(self._rms_blocks)
+
+    def features(self) -> Dict[str, float]:
+        return {
+            "mean_volume": float(self.volume.mean),
+            "volume_variation": float(self.volume.std),
+            "speech_rate": float(self.zero_crossings.mean),
+            "silence_ratio": float(self.silent_frames / self.frames) if self.frames else 0.0,
+            "pitch_mean": float(self.pitch.mean) if self.pitch.count else 0,
+            "pitch_variation": float(self.pitch.std) if self.pitch.count else 0,
+        }
+
+def extract_features_streaming(audio_file_path: str, block_frames: Optional[int] = None,
+                               sample_rate: Optional[int] = None) -> Dict[str, float]:
+    """
+    Compute the voice features of a recording file block by block, with bounded memory.
+    sample_rate is the analysis rate, AUDIO_ANALYSIS_SAMPLE_RATE by default; 0 is the file's own.
+    """
+    sample_rate = AUDIO_ANALYSIS_SAMPLE_RATE if sample_rate is None else sample_rate
+    with AudioStream(audio_file_path, sample_rate) as stream:
+        return analyze_stream(stream, block_frames).features()
+
+def analyze_stream(stream: AudioStream, block_frames: Optional[int] = None, keep_rms: bool = False,
+                   on_block: Optional[Callable[[np.ndarray], None]] = None) -> FeatureAccumulator:
+    """
+    Analyze a recording as ffmpeg decodes it, at the stream's sample rate. on_block is
+    called with every int16 block read, e.g. to keep the samples for transcription.
+    """
+    block_frames = block_frames or AUDIO_STREAM_BLOCK_FRAMES
+
+    def float_blocks() -> Iterator[np.ndarray]:
+        for block in stream.blocks(block_frames * HOP_LENGTH):
+            if on_block is not None:
+                on_block(block)
+            yield pcm_to_float(block)
+
+    return analyze_blocks(float_blocks(), stream.sample_rate, block_frames, keep_rms)
+
+def extract_features_from_samples(samples: np.ndarray, sample_rate: int, block_frames: Optional[int] = None,
+                                  analysis_rate: Optional[int] = None) -> Dict[str, float]:
+    """
+    Compute the voice features of decoded mono samples (int16 or float).
+    """
+    return analyze_samples(samples, sample_rate, block_frames, analysis_rate).features()
+
+def analyze_samples(samples: np.ndarray, sample_rate: int, block_frames: Optional[int] = None,
+                    analysis_rate: Optional[int] = None, keep_rms: bool = False) -> FeatureAccumulator:
+    """
+    Analyze decoded mono samples, converting and resampling them a block at a time so
+    no float copy of the whole signal is made.
+    """
+    block_frames = block_frames or AUDIO_STREAM_BLOCK_FRAMES
+    analysis_rate = AUDIO_ANALYSIS_SAMPLE_RATE if analysis_rate is None else analysis_rate
+    sr = analysis_rate or sample_rate
+    blocks = resample_blocks(pcm_blocks(samples, block_frames * HOP_LENGTH), sample_rate, sr)
+    return analyze_blocks(blocks, sr, block_frames, keep_rms)
+
+def analyze_blocks(blocks: Iterable[np.ndarray], sr: int, block_frames: int,
+                   keep_rms: bool = False) -> FeatureAccumulator:
+    """
+    Analyze a mono signal given as consecutive blocks of any size.
+
+    Frames are the same as librosa's centered analysis of the whole signal: it is
+    padded with half a frame on both sides and consecutive windows overlap by one
+    frame minus one hop, so the result matches the whole-signal computation.
+    """
+    accumulator = FeatureAccumulator(sr, keep_rms)
+    half = FRAME_LENGTH // 2
+    overlap = FRAME_LENGTH - HOP_LENGTH
+    window = (block_frames - 1) * HOP_LENGTH + FRAME_LENGTH
+
+    # Unprocessed part of the padded signal, starting at a frame boundary
+    buffer = np.zeros(half, dtype=np.float32)
+    first_sample = None
+    last_sample = 0.0
+    head_padded = True
+
+    def edge_padded(window: np.ndarray, head: bool, tail: bool) -> np.ndarray:
+        if not (head or tail):
+            return window
+        window = window.copy()
+        if head:
+            window[:half] = first_sample
+        if tail:
+            window[-half:] = last_sample
+        return window
+
+    for block in blocks:
+        if first_sample is None:
+            first_sample = block[0]
+        last_sample = block[-1]
+        buffer = np.concatenate([buffer, block])
+        while len(buffer) >= window:
+            accumulator.add(buffer[:window], edge_padded(buffer[:window], head_padded, False))
+            head_padded = False
+            buffer = buffer[window - overlap:]
+
+    if first_sample is None:
+        raise ValueError("No audio samples")
+
+    # Remaining frames, including the ones centered near the end of the signal
+    buffer = np.concatenate([buffer, np.zeros(half, dtype=np.float32)])
+    zcr_buffer = edge_padded(buffer, head_padded, True)
+    usable = FRAME_LENGTH + (len(buffer) - FRAME_LENGTH) // HOP_LENGTH * HOP_LENGTH
+    accumulator.add(buffer[:usable], zcr_buffer[:usable])
+
+    return accumulator
@@ -0,0 +1,212 @@
+import os
+import atexit
+import multiprocessing
+import threading
+import traceback
+from typing import Callable, List, Optional, TypeVar
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Worker processes for CPU-bound audio work; 0 runs it in the calling thread
+AUDIO_POOL_WORKERS = int(os.getenv("AUDIO_POOL_WORKERS", "2"))
+# Seconds one audio task may run, from when a worker starts it, before that worker is killed
+AUDIO_TASK_TIMEOUT = float(os.getenv("AUDIO_TASK_TIMEOUT", "600"))
+# Tasks per worker process before it is replaced, to release memory that
+# librosa/numpy caches and allocator fragmentation hold on to; 0 never recycles
+AUDIO_POOL_MAX_TASKS_PER_CHILD = int(os.getenv("AUDIO_POOL_MAX_TASKS_PER_CHILD", "20"))
+# Seconds a new worker process may take to start and import the DSP stack
+AUDIO_WORKER_START_TIMEOUT = 120
+
+T = TypeVar("T")
+
+class AudioTaskTimeout(Exception):
+    """Raised when an audio task runs longer than its timeout."""
+
+class AudioWorkerError(Exception):
+    """Raised when the worker process running a task dies or can't be started."""
+
+def _warm_up():
+    """
+    Run in every worker process before its first task: import the DSP stack once per
+    process instead of on the first task.
+    """
+    import numpy  # noqa: F401
+    import librosa  # noqa: F401
+    import soundfile  # noqa: F401
+    import app.utils.audio_features  # noqa: F401
+
+def _worker_main(conn, initializer: Optional[Callable[[], None]]):
+    """
+    Loop of a worker process: run (fn, args) tasks received on conn one at a time and
+    send back ("ok", result) or ("error", exception, traceback), until None arrives.
+    """
+    if initializer is not None:
+        initializer()
+    conn.send(("ready",))
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        fn, args = task
+        try:
+            reply = ("ok", fn(*args))
+        except BaseException as e:
+            reply = ("error", e, traceback.format_exc())
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # The result or exception can't be pickled
+            conn.send(("error", AudioWorkerError(f"Unpicklable task outcome: {e!r}"), traceback.format_exc()))
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, initializer: Optional[Callable[[], None]]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        if not self.conn.poll(AUDIO_WORKER_START_TIMEOUT):
+            self.kill()
+            raise AudioWorkerError(f"Audio worker didn't start within {AUDIO_WORKER_START_TIMEOUT}s")
+        try:
+            self.conn.recv()
+        except EOFError as e:
+            self.kill()
+            raise AudioWorkerError(f"Audio worker exited on startup with code {self.process.exitcode}") from e
+
+    def stop(self):
+        """Let the process exit after its current task."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+class AudioProcessPool:
+    """
+    Process pool for CPU-bound audio tasks, so DSP doesn't compete with the calling
+    process for the GIL.
+
+    Each worker process runs one task at a time, handed to it over its own pipe, so a
+    task is only sent once a worker is free: time spent waiting for a worker doesn't
+    count toward the timeout, which starts when the worker receives the task. A task
+    that times out can't be cancelled, so its worker alone is killed and replaced on
+    demand; tasks running on other workers are unaffected.
+
+    Processes are started with spawn, which is safe with threads and open database
+    connections in the parent. A worker is replaced after max_tasks_per_child tasks.
+    """
+
+    def __init__(self, workers: int, timeout: float, max_tasks_per_child: int,
+                 initializer: Optional[Callable[[], None]] = _warm_up):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.initializer = initializer
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(workers, 1))
+        self._idle: List[_Worker] = []
+        self._closed = False
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise AudioWorkerError("Audio pool is shut down")
+            if self._idle:
+                return self._idle.pop()
+        return _Worker(self._context, self.initializer)
+
+    def _checkin(self, worker: _Worker):
+        worker.tasks += 1
+        recycle = self.max_tasks_per_child and worker.tasks >= self.max_tasks_per_child
+        with self._lock:
+            if not recycle and not self._closed:
+                self._idle.append(worker)
+                return
+        worker.stop()
+
+    def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        """
+        Run fn(*args) in a worker process and return its result, waiting for a free
+        worker first. fn and its arguments must be picklable, i.e. fn is a module-level function.
+
+        Raises:
+            AudioTaskTimeout: The task ran longer than the timeout; its worker was killed
+            AudioWorkerError: The worker process died while running the task
+            Exception: Whatever fn raised
+        """
+        if self.workers <= 0:
+            return fn(*args)
+        timeout = self.timeout if timeout is None else timeout
+        name = getattr(fn, "__name__", fn)
+
+        with self._slots:
+            worker = self._checkout()
+            try:
+                worker.conn.send((fn, args))
+                if not worker.conn.poll(timeout):
+                    print(f"Audio task {name} timed out after {timeout}s, killing its worker process")
+                    worker.kill()
+                    raise AudioTaskTimeout(f"Audio task timed out after {timeout}s")
+                reply = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                worker.kill()
+                raise AudioWorkerError(
+                    f"Audio worker process died running {name} (exit code {worker.process.exitcode})"
+                ) from e
+            except BaseException:
+                if worker.process.is_alive():
+                    worker.kill()
+                raise
+
+        self._checkin(worker)
+        if reply[0] == "ok":
+            return reply[1]
+        _, error, remote_traceback = reply
+        print(f"Audio task {name} failed in its worker process:\n{remote_traceback}")
+        raise error
+
+    def shutdown(self):
+        """Stop the idle workers; busy ones stop when their task finishes."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+_pool: Optional[AudioProcessPool] = None
+_pool_lock = threading.Lock()
+
+def get_audio_pool() -> AudioProcessPool:
+    """
+    Return the process-wide audio pool, creating it on first use.
+    Worker processes are only started when the first task is submitted.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = AudioProcessPool(AUDIO_POOL_WORKERS, AUDIO_TASK_TIMEOUT, AUDIO_POOL_MAX_TASKS_PER_CHILD)
+                atexit.register(_pool.shutdown)
+    return _pool
+
+def shutdown_audio_pool():
+    """
+    Stop the worker processes of the audio pool; busy ones stop when their task finishes.
+    """
+    if _pool is not None:
+        _pool.shutdown()
@@ -0,0 +1,268 @@
+import os
+import hashlib
+import math
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, NamedTuple, Optional
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Load environment variables
+load_dotenv()
+
+AUDIO_DOWNLOAD_CONNECT_TIMEOUT = float(os.getenv("AUDIO_DOWNLOAD_CONNECT_TIMEOUT", "5"))
+# Seconds without receiving any data before a download attempt fails
+AUDIO_DOWNLOAD_READ_TIMEOUT = float(os.getenv("AUDIO_DOWNLOAD_READ_TIMEOUT", "30"))
+AUDIO_DOWNLOAD_MAX_BYTES = int(os.getenv("AUDIO_DOWNLOAD_MAX_BYTES", str(500 * 1024 * 1024)))
+# Files at least this large are fetched as parallel byte ranges when the server allows it
+AUDIO_DOWNLOAD_RANGE_THRESHOLD = int(os.getenv("AUDIO_DOWNLOAD_RANGE_THRESHOLD", str(16 * 1024 * 1024)))
+AUDIO_DOWNLOAD_RANGE_PARTS = int(os.getenv("AUDIO_DOWNLOAD_RANGE_PARTS", "4"))
+# Attempts per byte range, each resuming where the previous one stopped
+AUDIO_DOWNLOAD_MAX_ATTEMPTS = int(os.getenv("AUDIO_DOWNLOAD_MAX_ATTEMPTS", "3"))
+AUDIO_DOWNLOAD_RETRY_BACKOFF = float(os.getenv("AUDIO_DOWNLOAD_RETRY_BACKOFF", "0.5"))
+AUDIO_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+class DownloadError(Exception):
+    """Raised when a download fails for good."""
+
+class IncompleteDownload(Exception):
+    """A response ended before its byte range was complete; the range is resumed."""
+
+class DownloadedAudio(NamedTuple):
+    # None when the server answered 304 Not Modified
+    path: Optional[str]
+    content_hash: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int = 0
+
+class DownloadStats:
+    """
+    Thread-safe download counters of this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.downloads = 0
+        self.ranged_downloads = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.retries = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "downloads": self.downloads,
+                "ranged_downloads": self.ranged_downloads,
+                "not_modified": self.not_modified,
+                "failures": self.failures,
+                "retries": self.retries,
+                "bytes": self.bytes,
+                "seconds": round(self.seconds, 3),
+                "throughput_bytes_per_second": round(self.bytes / self.seconds, 1) if self.seconds else 0.0,
+            }
+
+class AudioDownloader:
+    """
+    Downloads recordings to temporary files over a shared, connection-pooled session.
+
+    Every request has connect and read timeouts and the size is capped. Large files
+    are fetched as parallel byte ranges when the server supports ranges and the file has
+    a validator (ETag or Last-Modified) to send with If-Range, so parts of different
+    versions are never mixed. With a validator, a broken transfer is resumed from
+    the last byte received instead of starting over. The temporary file is removed
+    on any failure.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = AUDIO_DOWNLOAD_CONNECT_TIMEOUT,
+        read_timeout: float = AUDIO_DOWNLOAD_READ_TIMEOUT,
+        max_bytes: int = AUDIO_DOWNLOAD_MAX_BYTES,
+        range_threshold: int = AUDIO_DOWNLOAD_RANGE_THRESHOLD,
+        range_parts: int = AUDIO_DOWNLOAD_RANGE_PARTS,
+        max_attempts: int = AUDIO_DOWNLOAD_MAX_ATTEMPTS,
+        retry_backoff: float = AUDIO_DOWNLOAD_RETRY_BACKOFF
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_bytes = max_bytes
+        self.range_threshold = range_threshold
+        self.range_parts = max(range_parts, 1)
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_backoff = retry_backoff
+        self.metrics = DownloadStats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(self.range_parts * 2, 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def download(self, url: str, headers: Optional[Dict[str, str]] = None, suffix: str = "") -> DownloadedAudio:
+        """
+        Download url to a new temporary file. With conditional headers, a 304 answer
+        returns a result without a path.
+
+        Raises:
+            DownloadError: The server refused the request, the file is too large, or a
+                range kept failing after all its attempts
+        """
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, headers=headers or {}, stream=True, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.metrics.add(failures=1)
+            raise DownloadError(f"Request failed: {e}") from e
+
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if response.status_code == 304:
+            response.close()
+            self.metrics.add(not_modified=1)
+            return DownloadedAudio(None, None, etag, last_modified)
+        if response.status_code != 200:
+            response.close()
+            self.metrics.add(failures=1)
+            raise DownloadError(f"HTTP {response.status_code}")
+
+        identity = response.headers.get("Content-Encoding", "identity") == "identity"
+        length = response.headers.get("Content-Length")
+        size = int(length) if length and length.isdigit() and identity else None
+        if size is not None and size > self.max_bytes:
+            response.close()
+            self.metrics.add(failures=1)
+            raise DownloadError(f"File is {size} bytes, over the {self.max_bytes} byte limit")
+
+        validator = etag if etag and not etag.startswith("W/") else last_modified
+        resumable = bool(identity and validator and response.headers.get("Accept-Ranges") == "bytes")
+        ranged = bool(resumable and size and size >= self.range_threshold and self.range_parts > 1)
+
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if size:
+                    f.truncate(size)
+            if ranged:
+                received = self._fetch_ranges(url, path, size, validator, response)
+            else:
+                received = self._fetch_range(url, path, 0, None if size is None else size - 1,
+                                             validator, resumable, response)
+            if size is not None and received != size:
+                raise DownloadError(f"Received {received} of {size} bytes")
+            if size is None:
+                # A restarted download may have been shorter than the first try
+                os.truncate(path, received)
+            content_hash = hash_file(path)
+        except BaseException as e:
+            remove_file(path)
+            self.metrics.add(failures=1)
+            if isinstance(e, Exception) and not isinstance(e, DownloadError):
+                raise DownloadError(str(e)) from e
+            raise
+
+        elapsed = time.monotonic() - started
+        self.metrics.add(downloads=1, ranged_downloads=int(ranged), bytes=received, seconds=elapsed)
+        print(f"Downloaded {received} bytes in {elapsed:.2f}s ({received / max(elapsed, 1e-6) / 1e6:.1f} MB/s)"
+              f"{f' in {self.range_parts} ranges' if ranged else ''}")
+        return DownloadedAudio(path, content_hash, etag, last_modified, received)
+
+    def _fetch_ranges(self, url: str, path: str, size: int, validator: str, response: requests.Response) -> int:
+        """
+        Fetch the file as parallel byte ranges; the first one is read from the response
+        that is already open.
+        """
+        part_size = math.ceil(size / self.range_parts)
+        bounds = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        with ThreadPoolExecutor(max_workers=len(bounds) - 1, thread_name_prefix="download-range") as executor:
+            futures = [
+                executor.submit(self._fetch_range, url, path, start, end, validator, True)
+                for start, end in bounds[1:]
+            ]
+            first_end = self._fetch_range(url, path, bounds[0][0], bounds[0][1], validator, True, response)
+            ends = [first_end] + [future.result() for future in futures]
+        return sum(end - start for end, (start, _) in zip(ends, bounds))
+
+    def _fetch_range(self, url: str, path: str, start: int, end: Optional[int], validator: Optional[str],
+                     resumable: bool, response: Optional[requests.Response] = None) -> int:
+        """
+        Write bytes start..end (inclusive, None for the end of the file) of url into path,
+        resuming with a Range request after a failure when resumable, starting over otherwise.
+
+        Returns:
+            The offset after the last byte written
+        """
+        offset = start
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if response is None:
+                    if resumable:
+                        headers = {"Range": f"bytes={offset}-{'' if end is None else end}", "If-Range": validator}
+                        expected = 206
+                    else:
+                        headers, expected, offset = {}, 200, start
+                    response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+                    if response.status_code != expected:
+                        # e.g. 200 to a range request: the file changed since the first response
+                        raise DownloadError(f"HTTP {response.status_code} to a {'range ' if resumable else ''}request")
+                with open(path, "r+b") as f:
+                    f.seek(offset)
+                    for chunk in response.iter_content(chunk_size=AUDIO_DOWNLOAD_CHUNK_BYTES):
+                        if end is not None:
+                            chunk = chunk[:end + 1 - offset]
+                        f.write(chunk)
+                        offset += len(chunk)
+                        if offset > self.max_bytes:
+                            raise DownloadError(f"File is over the {self.max_bytes} byte limit")
+                        if end is not None and offset > end:
+                            break
+                if end is not None and offset <= end:
+                    raise IncompleteDownload(f"Connection closed at byte {offset} of range {start}-{end}")
+                return offset
+            except (requests.RequestException, IncompleteDownload) as e:
+                if attempt == self.max_attempts:
+                    raise DownloadError(f"Range {start}-{end} failed after {attempt} attempts: {e}") from e
+                self.metrics.add(retries=1)
+                print(f"Download interrupted at byte {offset}, {'resuming' if resumable else 'restarting'}: {e}")
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            finally:
+                if response is not None:
+                    response.close()
+                    response = None
+
+def hash_file(path: str) -> str:
+    """
+    SHA-256 of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+_downloader: Optional[AudioDownloader] = None
+_downloader_lock = threading.Lock()
+
+def get_audio_downloader() -> AudioDownloader:
+    """
+    Return the process-wide downloader, creating it on first use.
+    """
+    global _downloader
+    if _downloader is None:
+        with _downloader_lock:
+            if _downloader is None:
+                _downloader = AudioDownloader()
+    return _downloader
@@ -0,0 +1,53 @@
+import base64
+import hashlib
+import json
+from datetime import date, time
+from typing import Mapping, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or belongs to another listing."""
+
+
+def cursor_scope(path: str, params: Mapping[str, str]) -> str:
+    """
+    Short fingerprint of a listing's endpoint, sort order and filters.
+
+    A cursor only marks a position in one ordering of one filtered result, so it carries
+    the scope of the listing it came from and is rejected anywhere else.
+    """
+    canonical = json.dumps([path, sorted(params.items())], separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(meeting_date: date, meeting_time: time, meeting_id: int, scope: str) -> str:
+    """
+    Encode the keyset position of a meeting in a listing as an opaque, URL-safe cursor.
+    """
+    payload = json.dumps(
+        [meeting_date.isoformat(), meeting_time.isoformat(), meeting_id, scope],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str) -> Tuple[date, time, int]:
+    """
+    Decode a cursor produced by encode_cursor back into its (date, time, id) key.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a listing
+            with a different sort order or filters
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_time, raw_id, cursor_scope_ = json.loads(base64.urlsafe_b64decode(padded))
+        key = date.fromisoformat(raw_date), time.fromisoformat(raw_time), int(raw_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+    if cursor_scope_ != scope:
+        raise InvalidCursorError(
+            "Cursor was issued for a different sort order or filters; "
+            "repeat the query parameters of the request that returned it"
+        )
+    return key
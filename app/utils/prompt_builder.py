@@ -0,0 +1,87 @@
+import os
+from typing import List
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Upper bound on the estimated size of one prompt, in tokens
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "24000"))
+# Average characters per token of the estimator, about 4 for English text
+PROMPT_CHARS_PER_TOKEN = float(os.getenv("PROMPT_CHARS_PER_TOKEN", "4"))
+
+OMITTED_MARKER = "[... earlier transcript omitted ...]"
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without calling the model.
+    Deliberately cheap: it only looks at the length, so it can run on every request.
+    """
+    if not text:
+        return 0
+    return int(len(text) / PROMPT_CHARS_PER_TOKEN) + 1
+
+def available_tokens(prompt_without_transcript: str, budget: int = None) -> int:
+    """
+    Tokens left for the transcript once the rest of the prompt is accounted for.
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    return max(budget - estimate_tokens(prompt_without_transcript), 0)
+
+class PromptBudgetError(Exception):
+    """Raised when the fixed part of a prompt leaves too little of the budget for the transcript."""
+
+def chars_within(max_tokens: int) -> int:
+    """
+    Most characters of a line that, with its line break, estimate at max_tokens or fewer.
+    """
+    return max(int((max_tokens - 1) * PROMPT_CHARS_PER_TOKEN) - 1, 0)
+
+def _split_long_line(line: str, max_tokens: int) -> List[str]:
+    width = max(chars_within(max_tokens), 1)
+    return [line[i:i + width] for i in range(0, len(line), width)]
+
+def tail_window(transcript: str, max_tokens: int) -> str:
+    """
+    Keep the most recent lines of a transcript that fit in max_tokens.
+    Earlier lines are replaced by a marker so the model knows the transcript is cut.
+    """
+    if not transcript or estimate_tokens(transcript) <= max_tokens:
+        return transcript
+
+    budget = max_tokens - estimate_tokens(OMITTED_MARKER + "\n")
+    kept: List[str] = []
+    for line in reversed(transcript.splitlines()):
+        cost = estimate_tokens(line + "\n")
+        if cost > budget:
+            if not kept:
+                # A single line over budget, keep as much of its end as fits
+                width = chars_within(budget)
+                kept.append(line[-width:] if width > 0 else "")
+            break
+        kept.append(line)
+        budget -= cost
+
+    return "\n".join([OMITTED_MARKER] + kept[::-1])
+
+def split_transcript(transcript: str, max_tokens: int) -> List[str]:
+    """
+    Split a transcript into consecutive chunks of at most max_tokens, on line boundaries.
+    Lines longer than a chunk are split on characters. Each line is counted with its
+    line break, so a chunk's own estimate never exceeds max_tokens.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in transcript.splitlines():
+        for piece in _split_long_line(line, max_tokens) if line else [line]:
+            cost = estimate_tokens(piece + "\n")
+            if current and current_tokens + cost > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,85 @@
+import os
+import re
+import json
+from typing import FrozenSet, Iterable, List
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Jaccard similarity of word shingles at or above which two questions count as duplicates
+QUESTION_DEDUP_THRESHOLD = float(os.getenv("QUESTION_DEDUP_THRESHOLD", "0.6"))
+# Prior questions listed in the suggestion prompt, most recent first
+PROMPT_PRIOR_QUESTIONS = int(os.getenv("PROMPT_PRIOR_QUESTIONS", "15"))
+PROMPT_PRIOR_QUESTION_CHARS = 160
+
+# Words that carry no topic, dropped before comparing questions
+STOPWORDS = frozenset(
+    "a an the and or of to in on for with about your you do does did can could would "
+    "how what why when which is are was were be it this that please explain describe tell me".split()
+)
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping, enough to match "works"/"work" and "designing"/"design"
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+def normalize_question(text: str) -> List[str]:
+    """
+    Lowercase a question and reduce it to its stemmed content words.
+    """
+    text = re.sub(r"['’]s\b", "", text.lower())
+    words = re.findall(r"[a-z0-9+#]+", text)
+    content = [_stem(word) for word in words if word not in STOPWORDS]
+    return content or words
+
+def shingles(text: str, size: int = 2) -> FrozenSet[str]:
+    """
+    Word n-grams of a normalized question, plus its single words so short questions compare too.
+    """
+    words = normalize_question(text)
+    grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return frozenset(grams.union(words))
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class QuestionDeduplicator:
+    """
+    Remembers questions and tells whether a new one is a near-duplicate of any of them.
+    """
+
+    def __init__(self, existing: Iterable[str] = (), threshold: float = QUESTION_DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self._seen: List[FrozenSet[str]] = [shingles(question) for question in existing]
+
+    def add(self, question: str) -> bool:
+        """Remember the question and return True, or return False if it is a near-duplicate."""
+        candidate = shingles(question)
+        if any(jaccard(candidate, seen) >= self.threshold for seen in self._seen):
+            return False
+        self._seen.append(candidate)
+        return True
+
+def filter_near_duplicates(questions: List[str], existing: Iterable[str] = (),
+                           threshold: float = QUESTION_DEDUP_THRESHOLD) -> List[str]:
+    """
+    Drop questions that repeat an existing question, or an earlier one in the list.
+    """
+    deduplicator = QuestionDeduplicator(existing, threshold)
+    return [question for question in questions if deduplicator.add(question)]
+
+def prior_questions_digest(questions: List[str], max_questions: int = PROMPT_PRIOR_QUESTIONS) -> str:
+    """
+    Compact list of the most recent prior questions for the suggestion prompt.
+    Older questions are left to the local duplicate filter.
+    """
+    if not questions:
+        return ""
+    recent = questions[-max_questions:] if max_questions > 0 else []
+    return json.dumps([question[:PROMPT_PRIOR_QUESTION_CHARS] for question in recent])
@@ -1,24 +1,91 @@
 import os
-import google.generativeai as genai
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 from dotenv import load_dotenv
-import re
+
+from app.services.llm_client import get_llm_client, structured_output_schema
+from app.utils.prompt_builder import (
+    PROMPT_TOKEN_BUDGET, PromptBudgetError, available_tokens, estimate_tokens, split_transcript
+)
+from app.utils.response_parser import SectionTokenizer, parse_structured_sections
+from app.utils.scores import COUNT_FIELDS, SCORE_FIELDS, parse_score
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Setup Environment
-GENAI_API_KEY = os.getenv("GOOGLE_API_KEY")
+# Transcript chunks evaluated in parallel when a transcript is over the prompt budget
+REPORT_MAP_CONCURRENCY = int(os.getenv("REPORT_MAP_CONCURRENCY", "4"))
+# Smallest transcript chunk worth a model call; a prompt leaving less room than this is an error
+REPORT_MIN_CHUNK_TOKENS = int(os.getenv("REPORT_MIN_CHUNK_TOKENS", "1000"))
+
+# Report field and the section heading it is parsed from
+REPORT_SECTIONS = {
+    "confidence": "CONFIDENCE:",
+    "clarity": "CLARITY:",
+    "ques_count": "QUESTION COUNT:",
+    "correct_ans_count": "CORRECT ANSWERS:",
+    "wrong_ans_count": "INCORRECT ANSWERS:",
+    "tech_knowledge": "TECHNICAL KNOWLEDGE:",
+    "overall_fit": "OVERALL FIT:",
+    "what_went_well": "WHAT WENT WELL:",
+    "area_to_improve": "AREAS TO IMPROVE:",
+    "ai_feedback": "AI FEEDBACK:"
+}
+
+REPORT_FORMAT = """CONFIDENCE: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+
+CLARITY: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+
+QUESTION COUNT: Count the total number of questions asked in the interview.
 
-if not GENAI_API_KEY:
-    raise EnvironmentError("Set GOOGLE_API_KEY in .env file or as environment variable.")
+CORRECT ANSWERS: Count how many questions the candidate answered correctly.
 
-# Configure Gemini AI
-genai.configure(api_key=GENAI_API_KEY)
+INCORRECT ANSWERS: Count how many questions the candidate answered incorrectly.
 
-def generate_interview_report(transcript: str, role: str, job_desc: str, experience: str, skills: str):
+TECHNICAL KNOWLEDGE: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+
+OVERALL FIT: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+
+WHAT WENT WELL: Mention 3-5 strengths demonstrated by the candidate seperated by line breaks.
+
+AREAS TO IMPROVE: Mention 3-5 areas where the candidate could improve seperated by line breaks.
+
+AI FEEDBACK: Provide a 5 sentence overall assessment of the candidate's performance and fit for the role."""
+
+# Report fields that are lists, one item per line
+REPORT_LIST_FIELDS = ["what_went_well", "area_to_improve"]
+
+def build_report_schema() -> Dict:
     """
-    Generate a comprehensive interview report using Gemini AI.
-    Returns a dictionary with all analyzed fields.
+    Response schema of a report for structured output, with the instructions of
+    REPORT_FORMAT as field descriptions.
+    """
+    instructions = dict(line.split(": ", 1) for line in REPORT_FORMAT.split("\n\n"))
+    properties = {}
+    for key, section_header in REPORT_SECTIONS.items():
+        if key in SCORE_FIELDS or key in COUNT_FIELDS:
+            field = {"type": "INTEGER"}
+        elif key in REPORT_LIST_FIELDS:
+            field = {"type": "ARRAY", "items": {"type": "STRING"}}
+        else:
+            field = {"type": "STRING"}
+        field["description"] = instructions[section_header.rstrip(":")]
+        properties[key] = field
+    return {"type": "OBJECT", "properties": properties, "required": list(REPORT_SECTIONS)}
+
+REPORT_SCHEMA = build_report_schema()
+REPORT_TOKENIZER = SectionTokenizer(REPORT_SECTIONS)
+
+def build_report_prompt(transcript: str, role: str, job_desc: str, experience: str, skills: str,
+                        part: Optional[Tuple[int, int]] = None) -> str:
+    """
+    Build the evaluation prompt for a transcript, or for part (index, total) of one.
     """
     
     # Construct job description from inputs
@@ -29,12 +96,19 @@ def generate_interview_report(transcript: str, role: str, job_desc: str, experie
     {job_desc}
     """
     
-    prompt = f"""You are an expert at evaluating technical interviews. Analyze this interview transcript and provide a detailed evaluation.
-
+    transcript_heading = "INTERVIEW TRANSCRIPT:"
+    scope = ""
+    if part:
+        transcript_heading = f"INTERVIEW TRANSCRIPT (PART {part[0]} OF {part[1]}):"
+        scope = ("\nThis is only one part of the interview. Evaluate what happens in this part, "
+                 "and count only the questions asked in it.\n")
+    
+    return f"""You are an expert at evaluating technical interviews. Analyze this interview transcript and provide a detailed evaluation.
+{scope}
 JOB DESCRIPTION:
 {jd}
 
-INTERVIEW TRANSCRIPT:
+{transcript_heading}
 {transcript}
 
 CANDIDATE EXPERIENCE:
@@ -45,85 +119,132 @@ CANDIDATE SKILLS:
 
 Based on the transcript, provide an evaluation in the following format:
 
-CONFIDENCE: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+{REPORT_FORMAT}
 
-CLARITY: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+Make sure your evaluation is balanced, fair, and based solely on the evidence in the transcript, jd, candidates experience and skills.
+The candidate can be good in some areas but bad in others. Remember not to be too harsh.
+Format each section clearly with the heading followed by your analysis. Do not use markdown formatting like asterisks or bold text.
+"""
 
-QUESTION COUNT: Count the total number of questions asked in the interview.
+def build_merge_prompt(partials: List[Dict[str, str]], role: str, job_desc: str, experience: str, skills: str) -> str:
+    """
+    Build the prompt that combines partial evaluations of consecutive transcript chunks.
+    """
+    evaluations = "\n\n".join(
+        f"PART {index} OF {len(partials)}:\n"
+        + "\n".join(f"{REPORT_SECTIONS[key]} {value}" for key, value in partial.items())
+        for index, partial in enumerate(partials, start=1)
+    )
+    
+    return f"""You are an expert at evaluating technical interviews. The transcript of a long interview was evaluated in consecutive parts.
+Combine the partial evaluations below into one evaluation of the whole interview.
 
-CORRECT ANSWERS: Count how many questions the candidate answered correctly.
+JOB DESCRIPTION:
+    {role}
 
-INCORRECT ANSWERS: Count how many questions the candidate answered incorrectly.
+    Job Description:
+    {job_desc}
 
-TECHNICAL KNOWLEDGE: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+CANDIDATE EXPERIENCE:
+{experience}
 
-OVERALL FIT: INTEGER BETWEEN 0 AND 10 where 0 is the lowest and 10 is the highest
+CANDIDATE SKILLS:
+{skills}
 
-WHAT WENT WELL: Mention 3-5 strengths demonstrated by the candidate seperated by line breaks.
+PARTIAL EVALUATIONS:
+{evaluations}
 
-AREAS TO IMPROVE: Mention 3-5 areas where the candidate could improve seperated by line breaks.
+Provide the combined evaluation in the following format:
 
-AI FEEDBACK: Provide a 5 sentence overall assessment of the candidate's performance and fit for the role.
+{REPORT_FORMAT}
 
-Make sure your evaluation is balanced, fair, and based solely on the evidence in the transcript, jd, candidates experience and skills.
-The candidate can be good in some areas but bad in others. Remember not to be too harsh.
+Merge repeated strengths and areas to improve, and keep the most important ones.
 Format each section clearly with the heading followed by your analysis. Do not use markdown formatting like asterisks or bold text.
 """
 
-    try:
-        # Create Gemini model client
-        client = genai.GenerativeModel("gemini-1.5-flash")
+def parse_report_sections(response_text: str) -> Dict[str, str]:
+    """
+    Split a model response into report fields, from a structured-output JSON object
+    or by section heading.
+    """
+    if response_text.lstrip()[:1] in ("{", "`"):
+        report_data = parse_structured_sections(response_text, REPORT_SECTIONS)
+        if report_data is not None:
+            return report_data
+    return REPORT_TOKENIZER.parse(response_text)
 
-        # Generate the response
-        response = client.generate_content(prompt)
-        response_text = response.text
-        
-        # Parse the response to extract different sections
-        report_data = {}
-        
-        # Extract sections using string operations
-        sections = {
-            "confidence": "CONFIDENCE:",
-            "clarity": "CLARITY:",
-            "ques_count": "QUESTION COUNT:",
-            "correct_ans_count": "CORRECT ANSWERS:",
-            "wrong_ans_count": "INCORRECT ANSWERS:",
-            "tech_knowledge": "TECHNICAL KNOWLEDGE:",
-            "overall_fit": "OVERALL FIT:",
-            "what_went_well": "WHAT WENT WELL:",
-            "area_to_improve": "AREAS TO IMPROVE:",
-            "ai_feedback": "AI FEEDBACK:"
-        }
+def merge_numeric_fields(partials: List[Dict[str, str]], weights: List[int]) -> Dict[str, str]:
+    """
+    Combine the numeric fields of partial evaluations: scores are averaged,
+    weighted by the size of each chunk, and counts are summed.
+    Fields no partial evaluation provides a number for are left out.
+    """
+    merged = {}
+    for key in SCORE_FIELDS:
+        scored = [(parse_score(key, partial.get(key)), weight) for partial, weight in zip(partials, weights)]
+        scored = [(score, weight) for score, weight in scored if score is not None]
+        if scored:
+            total_weight = sum(weight for _, weight in scored) or 1
+            merged[key] = str(round(sum(score * weight for score, weight in scored) / total_weight))
+    for key in COUNT_FIELDS:
+        counts = [count for count in (parse_score(key, partial.get(key)) for partial in partials) if count is not None]
+        if counts:
+            merged[key] = str(sum(counts))
+    return merged
+
+def generate_map_reduce_report(transcript: str, role: str, job_desc: str, experience: str, skills: str) -> Dict[str, str]:
+    """
+    Evaluate an over-budget transcript in chunks, concurrently, then merge the partial
+    evaluations: the written sections by one more model call, the numbers locally.
+    """
+    client = get_llm_client()
+    response_schema = structured_output_schema(REPORT_SCHEMA)
+    
+    # Size chunks by the space the largest part header leaves in the prompt
+    chunk_tokens = available_tokens(build_report_prompt("", role, job_desc, experience, skills, part=(999, 999)))
+    if chunk_tokens < REPORT_MIN_CHUNK_TOKENS:
+        raise PromptBudgetError(
+            f"The report prompt without a transcript leaves {chunk_tokens} of {PROMPT_TOKEN_BUDGET} tokens "
+            f"for the transcript, under REPORT_MIN_CHUNK_TOKENS ({REPORT_MIN_CHUNK_TOKENS}); "
+            "shorten the job description or raise PROMPT_TOKEN_BUDGET"
+        )
+    chunks = split_transcript(transcript, chunk_tokens)
+    prompts = [
+        build_report_prompt(chunk, role, job_desc, experience, skills, part=(index, len(chunks)))
+        for index, chunk in enumerate(chunks, start=1)
+    ]
+    logger.info(f"Transcript over the prompt budget, evaluating it in {len(chunks)} parts")
+    
+    with ThreadPoolExecutor(max_workers=max(min(REPORT_MAP_CONCURRENCY, len(prompts)), 1)) as executor:
+        responses = executor.map(lambda prompt: client.generate_content(prompt, response_schema=response_schema), prompts)
+        partials = [parse_report_sections(text) for text in responses]
+    
+    report_data = parse_report_sections(
+        client.generate_content(build_merge_prompt(partials, role, job_desc, experience, skills),
+                                response_schema=response_schema)
+    )
+    report_data.update(merge_numeric_fields(partials, [estimate_tokens(chunk) for chunk in chunks]))
+    return report_data
+
+def generate_interview_report(transcript: str, role: str, job_desc: str, experience: str, skills: str):
+    """
+    Generate a comprehensive interview report using Gemini AI.
+    Returns a dictionary with all analyzed fields.
+    Transcripts over PROMPT_TOKEN_BUDGET are evaluated in chunks and merged.
+    """
+    prompt = build_report_prompt(transcript, role, job_desc, experience, skills)
+
+    try:
+        if estimate_tokens(prompt) > PROMPT_TOKEN_BUDGET:
+            return generate_map_reduce_report(transcript, role, job_desc, experience, skills)
         
-        for key, section_header in sections.items():
-            try:
-                start_index = response_text.find(section_header)
-                if start_index == -1:
-                    report_data[key] = "Not provided"
-                    continue
-                
-                start_index += len(section_header)
-                
-                # Find the next section header to determine where this section ends
-                end_index = len(response_text)
-                for _, next_header in sections.items():
-                    next_header_index = response_text.find(next_header, start_index)
-                    if next_header_index != -1 and next_header_index < end_index:
-                        end_index = next_header_index
-                
-                # Extract and clean the section content
-                section_content = response_text[start_index:end_index].strip()
-                
-                # Remove markdown formatting (** for bold, etc.)
-                section_content = re.sub(r'\*\*', '', section_content)
-                # Remove extra newlines
-                section_content = re.sub(r'\n{3,}', '\n\n', section_content)
-                
-                report_data[key] = section_content
-            except Exception as e:
-                report_data[key] = f"Error extracting {key}: {str(e)}"
+        # Generate the response with the shared client
+        response_text = get_llm_client().generate_content(
+            prompt, response_schema=structured_output_schema(REPORT_SCHEMA)
+        )
         
-        return report_data
+        # Parse the response to extract different sections
+        return parse_report_sections(response_text)
     except Exception as e:
         print(f"Error generating report: {e}")
-        raise Exception(f"Failed to generate report: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Failed to generate report: {str(e)}")
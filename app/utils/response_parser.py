@@ -0,0 +1,181 @@
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+# Markdown code fences around JSON, with or without the language tag
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?")
+# Items of a numbered list, the fallback when a model ignores the JSON instruction
+NUMBERED_ITEM_PATTERN = re.compile(r"\d+\.\s+(.*?)(?=\d+\.\s+|$)", re.DOTALL)
+EXTRA_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+
+# Response schema for structured output that is a list of questions
+QUESTION_LIST_SCHEMA = {"type": "ARRAY", "items": {"type": "STRING"}}
+
+NOT_PROVIDED = "Not provided"
+
+def strip_code_fences(text: str) -> str:
+    return CODE_FENCE_PATTERN.sub("", text).strip()
+
+def parse_json_array(response_text: str) -> Any:
+    """
+    Parse a response that should be a JSON array.
+
+    Text that starts like JSON is parsed directly. Otherwise code fences are removed and it is parsed
+    again, then numbered list items are taken, and as a last resort the whole text is
+    returned as a single item.
+    """
+    if response_text[:1] in ("[", "{", '"'):
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            pass
+
+    response_text = strip_code_fences(response_text)
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        print("Response was not valid JSON, attempting to parse numbered format...")
+
+    matches = NUMBERED_ITEM_PATTERN.findall(response_text)
+    if matches:
+        return [match.strip() for match in matches]
+    return [response_text]
+
+def parse_question_list(response_text: str) -> List[str]:
+    """
+    Parse a response that should be a JSON array of question strings. A single value
+    is treated as a one-item list, and items that aren't strings are dropped.
+    """
+    questions = parse_json_array(response_text)
+    if not isinstance(questions, list):
+        questions = [questions]
+    return [question for question in questions if isinstance(question, str)]
+
+def parse_json_object(response_text: str) -> Any:
+    """
+    Parse a response that should be a JSON object, ignoring code fences and any
+    text before the first "{" or after the last "}".
+
+    Raises:
+        ValueError: There is no parsable JSON object in the response
+    """
+    if response_text[:1] == "{":
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            pass
+
+    start, end = response_text.find("{"), response_text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("No JSON object in the response")
+    return json.loads(response_text[start:end + 1])
+
+class SectionTokenizer:
+    """
+    Splits a response into sections by their headings in one pass.
+
+    All headings are matched by one compiled pattern, longest first, so a heading that
+    contains another one (INCORRECT ANSWERS: / CORRECT ANSWERS:) is never split. A section
+    runs from its heading to the next heading of any section; when a heading repeats,
+    its first occurrence counts.
+    """
+
+    def __init__(self, sections: Dict[str, str]):
+        self.sections = sections
+        self._keys = {heading: key for key, heading in sections.items()}
+        headings = sorted(self._keys, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(heading) for heading in headings))
+
+    def parse(self, response_text: str) -> Dict[str, str]:
+        """
+        Return the cleaned content of every section, "Not provided" for missing ones.
+        """
+        found: Dict[str, str] = {}
+        matches = list(self._pattern.finditer(response_text))
+        for index, match in enumerate(matches):
+            key = self._keys[match.group()]
+            if key in found:
+                continue
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(response_text)
+            found[key] = clean_section(response_text[match.end():end])
+        return {key: found.get(key, NOT_PROVIDED) for key in self.sections}
+
+def clean_section(content: str) -> str:
+    """
+    Strip a section and remove markdown bold markers and runs of blank lines.
+    """
+    content = content.strip().replace("**", "")
+    if "\n\n\n" in content:
+        content = EXTRA_NEWLINES_PATTERN.sub("\n\n", content)
+    return content
+
+def parse_structured_sections(response_text: str, keys: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Read sections from a structured-output JSON object, as the same strings the section
+    tokenizer returns: lists become one item per line, missing fields "Not provided".
+    Returns None if the response isn't a JSON object.
+    """
+    try:
+        data = parse_json_object(response_text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    sections = {}
+    for key in keys:
+        value = data.get(key)
+        if value is None or value == "":
+            sections[key] = NOT_PROVIDED
+        elif isinstance(value, list):
+            sections[key] = "\n".join(str(item).strip() for item in value)
+        else:
+            sections[key] = str(value).strip()
+    return sections
+
+class JSONArrayStreamParser:
+    """
+    Incrementally extracts the string items of a JSON array from streamed model output,
+    so each item is available as soon as its closing quote arrives.
+    """
+
+    def __init__(self):
+        self.items: List[str] = []
+        self._chunks: List[str] = []
+        self._current: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume a chunk and return the items completed by it."""
+        self._chunks.append(chunk)
+        completed = []
+        for char in chunk:
+            if self._in_string:
+                self._current.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        literal = "".join(self._current)
+                        try:
+                            completed.append(json.loads(literal))
+                        except json.JSONDecodeError:
+                            completed.append(literal[1:-1])
+            elif char == '"':
+                self._in_string = True
+                self._current = [char]
+            elif char == "[":
+                self._depth += 1
+            elif char == "]":
+                self._depth -= 1
+        self.items.extend(completed)
+        return completed
@@ -0,0 +1,32 @@
+import re
+from typing import Dict, Optional
+
+# Report fields scored from 0 to 10, and fields holding a count of questions
+SCORE_FIELDS = ["confidence", "clarity", "tech_knowledge", "overall_fit"]
+COUNT_FIELDS = ["ques_count", "correct_ans_count", "wrong_ans_count"]
+NUMERIC_FIELDS = SCORE_FIELDS + COUNT_FIELDS
+
+_NUMBER = re.compile(r"\d+")
+
+def leading_int(text: Optional[str]) -> Optional[int]:
+    """
+    First integer in a text such as "7 - The candidate...", or None if there is none.
+    """
+    match = _NUMBER.search(text or "")
+    return int(match.group()) if match else None
+
+def parse_score(field: str, text: Optional[str]) -> Optional[int]:
+    """
+    Parse the numeric value of a report field from its text.
+    Scores outside 0-10 are treated as unparseable.
+    """
+    value = leading_int(text)
+    if value is not None and field in SCORE_FIELDS and value > 10:
+        return None
+    return value
+
+def parse_numeric_fields(report: Dict[str, Optional[str]]) -> Dict[str, Optional[int]]:
+    """
+    Map the text of each numeric report field to its *_value column.
+    """
+    return {f"{field}_value": parse_score(field, report.get(field)) for field in NUMERIC_FIELDS}
@@ -0,0 +1,192 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from app.utils.audio_features import SILENCE_THRESHOLD
+
+# Load environment variables
+load_dotenv()
+
+# "google" uses the free Google Web Speech API, "stub" answers locally without network access
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "google").lower()
+# Segments transcribed at the same time, per recording
+TRANSCRIPTION_CONCURRENCY = int(os.getenv("TRANSCRIPTION_CONCURRENCY", "4"))
+# Attempts per segment, including the first one
+TRANSCRIPTION_MAX_ATTEMPTS = int(os.getenv("TRANSCRIPTION_MAX_ATTEMPTS", "3"))
+# Retry delay in seconds, doubled after every failed attempt
+TRANSCRIPTION_RETRY_BACKOFF = float(os.getenv("TRANSCRIPTION_RETRY_BACKOFF", "1"))
+# Pauses at least this long can end a segment
+TRANSCRIPTION_MIN_SILENCE_SECONDS = float(os.getenv("TRANSCRIPTION_MIN_SILENCE_SECONDS", "0.5"))
+# Longer pauses always end a segment, so long silences aren't sent to the recognizer
+TRANSCRIPTION_MAX_PAUSE_SECONDS = float(os.getenv("TRANSCRIPTION_MAX_PAUSE_SECONDS", "2"))
+# Upper bound on the length of one segment, i.e. of one recognition request
+TRANSCRIPTION_MAX_SEGMENT_SECONDS = float(os.getenv("TRANSCRIPTION_MAX_SEGMENT_SECONDS", "30"))
+# Silence kept around each segment so words aren't clipped
+TRANSCRIPTION_SEGMENT_PADDING_SECONDS = 0.2
+
+UNTRANSCRIBED_MARKER = "[untranscribed]"
+
+class TranscriptionError(Exception):
+    """Raised by a backend when a segment can't be transcribed; the segment is retried."""
+
+class TranscribedSegment(NamedTuple):
+    start: float
+    end: float
+    # None if every attempt failed, empty if the segment has no recognizable speech
+    text: Optional[str]
+
+class GoogleBackend:
+    """
+    Google Web Speech API backend of speech_recognition.
+    """
+
+    def __init__(self):
+        import speech_recognition as sr
+
+        self._sr = sr
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        audio_data = self._sr.AudioData(samples.tobytes(), sample_rate, 2)
+        try:
+            return self._sr.Recognizer().recognize_google(audio_data)
+        except self._sr.UnknownValueError:
+            # Nothing recognizable in the segment
+            return ""
+        except self._sr.RequestError as e:
+            raise TranscriptionError(str(e)) from e
+
+class StubBackend:
+    """
+    Deterministic local backend for tests: describes each segment instead of recognizing it.
+    """
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        level = float(np.sqrt(np.mean(np.square(samples / 32768.0)))) if len(samples) else 0.0
+        return f"Speech of {len(samples) / sample_rate:.1f} seconds at level {level:.3f}."
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_transcription_backend():
+    """
+    Return the process-wide transcription backend, creating it on first use.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if TRANSCRIPTION_BACKEND == "stub":
+                    _backend = StubBackend()
+                elif TRANSCRIPTION_BACKEND == "google":
+                    _backend = GoogleBackend()
+                else:
+                    raise TranscriptionError(f"Unknown TRANSCRIPTION_BACKEND: {TRANSCRIPTION_BACKEND}")
+    return _backend
+
+def segment_on_silence(
+    frame_rms: np.ndarray,
+    hop_seconds: float,
+    threshold: float = SILENCE_THRESHOLD,
+    min_silence: float = TRANSCRIPTION_MIN_SILENCE_SECONDS,
+    max_segment: float = TRANSCRIPTION_MAX_SEGMENT_SECONDS,
+    padding: float = TRANSCRIPTION_SEGMENT_PADDING_SECONDS,
+    max_pause: float = TRANSCRIPTION_MAX_PAUSE_SECONDS
+) -> List[Tuple[float, float]]:
+    """
+    Split a recording into speech segments, from the RMS of its analysis frames.
+
+    Runs of voiced frames separated by pauses of at least min_silence are packed into
+    segments of up to max_segment seconds, so a segment only ends in a pause. A pause
+    longer than max_pause always ends a segment, so segments hold no pause longer than
+    that. A single run longer than max_segment is cut at its quietest frames. Leading
+    and trailing silence is left out.
+
+    Returns:
+        (start, end) of each segment in seconds, in order
+    """
+    voiced = np.flatnonzero(frame_rms >= threshold)
+    if not voiced.size:
+        return []
+
+    min_gap = max(int(round(min_silence / hop_seconds)), 1)
+    max_frames = max(int(max_segment / hop_seconds), 1)
+    pad = min(int(round(padding / hop_seconds)), min_gap // 2)
+    max_pause_frames = max(int(round(max_pause / hop_seconds)), min_gap)
+
+    # Voiced runs as [start, end) frame ranges, padded on both sides
+    breaks = np.flatnonzero(np.diff(voiced) > min_gap)
+    starts = np.maximum(np.concatenate([[voiced[0]], voiced[breaks + 1]]) - pad, 0)
+    ends = np.minimum(np.concatenate([voiced[breaks], [voiced[-1]]]) + 1 + pad, len(frame_rms))
+
+    segments: List[List[int]] = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        # Cut runs that don't fit in one segment where they are quietest
+        while end - start > max_frames:
+            # Latest of the quietest frames in the second half of the allowed length
+            window = frame_rms[start + max_frames // 2:start + max_frames][::-1]
+            cut = max(start + max_frames - 1 - int(np.argmin(window)), start + 1)
+            segments.append([start, cut])
+            start = cut
+        # The pause before this run, without the padding of the runs around it
+        pause = start - segments[-1][1] + 2 * pad if segments else 0
+        if segments and end - segments[-1][0] <= max_frames and pause <= max_pause_frames:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+
+    return [(start * hop_seconds, end * hop_seconds) for start, end in segments]
+
+def transcribe_segments(
+    samples: np.ndarray,
+    sample_rate: int,
+    segments: List[Tuple[float, float]],
+    backend=None,
+    concurrency: int = TRANSCRIPTION_CONCURRENCY
+) -> List[TranscribedSegment]:
+    """
+    Transcribe segments of mono 16-bit samples in parallel, retrying failed ones with backoff.
+    A segment that fails every attempt is returned without text instead of failing the rest.
+    """
+    if not segments:
+        return []
+    backend = backend or get_transcription_backend()
+
+    def transcribe_one(segment: Tuple[float, float]) -> TranscribedSegment:
+        start, end = segment
+        chunk = samples[int(start * sample_rate):int(end * sample_rate)]
+        for attempt in range(1, TRANSCRIPTION_MAX_ATTEMPTS + 1):
+            try:
+                return TranscribedSegment(start, end, backend.transcribe(chunk, sample_rate))
+            except Exception as e:
+                if attempt == TRANSCRIPTION_MAX_ATTEMPTS:
+                    print(f"Error transcribing segment {start:.1f}-{end:.1f}s after {attempt} attempts: {e}")
+                    return TranscribedSegment(start, end, None)
+                time.sleep(TRANSCRIPTION_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+    with ThreadPoolExecutor(max_workers=max(min(concurrency, len(segments)), 1),
+                            thread_name_prefix="transcription") as executor:
+        # map keeps the segments in order
+        return list(executor.map(transcribe_one, segments))
+
+def format_timestamp(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+def format_transcript(segments: List[TranscribedSegment]) -> Optional[str]:
+    """
+    Reassemble transcribed segments into one line per segment, prefixed with its start time.
+    Returns None if no segment could be transcribed.
+    """
+    if not any(segment.text for segment in segments):
+        return None
+    return "\n".join(
+        f"[{format_timestamp(segment.start)}] {segment.text if segment.text is not None else UNTRANSCRIBED_MARKER}"
+        for segment in segments
+        if segment.text != ""
+    )
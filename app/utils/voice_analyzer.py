@@ -1,32 +1,37 @@
 import os
-import librosa
-import numpy as np
-import soundfile as sf
-import speech_recognition as sr
-import google.generativeai as genai
-from pydub import AudioSegment
-from dotenv import load_dotenv
-import json
 import tempfile
-import requests
+from dotenv import load_dotenv
 from urllib.parse import urlparse
-import re
 
-# Load environment variables
-load_dotenv()
+import numpy as np
 
-# Setup Environment
-GENAI_API_KEY = os.getenv("GOOGLE_API_KEY")
+from app.services.llm_client import get_llm_client, structured_output_schema
+from app.utils.audio_cache import conditional_headers, get_audio_cache
+from app.utils.audio_decode import AudioStream, DecodedAudio
+from app.utils.audio_features import AUDIO_ANALYSIS_SAMPLE_RATE, FeatureAccumulator, analyze_stream
+from app.utils.audio_pool import get_audio_pool
+from app.utils.downloader import get_audio_downloader, remove_file
+from app.utils.response_parser import parse_json_object
+from app.utils.transcription import format_transcript, segment_on_silence, transcribe_segments
 
-if not GENAI_API_KEY:
-    raise EnvironmentError("Set GOOGLE_API_KEY in .env file or as environment variable.")
+# Load environment variables
+load_dotenv()
 
-# Configure Gemini AI
-genai.configure(api_key=GENAI_API_KEY)
+# Response schema of the voice analysis, for structured output
+VOICE_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "clarity": {"type": "OBJECT", "properties": {"score": {"type": "INTEGER"}}, "required": ["score"]},
+        "confidence": {"type": "OBJECT", "properties": {"score": {"type": "INTEGER"}}, "required": ["score"]},
+        "speech_patterns": {"type": "STRING"},
+    },
+    "required": ["clarity", "confidence", "speech_patterns"],
+}
 
-def download_audio(audio_url):
+def download_audio(audio_url, headers=None):
     """
-    Download audio from URL to a temporary file
+    Download audio from URL to a temporary file, hashing its content on the way.
+    Pass conditional headers to get a result without a path if it hasn't changed.
     """
     try:
         # Get the file extension from the URL
@@ -35,130 +40,129 @@ def download_audio(audio_url):
         extension = os.path.splitext(path)[1]
         if not extension:
             extension = '.mp3'  # Default extension
-            
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(suffix=extension, delete=False)
         
-        # Download the file
-        response = requests.get(audio_url, stream=True)
-        if response.status_code == 200:
-            with open(temp_file.name, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            return temp_file.name
-        else:
-            print(f"Failed to download audio: HTTP {response.status_code}")
-            return None
+        return get_audio_downloader().download(audio_url, headers, suffix=extension)
     except Exception as e:
         print(f"Error downloading audio: {e}")
         return None
 
-def convert_audio_to_wav(audio_file_path):
-    """
-    Convert any audio format to WAV format for speech recognition compatibility
-    """
-    try:
-        # Get file extension
-        file_name, file_extension = os.path.splitext(audio_file_path)
-        output_path = f"{file_name}_converted.wav"
-        
-        # Convert if not already wav
-        if file_extension.lower() != '.wav':
-            audio = AudioSegment.from_file(audio_file_path)
-            audio.export(output_path, format="wav")
-            print(f"Converted {audio_file_path} to {output_path}")
-            return output_path
-        else:
-            return audio_file_path
-    except Exception as e:
-        print(f"Error converting audio file: {e}")
-        return None
-
-def transcribe_audio(audio_file_path):
+def transcribe_audio(audio: DecodedAudio, analysis: FeatureAccumulator):
     """
-    Transcribe the audio file to text
+    Transcribe decoded audio to text, one timestamped line per speech segment.
+    
+    The recording is split on the pauses found by the feature analysis, and the
+    segments are transcribed in parallel, so a long interview isn't one huge request
+    and a failed segment doesn't lose the rest of the transcript.
     """
     try:
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(audio_file_path) as source:
-            audio_data = recognizer.record(source)
-            text = recognizer.recognize_google(audio_data)
-            return text
+        segments = segment_on_silence(analysis.frame_rms(), analysis.hop_seconds)
+        return format_transcript(transcribe_segments(audio.samples, audio.sample_rate, segments))
     except Exception as e:
         print(f"Error transcribing audio: {e}")
         return None
 
-def extract_audio_features(audio_file_path):
+def analyze_audio(stream: AudioStream, spool):
     """
     Extract audio features that might indicate clarity and confidence:
     - Speech rate
     - Pauses
     - Volume variations
     - Pitch variations
+    
+    The decoded samples are analyzed as they come out of ffmpeg, in blocks of
+    AUDIO_STREAM_BLOCK_FRAMES analysis frames, and written to the spool file for the
+    transcription, so memory doesn't grow with the length of the recording.
+    The frame RMS is kept for segmenting the transcription.
     """
     try:
-        # Load audio file
-        y, sr = librosa.load(audio_file_path, sr=None)
-        
-        # Calculate features
-        
-        # 1. Speech energy/volume
-        rms = librosa.feature.rms(y=y)[0]
-        mean_volume = np.mean(rms)
-        std_volume = np.std(rms)
-        
-        # 2. Speech rate estimation (based on zero crossings)
-        zero_crossings = librosa.feature.zero_crossing_rate(y)[0]
-        mean_zero_crossings = np.mean(zero_crossings)
-        
-        # 3. Pauses detection
-        # Detect segments with low energy (potential pauses)
-        silence_threshold = 0.01
-        is_silence = rms < silence_threshold
-        silence_segments = np.sum(is_silence)
-        silence_ratio = silence_segments / len(rms)
-        
-        # 4. Pitch variations
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-        pitch_mean = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
-        pitch_std = np.std(pitches[pitches > 0]) if np.any(pitches > 0) else 0
-        
-        return {
-            "mean_volume": float(mean_volume),
-            "volume_variation": float(std_volume),
-            "speech_rate": float(mean_zero_crossings),
-            "silence_ratio": float(silence_ratio),
-            "pitch_mean": float(pitch_mean) if not np.isnan(pitch_mean) else 0,
-            "pitch_variation": float(pitch_std) if not np.isnan(pitch_std) else 0
-        }
+        return analyze_stream(stream, keep_rms=True, on_block=lambda block: spool.write(block.tobytes()))
     except Exception as e:
         print(f"Error extracting audio features: {e}")
         return None
 
-def analyze_voice(audio_url):
+def process_audio(audio_file_path):
     """
-    Analyze voice recording for clarity and confidence from a URL
+    CPU-bound part of the voice analysis: decode the recording once, extracting its audio
+    features on the way, then transcribe it from the same samples spooled to disk.
+    Runs in the audio process pool.
+    
+    Returns:
+        (audio_features, transcript), either may be None if its step failed
     """
-    print(f"\n🔊 Analyzing voice recording from URL: {audio_url}...")
+    with tempfile.TemporaryFile() as spool:
+        try:
+            with AudioStream(audio_file_path, AUDIO_ANALYSIS_SAMPLE_RATE) as stream:
+                analysis = analyze_audio(stream, spool)
+                sample_rate = stream.sample_rate
+        except Exception as e:
+            print(f"Error decoding audio file: {e}")
+            return None, None
+        if not analysis:
+            return None, None
+        
+        # Segments are read from the page cache as they are transcribed
+        spool.flush()
+        audio = DecodedAudio(np.memmap(spool, dtype="<i2", mode="r"), sample_rate)
+        return analysis.features(), transcribe_audio(audio, analysis)
+
+def load_audio_analysis(audio_url):
+    """
+    Audio features and transcript of the recording at a URL, from the audio cache when
+    the recording hasn't changed since it was last analyzed.
     
-    # Download the audio file
-    audio_file_path = download_audio(audio_url)
-    if not audio_file_path:
-        return None
+    The URL is fetched with the ETag/Last-Modified seen last time, so an unchanged
+    recording isn't downloaded again; a changed URL whose content was analyzed before
+    (e.g. a re-upload) is downloaded but not analyzed again.
     
-    # Convert audio to WAV if needed
-    wav_file_path = convert_audio_to_wav(audio_file_path)
-    if not wav_file_path:
-        return None
+    Returns:
+        (audio_features, transcript), either may be None if its step failed
+    """
+    cache = get_audio_cache()
+    url_entry = cache.get_url(audio_url) if cache else None
     
-    # Extract audio features
-    audio_features = extract_audio_features(wav_file_path)
-    if not audio_features:
-        return None
+    download = download_audio(audio_url, conditional_headers(url_entry))
+    if download and download.path is None:
+        content_hash = url_entry.get("content_hash") if url_entry else None
+        cached = cache.get_analysis(content_hash) if cache and content_hash else None
+        if cached:
+            print("Recording not modified, using cached audio analysis")
+            return cached["features"], cached["transcript"]
+        # Not modified, but there is no analysis of it to reuse (evicted, or the cache
+        # is disabled): download it again without the validators
+        download = download_audio(audio_url)
+    if not download or download.path is None:
+        return None, None
+    
+    try:
+        if cache:
+            if download.etag or download.last_modified:
+                cache.set_url(audio_url, download.content_hash, download.etag, download.last_modified)
+            cached = cache.get_analysis(download.content_hash)
+            if cached:
+                print("Recording analyzed before, using cached audio analysis")
+                return cached["features"], cached["transcript"]
+        
+        # Decode, extract features and transcribe in the audio process pool
+        try:
+            audio_features, transcript = get_audio_pool().run(process_audio, download.path)
+        except Exception as e:
+            print(f"Error processing audio: {e}")
+            return None, None
+        
+        if cache and audio_features and transcript:
+            cache.set_analysis(download.content_hash, audio_features, transcript)
+        return audio_features, transcript
+    finally:
+        remove_file(download.path)
+
+def analyze_voice(audio_url):
+    """
+    Analyze voice recording for clarity and confidence from a URL
+    """
+    print(f"\n🔊 Analyzing voice recording from URL: {audio_url}...")
     
-    # Transcribe audio
-    transcript = transcribe_audio(wav_file_path)
-    if not transcript:
+    audio_features, transcript = load_audio_analysis(audio_url)
+    if not audio_features or not transcript:
         return None
     
     # Analyze with Gemini
@@ -193,31 +197,13 @@ THE RESPONSE MUST BE VALID JSON WITH NO MARKDOWN FORMATTING OR TEXT OUTSIDE THE
 """
     
     try:
-        client = genai.GenerativeModel("gemini-1.5-flash")
-        response = client.generate_content(prompt)
-        response_text = response.text
-        
-        # Remove any markdown code block formatting if present
-        if '```json' in response_text:
-            response_text = response_text.replace('```json', '').replace('```', '').strip()
+        response_text = get_llm_client().generate_content(
+            prompt, response_schema=structured_output_schema(VOICE_ANALYSIS_SCHEMA)
+        )
         
-        # Clean the response to ensure it's valid JSON
-        response_text = response_text.strip()
-        # Remove any extra text before or after the JSON object
-        response_text = re.sub(r'^[^{]*', '', response_text)
-        response_text = re.sub(r'[^}]*$', '', response_text)
+        # Parse the JSON object, ignoring code blocks and any text around it
+        result_json = parse_json_object(response_text)
         
-        # Parse the response as JSON
-        result_json = json.loads(response_text)
-        
-        # Clean up any temporary files
-        try:
-            os.remove(audio_file_path)
-            if wav_file_path != audio_file_path:
-                os.remove(wav_file_path)
-        except:
-            pass
-            
         return {
             "clarity": str(result_json["clarity"]["score"]),
             "confidence": str(result_json["confidence"]["score"]),
@@ -227,12 +213,4 @@ THE RESPONSE MUST BE VALID JSON WITH NO MARKDOWN FORMATTING OR TEXT OUTSIDE THE
         print(f"❌ Error analyzing voice or parsing response: {e}")
         print(f"Raw response: {response_text if 'response_text' in locals() else 'No response'}")
         
-        # Clean up any temporary files
-        try:
-            os.remove(audio_file_path)
-            if wav_file_path != audio_file_path:
-                os.remove(wav_file_path)
-        except:
-            pass
-            
         return None 
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Report job worker.
+
+Claims queued report jobs from the report_jobs table and runs them, several at a
+time per process. It also generates again the expected questions of meetings left
+Pending by an API process that stopped. Start as many worker processes as needed,
+on any node that can reach the database:
+
+    python -m app.worker --concurrency 4
+"""
+import os
+import argparse
+import asyncio
+import logging
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+from app.database.database import SessionLocal
+from app.services.metrics_store import MetricsPublisher
+from app.services.question_generator import retry_stale_expected_questions
+from app.services.report_pipeline import process_report_generation
+from app.services.report_queue import (
+    REPORT_JOB_HEARTBEAT_INTERVAL, ClaimedJob, claim_report_jobs, complete_report_job, extend_report_job_locks,
+    fail_report_job
+)
+from app.utils.audio_pool import shutdown_audio_pool
+
+# === Setup logging ===
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === Load environment variables ===
+load_dotenv()
+
+REPORT_WORKER_CONCURRENCY = int(os.getenv("REPORT_WORKER_CONCURRENCY", "2"))
+REPORT_WORKER_POLL_INTERVAL = float(os.getenv("REPORT_WORKER_POLL_INTERVAL", "2"))
+# Seconds between two sweeps for meetings whose expected questions were lost
+QUESTION_SWEEP_INTERVAL = float(os.getenv("QUESTION_SWEEP_INTERVAL", "60"))
+
+def run_job(job: ClaimedJob, worker_id: str) -> None:
+    """
+    Run one claimed job and record its outcome.
+    """
+    logger.info(f"Running report job {job.id} for meeting ID {job.meeting_id} (attempt {job.attempts}/{job.max_attempts})")
+    try:
+        stage_timings = process_report_generation(job.meeting_id, job.audio)
+    except Exception as e:
+        logger.exception(f"Report job {job.id} failed")
+        with SessionLocal() as db:
+            fail_report_job(db, job, worker_id, str(e))
+    else:
+        with SessionLocal() as db:
+            complete_report_job(db, job, worker_id, stage_timings)
+        logger.info(f"Report job {job.id} succeeded")
+
+def extend_locks(job_ids, worker_id: str) -> None:
+    """
+    Keep the running jobs claimed; a failure is logged and retried on the next heartbeat.
+    """
+    if not job_ids:
+        return
+    try:
+        with SessionLocal() as db:
+            held = extend_report_job_locks(db, job_ids, worker_id)
+        if held < len(job_ids):
+            logger.warning(f"{len(job_ids) - held} running report jobs were taken over by another worker")
+    except Exception:
+        logger.exception("Failed to extend report job locks")
+
+def run_question_sweeps(stop: threading.Event, interval: float) -> None:
+    """
+    Retry lost expected-question generation every `interval` seconds until stop is set.
+    Runs in its own thread, on one event loop for its whole life.
+    """
+    async def sweep():
+        while not stop.is_set():
+            try:
+                await retry_stale_expected_questions()
+            except Exception:
+                logger.exception("Failed to retry stale expected questions")
+            await asyncio.to_thread(stop.wait, interval)
+    
+    asyncio.run(sweep())
+
+def run_worker(concurrency: int, poll_interval: float) -> None:
+    """
+    Poll for jobs until SIGINT/SIGTERM, keeping up to `concurrency` jobs in flight.
+    In-flight jobs are finished before exiting.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        logger.info("Stopping report worker after in-flight jobs finish...")
+        stop.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    logger.info(f"Report worker {worker_id} started with concurrency {concurrency}")
+    # Counters of this process, published for GET /metrics/*
+    metrics = MetricsPublisher(SessionLocal, role="report-worker")
+    sweeper = threading.Thread(
+        target=run_question_sweeps, args=(stop, QUESTION_SWEEP_INTERVAL), name="question-sweep", daemon=True
+    )
+    sweeper.start()
+    # Ids of the running jobs by their future, and when their locks were last extended
+    in_flight = {}
+    last_heartbeat = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="report-job") as executor:
+        while not stop.is_set():
+            metrics.maybe_publish()
+            in_flight = {future: job_id for future, job_id in in_flight.items() if not future.done()}
+            if time.monotonic() - last_heartbeat >= REPORT_JOB_HEARTBEAT_INTERVAL:
+                last_heartbeat = time.monotonic()
+                extend_locks(list(in_flight.values()), worker_id)
+            free_slots = concurrency - len(in_flight)
+            
+            jobs = []
+            if free_slots > 0:
+                try:
+                    with SessionLocal() as db:
+                        jobs = claim_report_jobs(db, worker_id, free_slots)
+                except Exception:
+                    logger.exception("Failed to claim report jobs")
+            
+            for job in jobs:
+                in_flight[executor.submit(run_job, job, worker_id)] = job.id
+            
+            if not jobs:
+                # Sleep until the poll interval passes or a slot frees up
+                if in_flight:
+                    wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                else:
+                    stop.wait(poll_interval)
+        
+        # Keep the in-flight jobs claimed until they finish
+        while in_flight:
+            wait(in_flight, timeout=REPORT_JOB_HEARTBEAT_INTERVAL)
+            in_flight = {future: job_id for future, job_id in in_flight.items() if not future.done()}
+            extend_locks(list(in_flight.values()), worker_id)
+    
+    sweeper.join()
+    metrics.close()
+    shutdown_audio_pool()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the report job worker.")
+    parser.add_argument("--concurrency", type=int, default=REPORT_WORKER_CONCURRENCY,
+                        help="Jobs processed in parallel by this process")
+    parser.add_argument("--poll-interval", type=float, default=REPORT_WORKER_POLL_INTERVAL,
+                        help="Seconds between polls when the queue is empty")
+    args = parser.parse_args()
+    run_worker(args.concurrency, args.poll_interval)
+
+if __name__ == "__main__":
+    main()
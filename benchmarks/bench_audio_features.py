@@ -0,0 +1,102 @@
+"""
+Benchmark the fused, streamed audio feature engine (decoding with ffmpeg) against the
+original whole-file librosa implementation of extract_audio_features, on synthetic
+speech-like audio.
+
+    python -m benchmarks.bench_audio_features --seconds 300 --sample-rate 48000
+
+Prints the time and peak traced memory of each variant and the relative difference
+of every feature from the reference.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from app.utils.audio_features import extract_features_streaming
+
+
+def reference_features(audio_file_path):
+    """The original extract_audio_features: whole file, one librosa pass per feature."""
+    y, sr = librosa.load(audio_file_path, sr=None)
+    rms = librosa.feature.rms(y=y)[0]
+    zero_crossings = librosa.feature.zero_crossing_rate(y)[0]
+    pitches, _ = librosa.piptrack(y=y, sr=sr)
+    voiced = pitches[pitches > 0]
+    return {
+        "mean_volume": float(np.mean(rms)),
+        "volume_variation": float(np.std(rms)),
+        "speech_rate": float(np.mean(zero_crossings)),
+        "silence_ratio": float(np.sum(rms < 0.01) / len(rms)),
+        "pitch_mean": float(np.mean(voiced)) if voiced.size else 0,
+        "pitch_variation": float(np.std(voiced)) if voiced.size else 0,
+    }
+
+def synthetic_speech(path, seconds, sample_rate, seed=0):
+    """
+    Write a stereo recording of a gliding harmonic "voice" in syllable bursts with pauses,
+    over a noise floor, one second at a time.
+    """
+    rng = np.random.default_rng(seed)
+    with sf.SoundFile(path, "w", sample_rate, 2, subtype="PCM_16") as audio:
+        for second in range(seconds):
+            t = second + np.arange(sample_rate) / sample_rate
+            f0 = 140 + 40 * np.sin(2 * np.pi * 0.3 * t) + 20 * np.sin(2 * np.pi * 2.1 * t)
+            phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+            voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+            syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.25 * t) > -0.3)
+            signal = 0.2 * voice * syllables + 0.003 * rng.standard_normal(sample_rate)
+            audio.write(np.stack([signal, 0.8 * signal], axis=1))
+
+def measure(function, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=120, help="Length of the synthetic recording")
+    parser.add_argument("--sample-rate", type=int, default=48000, help="Sample rate of the synthetic recording")
+    parser.add_argument("--analysis-rate", type=int, default=16000, help="Reduced analysis rate to compare too")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "speech.wav")
+        synthetic_speech(path, args.seconds, args.sample_rate)
+
+        # Warm up librosa's caches and numba compilation so they don't count against the first variant
+        warmup = os.path.join(directory, "warmup.wav")
+        synthetic_speech(warmup, 1, args.sample_rate)
+        reference_features(warmup)
+        extract_features_streaming(warmup)
+
+        reference, reference_time, reference_peak = measure(reference_features, path)
+        print(f"{args.seconds}s at {args.sample_rate} Hz")
+        print(f"{'variant':<28}{'seconds':>10}{'speedup':>10}{'peak MB':>10}  max relative difference")
+        print(f"{'reference (whole file)':<28}{reference_time:>10.2f}{1:>10.1f}{reference_peak / 1e6:>10.1f}")
+
+        variants = [("fused, native rate", 0), (f"fused, {args.analysis_rate} Hz", args.analysis_rate)]
+        for name, rate in variants:
+            features, elapsed, peak = measure(extract_features_streaming, path, sample_rate=rate)
+            differences = {
+                key: abs(features[key] - value) / max(abs(value), 1e-12) for key, value in reference.items()
+            }
+            worst = max(differences, key=differences.get)
+            print(
+                f"{name:<28}{elapsed:>10.2f}{reference_time / elapsed:>10.1f}{peak / 1e6:>10.1f}"
+                f"  {differences[worst]:.2e} ({worst})"
+            )
+            for key, value in features.items():
+                print(f"    {key:<18}{value:>14.6f}  reference {reference[key]:.6f}")
+
+if __name__ == "__main__":
+    main()
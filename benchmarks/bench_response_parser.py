@@ -0,0 +1,112 @@
+"""
+Benchmark the shared response parser against the per-module parsers it replaced, on a
+corpus of representative model responses: reports (plain, with markdown and a preamble,
+with missing sections, structured-output JSON), question lists (JSON, fenced JSON,
+numbered) and voice analyses (JSON, JSON wrapped in prose).
+
+    python -m benchmarks.bench_response_parser --number 2000
+
+Prints the time per parse of each variant and whether both return the same result.
+The original parsers can't read structured-output JSON reports, so those have no
+comparison.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import timeit
+
+from app.utils.report_generator import REPORT_SECTIONS, parse_report_sections
+from app.utils.response_parser import parse_json_array, parse_json_object
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "response_corpus.json")
+
+def reference_report_sections(response_text):
+    """The original parse_report_sections: a find per heading, then a find per heading for its end."""
+    report_data = {}
+    for key, section_header in REPORT_SECTIONS.items():
+        start_index = response_text.find(section_header)
+        if start_index == -1:
+            report_data[key] = "Not provided"
+            continue
+        start_index += len(section_header)
+        end_index = len(response_text)
+        for next_header in REPORT_SECTIONS.values():
+            next_header_index = response_text.find(next_header, start_index)
+            if next_header_index != -1 and next_header_index < end_index:
+                end_index = next_header_index
+        section_content = response_text[start_index:end_index].strip()
+        section_content = re.sub(r'\*\*', '', section_content)
+        section_content = re.sub(r'\n{3,}', '\n\n', section_content)
+        report_data[key] = section_content
+    return report_data
+
+def reference_questions(response_text):
+    """The original parse_suggested_questions, returning the list instead of its JSON."""
+    response_text = response_text.strip()
+    response_text = re.sub(r'```json', '', response_text)
+    response_text = re.sub(r'```', '', response_text)
+    response_text = response_text.strip()
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        matches = re.findall(r'\d+\.\s+(.*?)(?=\d+\.\s+|$)', response_text, re.DOTALL)
+        if matches:
+            return [q.strip() for q in matches]
+        return [response_text]
+
+def reference_voice(response_text):
+    """The original cleanup of analyze_voice before json.loads."""
+    if '```json' in response_text:
+        response_text = response_text.replace('```json', '').replace('```', '').strip()
+    response_text = response_text.strip()
+    response_text = re.sub(r'^[^{]*', '', response_text)
+    response_text = re.sub(r'[^}]*$', '', response_text)
+    return json.loads(response_text)
+
+PARSERS = {
+    "report": (reference_report_sections, parse_report_sections),
+    "questions": (reference_questions, lambda text: parse_json_array(text.strip())),
+    "voice": (reference_voice, parse_json_object),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="JSON list of {kind, name, text} responses")
+    parser.add_argument("--number", type=int, default=2000, help="Parses per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="Timings per variant, the best one counts")
+    args = parser.parse_args()
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    print(f"{'response':<40}{'original us':>13}{'shared us':>11}{'speedup':>9}  result")
+    total_reference = total_shared = 0.0
+    # The fallback parsers print a notice on every call
+    with contextlib.redirect_stdout(io.StringIO()) as ignored:
+        rows = []
+        for entry in corpus:
+            reference, shared = PARSERS[entry["kind"]]
+            text = entry["text"]
+            structured = entry["kind"] == "report" and text.lstrip().startswith("{")
+            shared_time = min(timeit.repeat(lambda: shared(text), number=args.number, repeat=args.repeat))
+            reference_time = min(timeit.repeat(lambda: reference(text), number=args.number, repeat=args.repeat))
+            result = "structured" if structured else ("same" if shared(text) == reference(text) else "DIFFERENT")
+            rows.append((entry["name"], reference_time, shared_time, result))
+            ignored.seek(0)
+            ignored.truncate()
+
+    for name, reference_time, shared_time, result in rows:
+        total_reference += reference_time
+        total_shared += shared_time
+        print(
+            f"{name:<40}{reference_time / args.number * 1e6:>13.1f}{shared_time / args.number * 1e6:>11.1f}"
+            f"{reference_time / shared_time:>9.1f}  {result}"
+        )
+    print(f"{'total':<40}{total_reference / args.number * 1e6:>13.1f}{total_shared / args.number * 1e6:>11.1f}"
+          f"{total_reference / total_shared:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+# Settings are read when modules are imported, so they are set before any app import
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_STRUCTURED_OUTPUT"] = "false"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+os.environ.setdefault("TRANSCRIPTION_BACKEND", "stub")
+os.environ.setdefault("AUDIO_POOL_WORKERS", "0")
+os.environ.setdefault("AUDIO_CACHE_ENABLED", "false")
+
+import pytest
+
+from app.services import llm_client
+from app.services.llm_cache import LLMCache, LRUCache
+
+
+class CountingBackend(llm_client.FakeBackend):
+    """Fake backend that counts the requests that reach it."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def generate(self, *args, **kwargs):
+        self.calls += 1
+        return super().generate(*args, **kwargs)
+
+    async def generate_async(self, *args, **kwargs):
+        self.calls += 1
+        return await super().generate_async(*args, **kwargs)
+
+    async def stream_async(self, *args, **kwargs):
+        self.calls += 1
+        async for chunk in super().stream_async(*args, **kwargs):
+            yield chunk
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    A fresh process-wide LLM client on the fake backend, with an empty in-memory cache.
+    """
+    client = llm_client.LLMClient(
+        CountingBackend(), "fake-model", timeout=5, max_concurrency=4,
+        cache=LLMCache(LRUCache(max_entries=100, max_bytes=1024 * 1024, ttl=60))
+    )
+    monkeypatch.setattr(llm_client, "_client", client)
+    return client
+
+@pytest.fixture
+def api():
+    """
+    Test client of the API on a throwaway SQLite database.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
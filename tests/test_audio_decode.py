@@ -0,0 +1,87 @@
+import sys
+import textwrap
+import wave
+
+import numpy as np
+import pytest
+
+from app.utils import audio_decode, voice_analyzer
+from app.utils.audio_decode import AudioDecodeError, AudioStream
+from app.utils.audio_features import analyze_samples, extract_features_streaming
+
+# Stands in for ffmpeg: reads a mono 16-bit WAV file and pipes it the way ffmpeg does,
+# with unknown chunk sizes and a metadata chunk before the samples
+FAKE_FFMPEG = """
+import struct, sys, time, wave
+args = sys.argv[1:]
+path = args[args.index("-i") + 1]
+if path.endswith(".slow"):
+    time.sleep(30)
+try:
+    with wave.open(path) as audio:
+        rate, pcm = audio.getframerate(), audio.readframes(audio.getnframes())
+except OSError as e:
+    sys.exit(f"{path}: {e}")
+fmt = struct.pack("<HHIIHH", 1, 1, rate, rate * 2, 2, 16)
+out = sys.stdout.buffer
+out.write(b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE")
+out.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+out.write(b"LIST" + struct.pack("<I", 5) + b"INFOx" + b"\\0")
+out.write(b"data" + struct.pack("<I", 0xFFFFFFFF) + pcm)
+"""
+
+@pytest.fixture(autouse=True)
+def fake_ffmpeg(tmp_path, monkeypatch):
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\n" + textwrap.dedent(FAKE_FFMPEG))
+    script.chmod(0o755)
+    monkeypatch.setattr(audio_decode, "FFMPEG_BINARY", str(script))
+
+def write_wav(path, samples, rate=16000):
+    with wave.open(str(path), "wb") as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(rate)
+        audio.writeframes(samples.astype("<i2").tobytes())
+    return str(path)
+
+def speech(seconds, rate=16000):
+    t = np.arange(int(seconds * rate)) / rate
+    bursts = np.sin(2 * np.pi * 0.5 * t) > 0
+    return (8000 * np.sin(2 * np.pi * 220 * t) * bursts).astype(np.int16)
+
+def test_stream_reads_samples_in_blocks(tmp_path):
+    samples = speech(1.3)
+    path = write_wav(tmp_path / "a.wav", samples)
+    with AudioStream(path) as stream:
+        assert stream.sample_rate == 16000
+        blocks = list(stream.blocks(4096))
+    assert all(len(block) == 4096 for block in blocks[:-1])
+    assert np.array_equal(np.concatenate(blocks), samples)
+
+def test_streamed_features_match_decoded_samples(tmp_path):
+    samples = speech(3)
+    path = write_wav(tmp_path / "a.wav", samples)
+    streamed = extract_features_streaming(path, block_frames=8, sample_rate=0)
+    assert streamed == pytest.approx(analyze_samples(samples, 16000, block_frames=8).features())
+
+def test_stream_reports_ffmpeg_failure(tmp_path):
+    with pytest.raises(AudioDecodeError, match="ffmpeg failed to decode"):
+        AudioStream(str(tmp_path / "missing.wav"))
+
+def test_stream_without_samples(tmp_path):
+    path = write_wav(tmp_path / "empty.wav", np.zeros(0, dtype=np.int16))
+    with AudioStream(path) as stream, pytest.raises(AudioDecodeError, match="No audio samples"):
+        list(stream.blocks(1024))
+
+def test_stream_times_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_decode, "AUDIO_DECODE_TIMEOUT", 0.5)
+    with pytest.raises(AudioDecodeError, match="timed out"):
+        AudioStream(str(tmp_path / "a.slow"))
+
+def test_process_audio_transcribes_spooled_samples(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_analyzer, "AUDIO_ANALYSIS_SAMPLE_RATE", 0)
+    path = write_wav(tmp_path / "a.wav", speech(6))
+    features, transcript = voice_analyzer.process_audio(path)
+    assert features["silence_ratio"] > 0.3
+    assert transcript.startswith("[00:00] Speech of ")
@@ -0,0 +1,69 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.audio_pool import AudioProcessPool, AudioTaskTimeout, AudioWorkerError
+
+# Module-level so spawned worker processes can unpickle them
+
+def sleep_then_pid(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+def fail(message):
+    raise ValueError(message)
+
+def crash():
+    os._exit(3)
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(workers=1, timeout=5, max_tasks_per_child=0):
+        pool = AudioProcessPool(workers, timeout, max_tasks_per_child, initializer=None)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+def test_time_waiting_for_a_worker_does_not_count(make_pool):
+    pool = make_pool(workers=1, timeout=1.5)
+    pool.run(sleep_then_pid, 0)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Each task needs 0.6s; the last one waits about 1.2s for the worker first
+        results = list(executor.map(lambda _: pool.run(sleep_then_pid, 0.6), range(3)))
+    assert len(set(results)) == 1
+
+def test_timeout_kills_only_the_stuck_worker(make_pool):
+    pool = make_pool(workers=2, timeout=10)
+    pool.run(sleep_then_pid, 0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stuck = executor.submit(pool.run, sleep_then_pid, 30, timeout=0.5)
+        healthy = executor.submit(pool.run, sleep_then_pid, 1.5)
+        with pytest.raises(AudioTaskTimeout):
+            stuck.result()
+        assert isinstance(healthy.result(), int)
+    # A replacement worker takes the next task
+    assert isinstance(pool.run(sleep_then_pid, 0), int)
+
+def test_workers_are_recycled(make_pool):
+    pool = make_pool(workers=1, max_tasks_per_child=2)
+    pids = [pool.run(sleep_then_pid, 0) for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+
+def test_task_exception_is_raised_in_caller(make_pool):
+    pool = make_pool()
+    with pytest.raises(ValueError, match="bad input"):
+        pool.run(fail, "bad input")
+    assert isinstance(pool.run(sleep_then_pid, 0), int)
+
+def test_crashed_worker_fails_only_its_task(make_pool):
+    pool = make_pool()
+    with pytest.raises(AudioWorkerError):
+        pool.run(crash)
+    assert isinstance(pool.run(sleep_then_pid, 0), int)
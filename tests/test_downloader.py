@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.utils.downloader import AudioDownloader, remove_file
+
+CONTENT = os.urandom(300_000)
+ETAG = '"recording-v1"'
+
+class RecordingServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the recording host: serves CONTENT with an ETag and byte ranges.
+    The first drop_after_bytes response cuts the connection after that many body bytes.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RecordingHandler)
+        self.requests = []
+        self.drop_after_bytes = None
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/interview.wav"
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(dict(self.headers))
+            drop_after, server.drop_after_bytes = server.drop_after_bytes, None
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+
+        start, end = 0, len(CONTENT) - 1
+        ranged = self.headers.get("Range") and self.headers.get("If-Range") == ETAG
+        if ranged:
+            first, last = self.headers["Range"].removeprefix("bytes=").split("-")
+            start, end = int(first), int(last) if last else end
+        body = CONTENT[start:end + 1]
+
+        self.send_response(206 if ranged else 200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        if ranged:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(CONTENT)}")
+        self.end_headers()
+        if drop_after is not None:
+            self.wfile.write(body[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+@pytest.fixture
+def server():
+    server = RecordingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def downloader(**settings):
+    settings = {"range_threshold": 1 << 30, "range_parts": 4, "max_attempts": 3, "retry_backoff": 0, **settings}
+    return AudioDownloader(**settings)
+
+def read_and_remove(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    remove_file(path)
+    return data
+
+def test_download(server):
+    client = downloader()
+    result = client.download(server.url, suffix=".wav")
+    assert read_and_remove(result.path) == CONTENT
+    assert result.content_hash == hashlib.sha256(CONTENT).hexdigest()
+    assert result.etag == ETAG
+    assert client.metrics.stats()["ranged_downloads"] == 0
+
+def test_large_download_is_fetched_in_ranges(server):
+    client = downloader(range_threshold=100_000)
+    result = client.download(server.url)
+    assert read_and_remove(result.path) == CONTENT
+
+    ranges = sorted(request["Range"] for request in server.requests if "Range" in request)
+    assert ranges == ["bytes=150000-224999", "bytes=225000-299999", "bytes=75000-149999"]
+    assert all(request["If-Range"] == ETAG for request in server.requests if "Range" in request)
+    stats = client.metrics.stats()
+    assert stats["downloads"] == 1 and stats["ranged_downloads"] == 1
+    assert stats["bytes"] == len(CONTENT)
+
+def test_interrupted_download_resumes_from_last_byte(server):
+    server.drop_after_bytes = 100_000
+    client = downloader()
+    result = client.download(server.url)
+    assert read_and_remove(result.path) == CONTENT
+
+    assert len(server.requests) == 2
+    resumed = server.requests[1]
+    assert resumed["If-Range"] == ETAG
+    received = int(resumed["Range"].removeprefix("bytes=").split("-")[0])
+    assert 0 < received < len(CONTENT)
+    assert client.metrics.stats()["retries"] == 1
+
+def test_not_modified(server):
+    client = downloader()
+    result = client.download(server.url, headers={"If-None-Match": ETAG})
+    assert result.path is None
+    assert client.metrics.stats()["not_modified"] == 1
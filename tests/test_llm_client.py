@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.llm_client import fake_response
+from app.utils.ai_suggestions import get_suggested_questions, stream_suggested_questions
+from app.utils.question_dedup import filter_near_duplicates
+from app.utils.report_generator import (
+    REPORT_SCHEMA,
+    build_report_prompt,
+    generate_interview_report,
+    parse_report_sections,
+)
+from app.utils.scores import parse_numeric_fields
+
+SUGGESTION_INPUTS = dict(
+    job_desc="Build and operate Python APIs",
+    role="Backend Engineer",
+    experience="4",
+    skills="Python, FastAPI, PostgreSQL",
+    already_suggested_questions="",
+    transcript="Interviewer: Tell me about your last project.\nCandidate: I built a FastAPI service.",
+)
+
+TRANSCRIPT = "Interviewer: What is an index?\nCandidate: A structure that speeds up lookups."
+
+def collect(stream):
+    async def run():
+        return [item async for item in stream]
+    return asyncio.run(run())
+
+def test_fake_backend_is_deterministic():
+    prompt = build_report_prompt(TRANSCRIPT, "Backend Engineer", "APIs", "4", "Python")
+    assert fake_response(prompt) == fake_response(prompt)
+    assert fake_response(prompt) != fake_response(prompt + " Be brief.")
+
+def test_suggestions(fake_llm):
+    questions = json.loads(asyncio.run(get_suggested_questions(**SUGGESTION_INPUTS)))
+    assert len(questions) == 3
+    assert all(isinstance(question, str) and question for question in questions)
+
+def test_streamed_suggestions_match_complete_response(fake_llm):
+    streamed = collect(stream_suggested_questions(**SUGGESTION_INPUTS))
+    fake_llm.cache = None
+    assert streamed == json.loads(asyncio.run(get_suggested_questions(**SUGGESTION_INPUTS)))
+
+@pytest.mark.parametrize("response, expected", [
+    ('"Why FastAPI?"', ["Why FastAPI?"]),
+    ('{"question": "Why FastAPI?"}', []),
+    ('["Why FastAPI?", 3, null, "How do you test it?"]', ["Why FastAPI?", "How do you test it?"]),
+])
+def test_suggestions_that_are_not_a_list_of_strings(fake_llm, monkeypatch, response, expected):
+    async def respond(*args, **kwargs):
+        return response
+
+    async def stream(*args, **kwargs):
+        yield response
+
+    monkeypatch.setattr(fake_llm, "generate_content_async", respond)
+    monkeypatch.setattr(fake_llm, "stream_content_async", stream)
+    assert json.loads(asyncio.run(get_suggested_questions(**SUGGESTION_INPUTS))) == expected
+    assert collect(stream_suggested_questions(**SUGGESTION_INPUTS)) == expected
+
+def test_suggestions_filtered_against_prior_questions(fake_llm):
+    questions = json.loads(asyncio.run(get_suggested_questions(**SUGGESTION_INPUTS)))
+    kept = filter_near_duplicates(questions, existing=questions[:1])
+    assert kept == questions[1:]
+
+def test_report_generation(fake_llm):
+    report = generate_interview_report(TRANSCRIPT, "Backend Engineer", "APIs", "4", "Python")
+    assert "Not provided" not in report.values()
+    numbers = parse_numeric_fields(report)
+    assert all(value is not None for value in numbers.values())
+    assert numbers["correct_ans_count_value"] + numbers["wrong_ans_count_value"] == numbers["ques_count_value"]
+    assert report["what_went_well"].count("\n") == 2
+
+def test_structured_report_parses_like_text_report():
+    prompt = build_report_prompt(TRANSCRIPT, "Backend Engineer", "APIs", "4", "Python")
+    assert parse_report_sections(fake_response(prompt, REPORT_SCHEMA)) == parse_report_sections(fake_response(prompt))
+
+def test_cache_miss_then_hit(fake_llm):
+    first = fake_llm.generate_content("Summarize:  the interview")
+    second = fake_llm.generate_content("Summarize: the   interview")
+    assert first == second
+    assert fake_llm.backend.calls == 1
+    stats = fake_llm.cache.stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+
+def test_cache_bypass_and_schema_key(fake_llm):
+    fake_llm.generate_content("Summarize the interview")
+    fake_llm.generate_content("Summarize the interview", use_cache=False)
+    fake_llm.generate_content("Summarize the interview", response_schema={"type": "STRING"})
+    assert fake_llm.backend.calls == 3
+    assert fake_llm.cache.stats()["entries"] == 2
+
+def test_async_and_streamed_calls_share_the_cache(fake_llm):
+    text = asyncio.run(fake_llm.generate_content_async("List three questions"))
+    assert collect(fake_llm.stream_content_async("List three questions")) == [text]
+    assert fake_llm.backend.calls == 1
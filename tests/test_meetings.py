@@ -0,0 +1,92 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from app.database.database import SessionLocal
+from app.models.meeting import Meeting, MeetingStatus
+from app.models.transcript_segment import TranscriptSegment
+from app.routes import meetings
+
+INTERVIEWER = "Pagination Tester"
+
+@pytest.fixture
+def scheduled_meetings(api):
+    """Five scheduled meetings of one interviewer, on consecutive days from tomorrow (UTC)."""
+    tomorrow = datetime.now(meetings.MEETING_TIMEZONE).date() + timedelta(days=1)
+    with SessionLocal() as db:
+        rows = [
+            Meeting(date=tomorrow + timedelta(days=n), time=time(10, 0), name=f"Candidate {n}",
+                    interviewer_name=INTERVIEWER, meet_link="https://meet.example/x", role="Engineer",
+                    status=MeetingStatus.SCHEDULED)
+            for n in range(5)
+        ]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+    yield ids
+    with SessionLocal() as db:
+        db.query(Meeting).filter(Meeting.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+
+def test_cursor_pages_through_listing(api, scheduled_meetings):
+    seen, cursor = [], None
+    while True:
+        params = {"interviewer": INTERVIEWER, "limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = api.get("/meetings", params=params).json()
+        seen += [meeting["id"] for meeting in body["meetings"]]
+        cursor = body["next_cursor"]
+        if not body["has_more"]:
+            break
+    assert seen == scheduled_meetings
+
+@pytest.mark.parametrize("changed", [{"sort": "desc"}, {"role": "Designer"}, {"interviewer": "Someone Else"}])
+def test_cursor_rejected_with_other_sort_or_filters(api, scheduled_meetings, changed):
+    first = api.get("/meetings", params={"interviewer": INTERVIEWER, "limit": 2}).json()
+    params = {"interviewer": INTERVIEWER, "limit": 2, "cursor": first["next_cursor"], **changed}
+    body = api.get("/meetings", params=params).json()
+    assert body["status"] == 400
+
+def test_cursor_rejected_on_other_endpoint(api, scheduled_meetings):
+    first = api.get("/meetings/upcoming", params={"interviewer": INTERVIEWER, "limit": 2}).json()
+    params = {"interviewer": INTERVIEWER, "limit": 2, "cursor": first["next_cursor"]}
+    assert api.get("/meetings", params=params).json()["status"] == 400
+    assert api.get("/meetings/upcoming", params=params).json()["status"] == 200
+
+def test_upcoming_uses_meeting_timezone(api, scheduled_meetings, monkeypatch):
+    body = api.get("/meetings/upcoming", params={"interviewer": INTERVIEWER}).json()
+    assert [meeting["id"] for meeting in body["meetings"]] == scheduled_meetings
+    today = datetime.now(meetings.MEETING_TIMEZONE).date()
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            assert tz is meetings.MEETING_TIMEZONE
+            return datetime.combine(today + timedelta(days=3), time(12, 0), tz)
+
+    monkeypatch.setattr(meetings, "datetime", Later)
+    body = api.get("/meetings/upcoming", params={"interviewer": INTERVIEWER}).json()
+    assert [meeting["id"] for meeting in body["meetings"]] == scheduled_meetings[3:]
+
+@pytest.fixture
+def meeting_id(api):
+    with SessionLocal() as db:
+        row = Meeting(date=datetime.now(meetings.MEETING_TIMEZONE).date(), time=time(9, 0), name="Transcript Candidate",
+                      interviewer_name=INTERVIEWER, meet_link="https://meet.example/t", role="Engineer",
+                      job_desc="Builds APIs", experience="3", skills="Python", status=MeetingStatus.IN_PROGRESS)
+        db.add(row)
+        db.commit()
+        meeting_id = row.id
+    yield meeting_id
+    with SessionLocal() as db:
+        db.query(TranscriptSegment).filter(TranscriptSegment.meeting_id == meeting_id).delete()
+        db.delete(db.get(Meeting, meeting_id))
+        db.commit()
+
+def test_meeting_transcript_falls_back_to_segments(api, meeting_id):
+    segments = [{"speaker": "Interviewer", "text": "Tell me about yourself."}, {"text": "I build APIs."}]
+    assert api.post(f"/meeting/{meeting_id}/transcript/chunks", json={"segments": segments}).json()["status"] == 201
+
+    expected = "Interviewer: Tell me about yourself.\nI build APIs."
+    assert api.get(f"/meeting/{meeting_id}").json()["meeting"]["transcript"] == expected
+    body = api.get(f"/meeting/{meeting_id}", params={"fields": "id,transcript"}).json()
+    assert body["meeting"] == {"id": meeting_id, "transcript": expected}
@@ -0,0 +1,46 @@
+from app.database.database import SessionLocal
+from app.services import metrics_store
+from app.services.llm_cache import get_llm_cache
+
+
+def test_llm_cache_metrics_without_llm_client(api, monkeypatch):
+    # Reading the metrics must not need a usable LLM backend
+    monkeypatch.setattr("app.services.llm_client.LLM_BACKEND", "gemini")
+    monkeypatch.setattr("app.services.llm_client.GENAI_API_KEY", None)
+    monkeypatch.setattr("app.services.llm_client._client", None)
+    body = api.get("/metrics/llm-cache").json()
+    assert body["status"] == 200
+    assert body["process"] == metrics_store.process_id()
+    assert body["cache"]["misses"] >= 0
+
+def test_llm_cache_metrics_include_worker_snapshots(api, monkeypatch):
+    get_llm_cache().get("llm:missing")
+    monkeypatch.setattr(metrics_store, "process_id", lambda: "worker-host:4242")
+    with SessionLocal() as db:
+        metrics_store.publish_metrics(db, role="report-worker")
+    monkeypatch.undo()
+
+    body = api.get("/metrics/llm-cache").json()
+    workers = [process for process in body["processes"] if process["process"] == "worker-host:4242"]
+    assert len(workers) == 1
+    assert workers[0]["role"] == "report-worker"
+    assert workers[0]["cache"]["misses"] >= 1
+
+def test_download_metrics_include_worker_snapshots(api, monkeypatch):
+    monkeypatch.setattr(metrics_store, "process_id", lambda: "worker-host:4343")
+    monkeypatch.setattr(metrics_store, "download_counters", lambda: {
+        "downloads": 3, "ranged_downloads": 1, "not_modified": 2, "failures": 0, "retries": 1,
+        "bytes": 3_000_000, "seconds": 1.5, "throughput_bytes_per_second": 2_000_000.0,
+    })
+    monkeypatch.setitem(metrics_store.METRIC_SOURCES, "downloads", metrics_store.download_counters)
+    with SessionLocal() as db:
+        metrics_store.publish_metrics(db, role="report-worker")
+    monkeypatch.undo()
+
+    body = api.get("/metrics/downloads").json()
+    assert body["status"] == 200
+    assert body["process"] == metrics_store.process_id()
+    assert body["downloads"]["downloads"] >= 0
+    workers = [process for process in body["processes"] if process["process"] == "worker-host:4343"]
+    assert len(workers) == 1
+    assert workers[0]["downloads"]["ranged_downloads"] == 1
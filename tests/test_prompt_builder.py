@@ -0,0 +1,39 @@
+import pytest
+
+from app.utils import prompt_builder, report_generator
+from app.utils.prompt_builder import (
+    OMITTED_MARKER,
+    PromptBudgetError,
+    estimate_tokens,
+    split_transcript,
+    tail_window,
+)
+
+
+def test_tail_window_keeps_most_of_an_overlong_last_line():
+    line = "word " * 2000
+    window = tail_window("first line\n" + line, 200)
+    assert window.startswith(OMITTED_MARKER)
+    assert estimate_tokens(window) <= 200
+    kept = window[len(OMITTED_MARKER) + 1:]
+    assert line.endswith(kept)
+    assert len(kept) > 150 * 4
+
+def test_tail_window_keeps_recent_lines():
+    lines = [f"Line {n}: an answer about databases." for n in range(200)]
+    window = tail_window("\n".join(lines), 100)
+    assert estimate_tokens(window) <= 100
+    assert window.endswith(lines[-1])
+
+@pytest.mark.parametrize("max_tokens", [2, 5, 50, 333])
+def test_split_transcript_chunks_fit(max_tokens):
+    transcript = "\n".join(["short", "x" * 5000, "", "another line of text"] * 5)
+    chunks = split_transcript(transcript, max_tokens)
+    assert all(estimate_tokens(chunk) <= max_tokens for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == transcript.replace("\n", "")
+
+def test_map_reduce_refuses_prompt_without_room(fake_llm, monkeypatch):
+    monkeypatch.setattr(prompt_builder, "PROMPT_TOKEN_BUDGET", 1200)
+    with pytest.raises(PromptBudgetError):
+        report_generator.generate_map_reduce_report("Q: hi\nA: hello\n" * 500, "dev", "jd " * 1000, "3", "py")
+    assert fake_llm.backend.calls == 0
@@ -0,0 +1,61 @@
+import asyncio
+import json
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from app.database.database import SessionLocal
+from app.models.interview_question import InterviewQuestion
+from app.models.meeting import Meeting, QuestionsStatus
+from app.services import question_generator
+
+
+@pytest.fixture
+def pending_meetings(api):
+    """Pending meetings keyed by state: stale, stale out of attempts, just requested, never stamped."""
+    long_ago = datetime.now(timezone.utc) - timedelta(seconds=question_generator.QUESTION_PENDING_TIMEOUT + 60)
+    states = {
+        "stale": (long_ago, 1),
+        "exhausted": (long_ago, question_generator.QUESTION_MAX_ATTEMPTS),
+        "fresh": (datetime.now(timezone.utc), 1),
+        "legacy": (None, None),
+    }
+    with SessionLocal() as db:
+        rows = {
+            name: Meeting(date=date.today(), time=time(11, 0), name=f"Sweep {name}", interviewer_name="Sweeper",
+                          meet_link="https://meet.example/s", role="Engineer", job_desc="Builds APIs",
+                          experience="3", skills="Python", expected_questions_status=QuestionsStatus.PENDING,
+                          expected_questions_requested_at=requested_at, expected_questions_attempts=attempts)
+            for name, (requested_at, attempts) in states.items()
+        }
+        db.add_all(rows.values())
+        db.commit()
+        ids = {name: row.id for name, row in rows.items()}
+    yield ids
+    with SessionLocal() as db:
+        db.query(InterviewQuestion).filter(InterviewQuestion.meeting_id.in_(ids.values())).delete()
+        db.query(Meeting).filter(Meeting.id.in_(ids.values())).delete()
+        db.commit()
+
+def test_sweep_retries_stale_pending_meetings(pending_meetings, monkeypatch):
+    profiles = []
+
+    async def generate(job_desc, experience, skills):
+        profiles.append((job_desc, experience, skills))
+        return json.dumps(["What is an index?"])
+
+    monkeypatch.setattr(question_generator, "generate_expected_questions", generate)
+    assert asyncio.run(question_generator.retry_stale_expected_questions()) == 2
+    # Both retried meetings share a profile, generated once
+    assert profiles == [("Builds APIs", "3", "Python")]
+
+    with SessionLocal() as db:
+        meetings = {name: db.get(Meeting, meeting_id) for name, meeting_id in pending_meetings.items()}
+        assert meetings["stale"].expected_questions_status == QuestionsStatus.READY
+        assert meetings["stale"].expected_questions_attempts == 2
+        assert meetings["legacy"].expected_questions_status == QuestionsStatus.READY
+        assert meetings["exhausted"].expected_questions_status == QuestionsStatus.FAILED
+        assert meetings["fresh"].expected_questions_status == QuestionsStatus.PENDING
+
+    # Nothing left to retry
+    assert asyncio.run(question_generator.retry_stale_expected_questions()) == 0
@@ -0,0 +1,95 @@
+import threading
+import time
+from datetime import date
+from datetime import time as clock
+
+import pytest
+
+from app.database.database import SessionLocal
+from app.models.meeting import Meeting, MeetingStatus
+from app.services import report_pipeline
+from app.services.report_pipeline import Stage, run_stages
+
+
+def test_stages_run_after_their_dependencies():
+    order = []
+    lock = threading.Lock()
+
+    def stage(name, value):
+        def run(inputs):
+            with lock:
+                order.append(name)
+            return value(inputs)
+        return run
+
+    results, timings = run_stages([
+        Stage("total", stage("total", lambda inputs: inputs["a"] + inputs["b"]), depends_on=("a", "b")),
+        Stage("a", stage("a", lambda inputs: 1)),
+        Stage("b", stage("b", lambda inputs: 2)),
+    ])
+    assert results == {"a": 1, "b": 2, "total": 3}
+    assert order[-1] == "total"
+    assert set(timings) == {"a", "b", "total"}
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    results, _ = run_stages([
+        Stage("a", lambda inputs: barrier.wait() is not None),
+        Stage("b", lambda inputs: barrier.wait() is not None),
+    ], max_workers=2)
+    assert results == {"a": True, "b": True}
+
+def test_stage_failure_propagates_after_running_stages_finish():
+    finished = threading.Event()
+
+    def slow(inputs):
+        time.sleep(0.2)
+        finished.set()
+
+    def fail(inputs):
+        raise RuntimeError("stage failed")
+
+    dependent = []
+    with pytest.raises(RuntimeError, match="stage failed"):
+        run_stages([
+            Stage("slow", slow),
+            Stage("fail", fail),
+            Stage("after", lambda inputs: dependent.append(inputs), depends_on=("fail",)),
+        ], max_workers=2)
+    assert finished.is_set()
+    assert dependent == []
+
+def test_unmet_dependency():
+    with pytest.raises(ValueError, match="unmet dependencies"):
+        run_stages([Stage("a", lambda inputs: 1, depends_on=("missing",))])
+
+@pytest.fixture
+def meeting_id(api):
+    with SessionLocal() as db:
+        row = Meeting(date=date.today(), time=clock(9, 0), name="Report Candidate", interviewer_name="Reporter",
+                      meet_link="https://meet.example/r", role="Engineer", job_desc="Builds APIs",
+                      experience="3", skills="Python", transcript="Interviewer: Hello.",
+                      status=MeetingStatus.IN_PROGRESS)
+        db.add(row)
+        db.commit()
+        meeting_id = row.id
+    yield meeting_id
+    with SessionLocal() as db:
+        db.delete(db.get(Meeting, meeting_id))
+        db.commit()
+
+def test_report_is_stored_when_voice_analysis_raises(meeting_id, monkeypatch):
+    def broken_voice_analysis(audio_url):
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(report_pipeline, "analyze_voice", broken_voice_analysis)
+    monkeypatch.setattr(report_pipeline, "generate_interview_report", lambda **inputs: {"ai_feedback": "Clear answers."})
+
+    timings = report_pipeline.process_report_generation(meeting_id, "https://recordings.example/r.mp3")
+    assert {"voice", "report", "total"} <= set(timings)
+    with SessionLocal() as db:
+        meeting = db.get(Meeting, meeting_id)
+        assert meeting.ai_feedback == "Clear answers."
+        assert meeting.is_review_ready
+        assert meeting.status == MeetingStatus.COMPLETED
+        assert meeting.clarity is None
@@ -0,0 +1,111 @@
+from datetime import date, time, timedelta, timezone
+
+import pytest
+
+from app.database.database import SessionLocal
+from app.models.meeting import Meeting, MeetingStatus
+from app.models.report_job import ReportJob, ReportJobStatus
+from app.services import report_queue
+from app.services.report_queue import (
+    claim_report_jobs,
+    complete_report_job,
+    extend_report_job_locks,
+    fail_report_job,
+    utcnow,
+)
+
+
+@pytest.fixture
+def db(api):
+    with SessionLocal() as session:
+        meeting = Meeting(date=date.today(), time=time(14, 0), name="Queue Candidate", interviewer_name="Queue",
+                          meet_link="https://meet.example/q", role="Engineer", status=MeetingStatus.IN_PROGRESS)
+        session.add(meeting)
+        session.commit()
+        # Leave no runnable jobs from other tests
+        session.query(ReportJob).delete()
+        session.commit()
+        session.meeting_id = meeting.id
+        yield session
+        session.rollback()
+        session.query(ReportJob).delete()
+        session.delete(session.get(Meeting, meeting.id))
+        session.commit()
+
+def add_job(db, **values):
+    values = {"status": ReportJobStatus.QUEUED, "attempts": 0, "max_attempts": 3, "run_after": utcnow(), **values}
+    job = ReportJob(meeting_id=db.meeting_id, audio=None, **values)
+    db.add(job)
+    db.commit()
+    return job.id
+
+def as_utc(value):
+    # SQLite returns naive timestamps
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def load(db, job_id):
+    db.expire_all()
+    return db.get(ReportJob, job_id)
+
+def test_claim_skips_jobs_not_due_yet(db):
+    due = add_job(db)
+    add_job(db, run_after=utcnow() + timedelta(minutes=5))
+
+    claimed = claim_report_jobs(db, "worker-a", 10)
+    assert [job.id for job in claimed] == [due]
+    assert claimed[0].attempts == 1
+    job = load(db, due)
+    assert job.status == ReportJobStatus.RUNNING
+    assert job.locked_by == "worker-a"
+    assert claim_report_jobs(db, "worker-b", 10) == []
+
+def test_failed_job_is_retried_with_backoff(db, monkeypatch):
+    monkeypatch.setattr(report_queue, "REPORT_JOB_RETRY_BACKOFF", 30)
+    job_id = add_job(db)
+    job = claim_report_jobs(db, "worker-a", 1)[0]
+    fail_report_job(db, job, "worker-a", "LLM timeout")
+
+    row = load(db, job_id)
+    assert row.status == ReportJobStatus.QUEUED
+    assert row.last_error == "LLM timeout"
+    assert as_utc(row.run_after) >= utcnow() + timedelta(seconds=25)
+    assert claim_report_jobs(db, "worker-a", 1) == []
+
+def test_job_fails_for_good_after_its_last_attempt(db):
+    job_id = add_job(db, attempts=2)
+    job = claim_report_jobs(db, "worker-a", 1)[0]
+    assert job.attempts == job.max_attempts
+    fail_report_job(db, job, "worker-a", "still broken")
+    assert load(db, job_id).status == ReportJobStatus.FAILED
+
+def test_retry_delay_doubles_up_to_the_maximum(monkeypatch):
+    monkeypatch.setattr(report_queue, "REPORT_JOB_RETRY_BACKOFF", 30)
+    monkeypatch.setattr(report_queue, "REPORT_JOB_RETRY_BACKOFF_MAX", 100)
+    assert [report_queue.retry_delay(attempts) for attempts in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+def test_expired_lock_is_claimed_by_another_worker(db):
+    job_id = add_job(db)
+    first = claim_report_jobs(db, "worker-a", 1)[0]
+    row = load(db, job_id)
+    row.locked_until = utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    second = claim_report_jobs(db, "worker-b", 1)[0]
+    assert second.attempts == 2
+    # The first worker's outcome no longer applies
+    complete_report_job(db, first, "worker-a")
+    row = load(db, job_id)
+    assert row.status == ReportJobStatus.RUNNING
+    assert row.locked_by == "worker-b"
+
+def test_extended_lock_keeps_a_long_job_claimed(db):
+    job_id = add_job(db)
+    claim_report_jobs(db, "worker-a", 1)
+    row = load(db, job_id)
+    row.locked_until = utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert extend_report_job_locks(db, [job_id], "worker-a") == 1
+    assert claim_report_jobs(db, "worker-b", 1) == []
+    # Only the worker holding the job can extend it
+    assert extend_report_job_locks(db, [job_id], "worker-b") == 0
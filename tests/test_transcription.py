@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from app.utils.transcription import segment_on_silence
+
+HOP = 0.1
+LOUD, QUIET = 0.5, 0.0
+
+def rms(*runs):
+    """Frame RMS from (seconds, level) runs."""
+    return np.concatenate([np.full(int(round(seconds / HOP)), level) for seconds, level in runs])
+
+def segments(frame_rms, **settings):
+    settings = {"min_silence": 0.5, "max_segment": 10, "padding": 0, "max_pause": 2, **settings}
+    return [(round(start, 3), round(end, 3)) for start, end in segment_on_silence(frame_rms, HOP, **settings)]
+
+def test_silence_only():
+    assert segments(rms((5, QUIET))) == []
+
+def test_leading_and_trailing_silence_left_out():
+    assert segments(rms((1, QUIET), (2, LOUD), (1, QUIET))) == [(1.0, 3.0)]
+
+def test_short_pauses_stay_inside_a_segment():
+    # 0.3 s is below min_silence, 1 s is a pause but short enough to pack across
+    frame_rms = rms((2, LOUD), (0.3, QUIET), (2, LOUD), (1, QUIET), (2, LOUD))
+    assert segments(frame_rms) == [(0.0, 7.3)]
+
+def test_long_pause_ends_a_segment():
+    frame_rms = rms((2, LOUD), (3, QUIET), (2, LOUD))
+    assert segments(frame_rms) == [(0.0, 2.0), (5.0, 7.0)]
+
+def test_segments_packed_up_to_max_length():
+    frame_rms = rms((4, LOUD), (1, QUIET), (4, LOUD), (1, QUIET), (4, LOUD))
+    assert segments(frame_rms) == [(0.0, 9.0), (10.0, 14.0)]
+
+def test_long_run_cut_at_its_quietest_frame():
+    frame_rms = rms((6, LOUD), (0.1, 0.02), (7, LOUD))
+    cut = segments(frame_rms)
+    assert cut == [(0.0, 6.0), (6.0, 13.1)]
+
+def test_padding_keeps_silence_around_speech():
+    frame_rms = rms((1, QUIET), (2, LOUD), (1, QUIET))
+    assert segments(frame_rms, padding=0.2) == [(0.8, 3.2)]
+
+@pytest.mark.parametrize("pause, expected", [(1.5, 1), (2.5, 2)])
+def test_max_pause_counts_silence_without_padding(pause, expected):
+    frame_rms = rms((2, LOUD), (pause, QUIET), (2, LOUD))
+    assert len(segments(frame_rms, padding=0.2)) == expected
@@ -0,0 +1,83 @@
+import pytest
+
+from app.utils import voice_analyzer
+from app.utils.audio_cache import AudioCache
+from app.utils.downloader import DownloadedAudio
+
+URL = "https://recordings.example.com/interview.mp3"
+FEATURES = {"mean_volume": 0.1}
+
+class FakeServer:
+    """
+    Answers 304 to any conditional request and serves the recording otherwise.
+    """
+
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.requests = []
+
+    def download(self, audio_url, headers=None):
+        self.requests.append(headers or {})
+        if headers:
+            return DownloadedAudio(None, None, '"v1"', None)
+        path = self.tmp_path / f"download-{len(self.requests)}.mp3"
+        path.write_bytes(b"audio")
+        return DownloadedAudio(str(path), "hash-1", '"v1"', None)
+
+class FakePool:
+    def __init__(self):
+        self.tasks = 0
+
+    def run(self, fn, path):
+        self.tasks += 1
+        return FEATURES, "[00:00] Hello."
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    server = FakeServer(tmp_path)
+    monkeypatch.setattr(voice_analyzer, "download_audio", server.download)
+    return server
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(voice_analyzer, "get_audio_pool", lambda: pool)
+    return pool
+
+def use_cache(monkeypatch, cache):
+    monkeypatch.setattr(voice_analyzer, "get_audio_cache", lambda: cache)
+
+def test_not_modified_uses_cached_analysis(tmp_path, monkeypatch, server, pool):
+    cache = AudioCache(str(tmp_path / "cache"), 1024 * 1024)
+    cache.set_url(URL, "hash-1", '"v1"', None)
+    cache.set_analysis("hash-1", FEATURES, "[00:00] Cached.")
+    use_cache(monkeypatch, cache)
+
+    assert voice_analyzer.load_audio_analysis(URL) == (FEATURES, "[00:00] Cached.")
+    assert server.requests == [{"If-None-Match": '"v1"'}]
+    assert pool.tasks == 0
+
+def test_not_modified_without_cached_analysis_downloads_again(tmp_path, monkeypatch, server, pool):
+    cache = AudioCache(str(tmp_path / "cache"), 1024 * 1024)
+    cache.set_url(URL, "hash-1", '"v1"', None)
+    use_cache(monkeypatch, cache)
+
+    assert voice_analyzer.load_audio_analysis(URL) == (FEATURES, "[00:00] Hello.")
+    assert server.requests == [{"If-None-Match": '"v1"'}, {}]
+    assert pool.tasks == 1
+    assert cache.get_analysis("hash-1")["transcript"] == "[00:00] Hello."
+
+def test_not_modified_with_cache_disabled_downloads_again(monkeypatch, pool):
+    # A server that answers 304 even without validators, e.g. through a misbehaving proxy
+    downloads = []
+
+    def download(audio_url, headers=None):
+        downloads.append(headers)
+        return DownloadedAudio(None, None, None, None)
+
+    monkeypatch.setattr(voice_analyzer, "download_audio", download)
+    use_cache(monkeypatch, None)
+
+    assert voice_analyzer.load_audio_analysis(URL) == (None, None)
+    assert len(downloads) == 2
+    assert pool.tasks == 0